@@ -7,23 +7,50 @@ https://github.com/toggm/askoheat
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+from datetime import timedelta
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.const import CONF_HOST, CONF_PORT, Platform
+from homeassistant.core import callback
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.storage import Store
 from homeassistant.loader import async_get_loaded_integration
 
 from custom_components.askoheat.const import DeviceKey
 
 from .api import AskoheatModbusApiClient
 from .const import (
+    CONF_ADVANCED,
     CONF_ANALOG_INPUT_UNIT,
+    CONF_DECODE_ENGINE,
     CONF_DEVICE_UNITS,
+    CONF_EMA_SCAN_INTERVAL_ACTIVE,
+    CONF_EMA_SCAN_INTERVAL_IDLE,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_HEATPUMP_UNIT,
     CONF_LEGIONELLA_PROTECTION_UNIT,
+    CONF_MAX_CONNECTIONS,
     CONF_MODBUS_MASTER_UNIT,
+    CONF_REGISTER_HISTORY,
+    CONF_SCAN_INTERVALS,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_TCP_KEEPALIVE,
+    DEFAULT_DECODE_ENGINE,
+    DEFAULT_EMA_SCAN_INTERVAL_ACTIVE,
+    DEFAULT_EMA_SCAN_INTERVAL_IDLE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_REGISTER_HISTORY,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DEFAULT_TCP_KEEPALIVE,
     DOMAIN,
     LOGGER,
+    STORAGE_VERSION,
+    DecodeEngine,
 )
 from .coordinator import (
     AskoheatConfigDataUpdateCoordinator,
@@ -32,11 +59,13 @@ from .coordinator import (
     AskoheatParameterDataUpdateCoordinator,
 )
 from .data import AskoheatData
+from .services import async_setup_services
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
-    from homeassistant.helpers import device_registry as dr
+    from homeassistant.helpers.typing import ConfigType
 
+    from .coordinator import AskoheatDataUpdateCoordinator
     from .data import AskoheatConfigEntry
 
 PLATFORMS: list[Platform] = [
@@ -49,6 +78,14 @@ PLATFORMS: list[Platform] = [
     Platform.SELECT,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:  # noqa: ARG001
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(
@@ -56,14 +93,83 @@ async def async_setup_entry(
     entry: AskoheatConfigEntry,
 ) -> bool:
     """Set up this integration using UI."""
-    client = AskoheatModbusApiClient(
-        host=entry.data[CONF_HOST],
-        port=entry.data[CONF_PORT],
+    client = AskoheatModbusApiClient(**_client_options(entry))
+    client.set_register_history(_register_history(entry))
+    client.set_decode_engine(_decode_engine(entry))
+
+    stale_grace_period = _stale_grace_period(entry)
+    par_coordinator = AskoheatParameterDataUpdateCoordinator(
+        hass=hass,
+        client=client,
+        store=_parameter_store(hass, entry),
+        stale_grace_period=stale_grace_period,
+    )
+    scan_interval_active, scan_interval_idle = _ema_scan_intervals(entry)
+    ema_coordinator = AskoheatEMADataUpdateCoordinator(
+        hass=hass,
+        client=client,
+        stale_grace_period=stale_grace_period,
+        scan_interval_active=scan_interval_active,
+        scan_interval_idle=scan_interval_idle,
+    )
+    config_coordinator = AskoheatConfigDataUpdateCoordinator(
+        hass=hass, client=client, stale_grace_period=stale_grace_period
+    )
+    data_coordinator = AskoheatOperationDataUpdateCoordinator(
+        hass=hass, client=client, stale_grace_period=stale_grace_period
+    )
+
+    entry.runtime_data = AskoheatData(
+        client=client,
+        integration=async_get_loaded_integration(hass, entry.domain),
+        ema_coordinator=ema_coordinator,
+        config_coordinator=config_coordinator,
+        par_coordinator=par_coordinator,
+        data_coordinator=data_coordinator,
+        supported_devices=_supported_devices(entry),
     )
 
-    await client.connect()
+    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
+    # only the device infos of the parameter block are needed to set up entities,
+    # entities of the remaining blocks are unavailable until their first refresh
+    if await par_coordinator.async_load_cached_parameters():
+        # entities are set up from the cached parameters right away, connecting
+        # and revalidating them together with the remaining blocks is left to the
+        # background
+        entry.async_create_background_task(
+            hass, _async_connect_and_refresh(entry), "askoheat connect"
+        )
+    else:
+        try:
+            await _async_connect(entry)
+            await par_coordinator.async_config_entry_first_refresh()
+        except Exception:
+            # the entry is not unloaded if the setup failed, retries set up a new
+            # client
+            await _async_close(entry)
+            raise
+        entry.async_create_background_task(
+            hass,
+            _async_refresh(ema_coordinator, config_coordinator, data_coordinator),
+            "askoheat refresh",
+        )
+    # registered devices follow changes of the revalidated parameters
+    entry.async_on_unload(
+        par_coordinator.async_add_listener(
+            partial(_async_update_device_infos, hass, entry)
+        )
+    )
+
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-    if not client.is_connected:
+    return True
+
+
+async def _async_connect(entry: AskoheatConfigEntry) -> None:
+    await entry.runtime_data.client.connect()
+
+    if not entry.runtime_data.client.is_connected:
         msg = "Could not connect to modbus client"
         LOGGER.error(msg)
         raise ConfigEntryNotReady(msg)
@@ -74,11 +180,89 @@ async def async_setup_entry(
         entry.data[CONF_PORT],
     )
 
-    par_coordinator = AskoheatParameterDataUpdateCoordinator(hass=hass, client=client)
-    ema_coordinator = AskoheatEMADataUpdateCoordinator(hass=hass, client=client)
-    config_coordinator = AskoheatConfigDataUpdateCoordinator(hass=hass, client=client)
-    data_coordinator = AskoheatOperationDataUpdateCoordinator(hass=hass, client=client)
 
+async def _async_connect_and_refresh(entry: AskoheatConfigEntry) -> None:
+    """Connect in the background and refresh all blocks once connected."""
+    if not await entry.runtime_data.client.connect(retry=True):
+        return
+    LOGGER.debug(
+        "Connect modbus client %s:%s",
+        entry.data[CONF_HOST],
+        entry.data[CONF_PORT],
+    )
+    await _async_refresh(*entry.runtime_data.coordinators)
+
+
+async def _async_refresh(*coordinators: AskoheatDataUpdateCoordinator) -> None:
+    """Refresh the blocks at once, so they are read with a combined read plan."""
+    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+
+
+@callback
+def _async_update_device_infos(hass: HomeAssistant, entry: AskoheatConfigEntry) -> None:
+    """Update the registered devices with the device infos of the parameters."""
+    if entry.runtime_data.par_coordinator.data is None:
+        return
+    device_info = entry.runtime_data.device_info
+    device_registry = dr.async_get(hass)
+    for device in dr.async_entries_for_config_entry(device_registry, entry.entry_id):
+        device_registry.async_update_device(
+            device.id,
+            model=device_info.article_name,
+            model_id=device_info.article_number,
+            sw_version=device_info.software_version,
+            hw_version=device_info.hardwareware_version,
+            serial_number=device_info.serial_number,
+        )
+
+
+def _client_options(entry: AskoheatConfigEntry) -> dict[str, Any]:
+    advanced = entry.data.get(CONF_ADVANCED) or {}
+    return {
+        "host": entry.data[CONF_HOST],
+        "port": entry.data[CONF_PORT],
+        "max_connections": advanced.get(CONF_MAX_CONNECTIONS, DEFAULT_MAX_CONNECTIONS),
+        "tcp_keepalive": advanced.get(CONF_TCP_KEEPALIVE, DEFAULT_TCP_KEEPALIVE),
+        "heartbeat_interval": advanced.get(
+            CONF_HEARTBEAT_INTERVAL, DEFAULT_HEARTBEAT_INTERVAL
+        ),
+    }
+
+
+def _register_history(entry: AskoheatConfigEntry) -> int:
+    advanced = entry.data.get(CONF_ADVANCED) or {}
+    return advanced.get(CONF_REGISTER_HISTORY, DEFAULT_REGISTER_HISTORY)
+
+
+def _decode_engine(entry: AskoheatConfigEntry) -> DecodeEngine:
+    advanced = entry.data.get(CONF_ADVANCED) or {}
+    return DecodeEngine(advanced.get(CONF_DECODE_ENGINE, DEFAULT_DECODE_ENGINE))
+
+
+def _stale_grace_period(entry: AskoheatConfigEntry) -> timedelta:
+    advanced = entry.data.get(CONF_ADVANCED) or {}
+    return timedelta(
+        seconds=advanced.get(CONF_STALE_GRACE_PERIOD, DEFAULT_STALE_GRACE_PERIOD)
+    )
+
+
+def _ema_scan_intervals(entry: AskoheatConfigEntry) -> tuple[timedelta, timedelta]:
+    scan_intervals = entry.data.get(CONF_SCAN_INTERVALS) or {}
+    return (
+        timedelta(
+            seconds=scan_intervals.get(
+                CONF_EMA_SCAN_INTERVAL_ACTIVE, DEFAULT_EMA_SCAN_INTERVAL_ACTIVE
+            )
+        ),
+        timedelta(
+            seconds=scan_intervals.get(
+                CONF_EMA_SCAN_INTERVAL_IDLE, DEFAULT_EMA_SCAN_INTERVAL_IDLE
+            )
+        ),
+    )
+
+
+def _supported_devices(entry: AskoheatConfigEntry) -> list[DeviceKey]:
     # default devices
     supported_devices = [DeviceKey.WATER_HEATER_CONTROL_UNIT, DeviceKey.ENERGY_MANAGER]
     # add devices based on configuration
@@ -91,27 +275,13 @@ async def async_setup_entry(
         supported_devices.append(DeviceKey.MODBUS_MASTER)
     if additional_devices.get(CONF_HEATPUMP_UNIT):
         supported_devices.append(DeviceKey.HEATPUMP_CONTROL_UNIT)
+    return supported_devices
 
-    entry.runtime_data = AskoheatData(
-        client=client,
-        integration=async_get_loaded_integration(hass, entry.domain),
-        ema_coordinator=ema_coordinator,
-        config_coordinator=config_coordinator,
-        par_coordinator=par_coordinator,
-        data_coordinator=data_coordinator,
-        supported_devices=supported_devices,
-    )
-
-    # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
-    await par_coordinator.async_config_entry_first_refresh()
-    await ema_coordinator.async_config_entry_first_refresh()
-    await config_coordinator.async_config_entry_first_refresh()
-    await data_coordinator.async_config_entry_first_refresh()
-
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
-    return True
+def _parameter_store(
+    hass: HomeAssistant, entry: AskoheatConfigEntry
+) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.parameters")
 
 
 async def async_remove_config_entry_device(
@@ -141,14 +311,51 @@ async def async_unload_entry(
     entry: AskoheatConfigEntry,
 ) -> bool:
     """Handle removal of an entry."""
-    entry.runtime_data.client.close()
+    await _async_close(entry)
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
 
+async def _async_close(entry: AskoheatConfigEntry) -> None:
+    """Close the modbus connection and shut down the coordinators."""
+    entry.runtime_data.client.close()
+    # closing the connection marks the data as stale, the expiry is cancelled on
+    # shutdown of the coordinators
+    await asyncio.gather(
+        *(
+            coordinator.async_shutdown()
+            for coordinator in entry.runtime_data.coordinators
+        )
+    )
+
+
+async def async_remove_entry(
+    hass: HomeAssistant,
+    entry: AskoheatConfigEntry,
+) -> None:
+    """Remove the cached parameters of a removed entry."""
+    await _parameter_store(hass, entry).async_remove()
+
+
 async def async_reload_entry(
     hass: HomeAssistant,
     entry: AskoheatConfigEntry,
 ) -> None:
-    """Reload config entry."""
+    """Reload config entry, keeping the modbus connection if it did not change."""
+    client = entry.runtime_data.client
+    if client.is_connected and client.uses_connection(**_client_options(entry)):
+        # coordinators keep polling and their data, only entities are set up again
+        LOGGER.debug("Reload platforms of %s keeping the connection", entry.title)
+        await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+        entry.runtime_data.supported_devices = _supported_devices(entry)
+        client.set_register_history(_register_history(entry))
+        client.set_decode_engine(_decode_engine(entry))
+        for coordinator in entry.runtime_data.coordinators:
+            coordinator.stale_grace_period = _stale_grace_period(entry)
+        entry.runtime_data.ema_coordinator.set_scan_intervals(
+            *_ema_scan_intervals(entry)
+        )
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+        return
+
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import math
+import socket
 import struct
-from datetime import time
-from enum import ReprEnum
+from collections import deque
+from datetime import UTC, datetime, time
+from time import monotonic
 from typing import (
     TYPE_CHECKING,
     Any,
-    SupportsFloat,
-    SupportsInt,
+    NamedTuple,
     cast,
 )
 
@@ -18,6 +21,12 @@ from numpy import number
 from pymodbus.client import AsyncModbusTcpClient
 
 from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_connection import (
+    AskoheatConnection,
+    AskoheatRoundTripTimes,
+)
+from custom_components.askoheat.api_decode import decode_plan
+from custom_components.askoheat.api_decode_numpy import numpy_decode_plan
 from custom_components.askoheat.api_desc import (
     ByteRegisterInputDescriptor,
     FlagRegisterInputDescriptor,
@@ -25,6 +34,7 @@ from custom_components.askoheat.api_desc import (
     IntEnumInputDescriptor,
     RegisterBlockDescriptor,
     RegisterInputDescriptor,
+    RegisterType,
     SignedInt16RegisterInputDescriptor,
     StrEnumInputDescriptor,
     StringRegisterInputDescriptor,
@@ -33,18 +43,56 @@ from custom_components.askoheat.api_desc import (
     UnsignedInt16RegisterInputDescriptor,
     UnsignedInt32RegisterInputDescriptor,
 )
-from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_ema_desc import (
+    EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
+    EMA_REGISTER_BLOCK_DESCRIPTOR,
+)
+from custom_components.askoheat.api_history import AskoheatRegisterHistory
+from custom_components.askoheat.api_metrics import (
+    AskoheatModbusMetrics,
+    AskoheatRequestMetrics,
+)
 from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
 from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
-from custom_components.askoheat.const import DOMAIN, LOGGER
-from custom_components.askoheat.data import AskoheatDataBlock
+from custom_components.askoheat.api_planner import (
+    PlannedRead,
+    RegisterRange,
+    plan_block_ranges,
+    plan_reads,
+    register_poll_tiers,
+    split_registers,
+)
+from custom_components.askoheat.const import (
+    DEFAULT_DECODE_ENGINE,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_REGISTER_HISTORY,
+    DEFAULT_TCP_KEEPALIVE,
+    DOMAIN,
+    LOGGER,
+    TCP_KEEPALIVE_COUNT,
+    ConnectionState,
+    DecodeEngine,
+    ModbusOperation,
+    PollTier,
+    RegisterBlockName,
+)
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Coroutine
+    from collections.abc import Callable, Coroutine, Sequence
 
     from pymodbus.pdu import ModbusPDU
 
 
+# register blocks requests are accounted to by the metrics
+_BLOCK_NAMES = {
+    EMA_REGISTER_BLOCK_DESCRIPTOR: RegisterBlockName.ENERGY_MANAGER,
+    CONF_REGISTER_BLOCK_DESCRIPTOR: RegisterBlockName.CONFIG,
+    DATA_REGISTER_BLOCK_DESCRIPTOR: RegisterBlockName.OPERATION,
+    PARAM_REGISTER_BLOCK_DESCRIPTOR: RegisterBlockName.PARAMETER,
+}
+
+
 class AskoheatModbusApiClientError(HomeAssistantError):
     """Exception to indicate a general API error."""
 
@@ -55,22 +103,252 @@ class AskoheatModbusApiClientCommunicationError(
     """Exception to indicate a communication error."""
 
 
+class AskoheatBlockData(NamedTuple):
+    """Decoded values of a register block read."""
+
+    data: dict[str, Any]
+    # keys of values changed since the previous read, None if unknown
+    changed_keys: frozenset[str] | None
+    # number of registers read from the device, 0 for restored registers
+    registers_read: int = 0
+
+
 class AskoheatModbusApiClient:
     """Sample API Client."""
 
-    def __init__(self, host: str, port: int) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        host: str,
+        port: int,
+        decode_engine: DecodeEngine = DEFAULT_DECODE_ENGINE,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        *,
+        tcp_keepalive: int = DEFAULT_TCP_KEEPALIVE,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    ) -> None:
         """Askoheat Modbus API Client."""
         self._host = host
         self._port = port
-        self._client = self._create_client(host=host, port=port)
-        self._last_communication_success = True
+        self._max_connections = max_connections
+        self._tcp_keepalive = tcp_keepalive
+        self._heartbeat_interval = heartbeat_interval
+        self.set_decode_engine(decode_engine)
+        self._client = self._create_client(
+            host=host, port=port, trace_connect=self.__trace_connect
+        )
+        # additional connections to execute planned reads concurrently, as pymodbus
+        # executes a single transaction per connection at a time, used while the
+        # main connection is ready
+        self._parallel_clients = [
+            self._create_client(
+                host=host, port=port, trace_connect=self.__trace_parallel_connect
+            )
+            for _ in range(max_connections - 1)
+        ]
+        self._parallel_reads = False
+        # failed attempts to use the additional connections delay the next one
+        self._parallel_attempt = 0
+        self._parallel_task: asyncio.Task[None] | None = None
+        self._connection = AskoheatConnection(
+            self.__async_connect_clients, self.__close_clients
+        )
+        self._connection.add_listener(self.__handle_connection_state)
+        # round-trip times of all connections to the device
+        self._round_trip_times = AskoheatRoundTripTimes()
+        # latencies and errors of requests by operation and register block
+        self._metrics = AskoheatModbusMetrics()
+        # idle connections are kept alive by reading a single register
+        self._last_request_at = monotonic()
+        self._heartbeat: asyncio.TimerHandle | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
+        # requests are executed one after another by a single task, writes are
+        # executed before any pending read
+        self._pending_writes: deque[
+            tuple[Callable[[], Coroutine[Any, Any, Any]], asyncio.Future[Any]]
+        ] = deque()
+        self._pending_reads: dict[
+            RegisterBlockDescriptor, asyncio.Future[AskoheatBlockData]
+        ] = {}
+        self._request_task: asyncio.Task[None] | None = None
+        # heartbeat read executed with the lowest priority, skipped if the
+        # connection is used by other requests anyway
+        self._pending_heartbeat: asyncio.Future[None] | None = None
+        # raw registers and decoded values of the last read per block
+        self._snapshots: dict[
+            RegisterBlockDescriptor, tuple[list[int], dict[str, Any]]
+        ] = {}
+        # monotonic time of the last read and write of registers of a poll tier
+        self._poll_tier_reads: dict[
+            tuple[RegisterBlockDescriptor, PollTier], float
+        ] = {}
+        self._poll_tier_writes: dict[
+            tuple[RegisterBlockDescriptor, PollTier], float
+        ] = {}
+        # raw registers of the recent reads per block, if enabled
+        self._register_history = DEFAULT_REGISTER_HISTORY
+        self._histories: dict[RegisterBlockName, AskoheatRegisterHistory] = {}
+
+    def _create_client(
+        self,
+        host: str,
+        port: int,
+        trace_connect: Callable[[bool], None] | None = None,
+    ) -> AsyncModbusTcpClient:
+        # reconnects are handled by the connection health tracking
+        return AsyncModbusTcpClient(
+            host=host, port=port, reconnect_delay=0, trace_connect=trace_connect
+        )
 
-    def _create_client(self, host: str, port: int) -> AsyncModbusTcpClient:
-        return AsyncModbusTcpClient(host=host, port=port)
+    async def connect(self, *, retry: bool = False) -> bool:
+        """Connect to modbus client, retrying with backoff until connected if set."""
+        return await self._connection.async_connect(retry=retry)
 
-    async def connect(self) -> Any:
-        """Connect to modbus client."""
-        return await self._client.connect()
+    async def __async_connect_clients(self) -> bool:
+        if not (await self._client.connect() and self._client.connected):
+            return False
+        self.__enable_tcp_keepalive(self._client)
+        # a single request probes if the device answers, as gateways may accept
+        # connections while the device behind them is unreachable
+        try:
+            await self.__async_probe()
+        except Exception as err:  # noqa: BLE001
+            LOGGER.debug("Modbus device did not answer probe request: %s", err)
+            return False
+        if self._parallel_clients and self._parallel_attempt == 0:
+            await self.__async_connect_parallel_clients()
+        return True
+
+    async def __async_connect_parallel_clients(self, delay: float = 0) -> None:
+        """Connect the additional connections, falling back to serial reads."""
+        if delay > 0:
+            await asyncio.sleep(delay)
+        try:
+            connected = all(
+                await asyncio.gather(
+                    *(client.connect() for client in self._parallel_clients)
+                )
+            )
+        except Exception as err:  # noqa: BLE001
+            LOGGER.debug("Connecting parallel modbus connections failed: %s", err)
+            connected = False
+        self._parallel_task = None
+        if not connected:
+            self.__fall_back_to_serial_reads("connection refused")
+            return
+        for client in self._parallel_clients:
+            self.__enable_tcp_keepalive(client)
+        self._parallel_reads = True
+
+    def __enable_tcp_keepalive(self, client: AsyncModbusTcpClient) -> None:
+        """Let the OS probe the idle connection so bridges keep the session open."""
+        if self._tcp_keepalive <= 0 or client.ctx.transport is None:
+            return
+        sock = client.ctx.transport.get_extra_info("socket")
+        if sock is None:
+            return
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # idle time option is named TCP_KEEPALIVE on macOS
+        idle_option = getattr(socket, "TCP_KEEPIDLE", None) or getattr(
+            socket, "TCP_KEEPALIVE", None
+        )
+        for option, value in (
+            (idle_option, self._tcp_keepalive),
+            (getattr(socket, "TCP_KEEPINTVL", None), self._tcp_keepalive),
+            (getattr(socket, "TCP_KEEPCNT", None), TCP_KEEPALIVE_COUNT),
+        ):
+            if option is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, option, value)
+
+    def __trace_connect(self, connected: bool) -> None:  # noqa: FBT001
+        if not connected:
+            self._connection.connection_lost()
+
+    def __trace_parallel_connect(self, connected: bool) -> None:  # noqa: FBT001
+        if not connected and self._parallel_reads:
+            self.__fall_back_to_serial_reads("connection lost")
+
+    def __handle_connection_state(self, state: ConnectionState) -> None:
+        if state == ConnectionState.READY:
+            self.__schedule_heartbeat()
+            self.__schedule_parallel_connect()
+            return
+        # additional connections are only used while the main connection is ready
+        self.__close_parallel_clients()
+        if not self._connection.is_usable:
+            self.__cancel_heartbeat()
+
+    def __schedule_parallel_connect(self) -> None:
+        if (
+            not self._parallel_clients
+            or self._parallel_reads
+            or self._parallel_task is not None
+            or self._connection.state != ConnectionState.READY
+        ):
+            return
+        self._parallel_task = asyncio.get_running_loop().create_task(
+            self.__async_connect_parallel_clients(
+                self._connection.backoff_delay(self._parallel_attempt)
+            )
+        )
+
+    def __schedule_heartbeat(self) -> None:
+        if self._heartbeat_interval <= 0 or self._heartbeat is not None:
+            return
+        delay = self._last_request_at + self._heartbeat_interval - monotonic()
+        self._heartbeat = asyncio.get_running_loop().call_later(
+            max(delay, 0), self.__heartbeat
+        )
+
+    def __cancel_heartbeat(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
+    def __heartbeat(self) -> None:
+        self._heartbeat = None
+        idle = monotonic() - self._last_request_at
+        if idle < self._heartbeat_interval:
+            # requests were sent meanwhile, wait until the connection is idle
+            self.__schedule_heartbeat()
+            return
+        self._heartbeat_task = asyncio.get_running_loop().create_task(
+            self.__async_heartbeat()
+        )
+
+    async def __async_heartbeat(self) -> None:
+        """Queue a single register read to keep the idle connection open."""
+        try:
+            self.__raise_if_unusable()
+            future = asyncio.get_running_loop().create_future()
+            self._pending_heartbeat = future
+            self.__schedule_requests()
+            await future
+        except Exception as err:  # noqa: BLE001
+            LOGGER.debug("Heartbeat read failed: %s", err)
+        self._heartbeat_task = None
+        if self._connection.is_usable:
+            self.__schedule_heartbeat()
+
+    def uses_connection(
+        self,
+        *,
+        host: str,
+        port: int,
+        max_connections: int,
+        tcp_keepalive: int,
+        heartbeat_interval: float,
+    ) -> bool:
+        """Return true if the client connects with the provided options."""
+        return (
+            self._host,
+            self._port,
+            self._max_connections,
+            self._tcp_keepalive,
+            self._heartbeat_interval,
+        ) == (host, port, max_connections, tcp_keepalive, heartbeat_interval)
 
     @property
     def is_connected(self) -> bool:
@@ -80,133 +358,530 @@ class AskoheatModbusApiClient:
     @property
     def is_ready(self) -> bool:
         """Return true if connected and no communication error occurred."""
-        return self.is_connected and self._last_communication_success
+        return self._connection.state == ConnectionState.READY
 
-    def last_communication_failed(self) -> None:
-        """Mark last communication with the API as failed."""
-        self._last_communication_success = False
+    @property
+    def connection_state(self) -> ConnectionState:
+        """Return the health state of the modbus connection."""
+        return self._connection.state
+
+    @property
+    def round_trip_times(self) -> dict[str, Any]:
+        """Return the distribution of measured round-trip times and the timeout."""
+        return self._round_trip_times.as_dict()
+
+    @property
+    def request_metrics(self) -> AskoheatModbusMetrics:
+        """Return latencies and errors of requests by operation and block."""
+        return self._metrics
+
+    def add_connection_listener(
+        self, listener: Callable[[ConnectionState], None]
+    ) -> Callable[[], None]:
+        """Listen for changes of the health state of the modbus connection."""
+        return self._connection.add_listener(listener)
 
     def close(self) -> None:
         """Close comnection to modbus client."""
+        self._connection.close()
+
+    def __close_clients(self) -> None:
         self._client.close()
+        self.__close_parallel_clients()
+
+    def __close_parallel_clients(self) -> None:
+        if self._parallel_task is not None:
+            self._parallel_task.cancel()
+            self._parallel_task = None
+        self._parallel_reads = False
+        for client in self._parallel_clients:
+            client.close()
+
+    def __fall_back_to_serial_reads(self, reason: object) -> None:
+        """Read serially until the additional connections are reconnected."""
+        if not self._parallel_clients:
+            return
+        LOGGER.warning(
+            "Parallel modbus connections to %s:%s failed (%s), reading serially",
+            self._host,
+            self._port,
+            reason,
+        )
+        self.__close_parallel_clients()
+        self._parallel_attempt += 1
+        self.__schedule_parallel_connect()
 
-    async def async_read_ema_data(self) -> AskoheatDataBlock:
+    async def async_read_ema_data(self) -> dict[str, Any]:
         """Read EMA states."""
-        data = await self.__async_read_input_registers_data(
-            EMA_REGISTER_BLOCK_DESCRIPTOR.starting_register,
-            EMA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
-        )
-        if len(data.registers) != EMA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers:
-            msg = "Unexpected number of registers read."
-            LOGGER.error(
-                "%s: number of registers=%s, expected=%s",
-                msg,
-                len(data.registers),
-                EMA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
-            )
-            raise AskoheatModbusApiClientCommunicationError(
-                translation_domain=DOMAIN, translation_key=msg
-            )
-        LOGGER.debug("async_read_ema_data %s", data)
-        return self.__map_data(EMA_REGISTER_BLOCK_DESCRIPTOR, data)
+        (result,) = await self.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR])
+        return result.data
 
     async def async_write_ema_data(
         self, api_desc: RegisterInputDescriptor, value: object
-    ) -> AskoheatDataBlock:
+    ) -> AskoheatBlockData:
         """Write EMA parameter."""
         LOGGER.debug(
             f"async write ema parameter at {api_desc.starting_register}, value={value}"
         )
-        register_values = await self._prepare_register_value(
-            api_desc,
-            value,
-            lambda: self.__async_read_single_input_register(
-                EMA_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)
-            ),
-        )
-        if len(register_values) > 0:
+
+        async def write() -> None:
+            register_values = await self._prepare_register_value(
+                api_desc,
+                value,
+                lambda: self.__async_read_single_input_register(
+                    EMA_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)
+                ),
+            )
+            _raise_if_empty(register_values, value)
             await self.__async_write_register_values(
                 EMA_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc),
                 register_values,
             )
-        return await self.async_read_ema_data()
 
-    async def async_read_par_data(self) -> AskoheatDataBlock:
-        """Read PAR states."""
-        data = await self.__async_read_input_registers_data(
-            PARAM_REGISTER_BLOCK_DESCRIPTOR.starting_register,
-            PARAM_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
+        await self.__async_schedule_write(write)
+        self.__expire_poll_tiers(EMA_REGISTER_BLOCK_DESCRIPTOR, api_desc)
+        (result,) = await self.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR])
+        return result
+
+    async def async_write_feed_in_value(self, value: float) -> None:
+        """
+        Write the feed-in value without re-reading the EMA block.
+
+        The write is validated through the response of the device, the EMA block
+        is read again by the regular poll.
+        """
+        api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+        if api_desc is None:
+            return
+        address = EMA_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)
+        register_values = _prepare_int16(value)
+        _raise_if_empty(register_values, value)
+        response = await self.__async_schedule_write(
+            lambda: self.__async_write_register_values(address, register_values)
         )
-        if len(data.registers) != PARAM_REGISTER_BLOCK_DESCRIPTOR.number_of_registers:
-            msg = "Unexpected number of registers read."
+        self.__expire_poll_tiers(EMA_REGISTER_BLOCK_DESCRIPTOR, api_desc)
+        if (
+            response is None
+            or response.isError()
+            or response.address != address
+            or response.count != len(register_values)
+        ):
             LOGGER.error(
-                "%s: number of registers=%s, expected=%s",
-                msg,
-                len(data.registers),
-                PARAM_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
+                "Writing feed-in value %s to register %s not confirmed: %s",
+                value,
+                address,
+                response,
             )
             raise AskoheatModbusApiClientCommunicationError(
-                translation_domain=DOMAIN, translation_key=msg
+                translation_domain=DOMAIN, translation_key="write_not_confirmed"
             )
-        LOGGER.debug("async_read_par_data %s", data)
-        return self.__map_data(PARAM_REGISTER_BLOCK_DESCRIPTOR, data)
 
-    async def async_read_config_data(self) -> AskoheatDataBlock:
-        """Read config states."""
-        data = await self.__async_read_holding_registers_data(
-            CONF_REGISTER_BLOCK_DESCRIPTOR.starting_register,
-            CONF_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
+    def restore_block_data(
+        self, block: RegisterBlockDescriptor, registers: list[int]
+    ) -> dict[str, Any]:
+        """Decode cached registers of a block as if they were read from the device."""
+        return self.__decode(block, registers).data
+
+    def set_decode_engine(self, decode_engine: DecodeEngine) -> None:
+        """Decode register blocks with the provided engine."""
+        self._decode_plan = (
+            numpy_decode_plan if decode_engine == DecodeEngine.NUMPY else decode_plan
         )
-        if len(data.registers) != CONF_REGISTER_BLOCK_DESCRIPTOR.number_of_registers:
-            msg = "Unexpected number of registers read."
-            LOGGER.error(
-                "%s: number of registers=%s, expected=%s",
-                msg,
-                len(data.registers),
-                CONF_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
+
+    def set_register_history(self, frames: int) -> None:
+        """Keep the raw registers of the provided number of reads per block."""
+        if frames != self._register_history:
+            self._register_history = frames
+            self._histories = {}
+
+    def register_history(
+        self, block: RegisterBlockName
+    ) -> AskoheatRegisterHistory | None:
+        """Return the history of raw registers of a block, None if disabled."""
+        if self._register_history <= 0:
+            return None
+        history = self._histories.get(block)
+        if history is None:
+            number_of_registers = next(
+                descriptor.number_of_registers
+                for descriptor, name in _BLOCK_NAMES.items()
+                if name == block
             )
-            raise AskoheatModbusApiClientCommunicationError(
-                translation_domain=DOMAIN, translation_key=msg
+            history = self._histories[block] = AskoheatRegisterHistory(
+                number_of_registers, self._register_history
             )
-        LOGGER.debug("async_read_config_data %s", data)
-        return self.__map_data(CONF_REGISTER_BLOCK_DESCRIPTOR, data)
+        return history
+
+    def block_registers(self, block: RegisterBlockDescriptor) -> list[int] | None:
+        """Return the registers of the last read of a block."""
+        snapshot = self._snapshots.get(block)
+        return snapshot[0] if snapshot is not None else None
+
+    async def async_read_par_data(self) -> dict[str, Any]:
+        """Read PAR states."""
+        (result,) = await self.async_read_blocks([PARAM_REGISTER_BLOCK_DESCRIPTOR])
+        return result.data
+
+    async def async_read_config_data(self) -> dict[str, Any]:
+        """Read config states."""
+        (result,) = await self.async_read_blocks([CONF_REGISTER_BLOCK_DESCRIPTOR])
+        return result.data
 
     async def async_write_config_data(
         self, api_desc: RegisterInputDescriptor, value: object
-    ) -> AskoheatDataBlock:
+    ) -> AskoheatBlockData:
         """Write EMA parameter."""
         LOGGER.debug(
             "async write config parameter at %i, value=%r",
             api_desc.starting_register,
             value,
         )
-        register_values = await self._prepare_register_value(
-            api_desc,
-            value,
-            lambda: self.__async_read_single_holding_register(
-                CONF_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)
-            ),
-        )
-        if len(register_values) > 0:
+
+        async def write() -> None:
+            register_values = await self._prepare_register_value(
+                api_desc,
+                value,
+                lambda: self.__async_read_single_holding_register(
+                    CONF_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)
+                ),
+            )
+            _raise_if_empty(register_values, value)
             await self.__async_write_register_values(
                 CONF_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc),
                 register_values,
             )
-        return await self.async_read_config_data()
 
-    async def async_read_op_data(self) -> AskoheatDataBlock:
+        await self.__async_schedule_write(write)
+        self.__expire_poll_tiers(CONF_REGISTER_BLOCK_DESCRIPTOR, api_desc)
+        (result,) = await self.async_read_blocks([CONF_REGISTER_BLOCK_DESCRIPTOR])
+        return result
+
+    async def async_read_op_data(self) -> dict[str, Any]:
         """Read OP data states."""
-        data = await self.__async_read_input_registers_data(
-            DATA_REGISTER_BLOCK_DESCRIPTOR.starting_register,
-            DATA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers,
+        (result,) = await self.async_read_blocks([DATA_REGISTER_BLOCK_DESCRIPTOR])
+        return result.data
+
+    async def async_read_blocks(
+        self, blocks: Sequence[RegisterBlockDescriptor]
+    ) -> list[AskoheatBlockData]:
+        """
+        Read and map the provided register blocks.
+
+        Reads requested within the same event loop iteration, i.e. by coordinators
+        becoming due at the same time, are planned together and merged into the
+        fewest possible modbus transactions. Callers requesting a block which is
+        already waiting to be read share the result of the pending read.
+        """
+        self.__raise_if_unusable()
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[AskoheatBlockData]] = []
+        for block in blocks:
+            future = self._pending_reads.get(block)
+            if future is None:
+                future = self._pending_reads[block] = loop.create_future()
+            futures.append(future)
+        self.__schedule_requests()
+
+        # shared reads must not be cancelled if a single caller gives up waiting
+        return [await asyncio.shield(future) for future in futures]
+
+    async def __async_schedule_write[T](
+        self, write: Callable[[], Coroutine[Any, Any, T]]
+    ) -> T:
+        """Execute a write before any pending read."""
+        self.__raise_if_unusable()
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._pending_writes.append((write, future))
+        self.__schedule_requests()
+        return await future
+
+    def __raise_if_unusable(self) -> None:
+        """Fail fast instead of waiting for timeouts while the circuit is open."""
+        if not self._connection.is_usable:
+            msg = "not_connected"
+            raise AskoheatModbusApiClientCommunicationError(
+                translation_domain=DOMAIN, translation_key=msg
+            )
+
+    def __schedule_requests(self) -> None:
+        if self._request_task is None:
+            self._request_task = asyncio.get_running_loop().create_task(
+                self.__async_process_requests()
+            )
+
+    def __due_poll_tiers(
+        self, block: RegisterBlockDescriptor, now: float
+    ) -> frozenset[PollTier]:
+        """Return the poll tiers of a block whose registers are due to be read."""
+        return frozenset(
+            tier
+            for tier in PollTier
+            if (read_at := self._poll_tier_reads.get((block, tier))) is None
+            or now - read_at >= tier
+            or self._poll_tier_writes.get((block, tier), -1) >= read_at
+        )
+
+    def __expire_poll_tiers(
+        self, block: RegisterBlockDescriptor, api_desc: RegisterInputDescriptor
+    ) -> None:
+        """Read the registers of a written value with the next read of the block."""
+        tiers = register_poll_tiers(block)
+        now = monotonic()
+        for offset in range(
+            api_desc.starting_register,
+            api_desc.starting_register + api_desc.number_of_registers,
+        ):
+            if (tier := tiers[offset]) is not None:
+                # reads planned before the write might not include the value
+                self._poll_tier_writes[block, tier] = now
+
+    def __plan_block_ranges(
+        self, block: RegisterBlockDescriptor, tiers: frozenset[PollTier]
+    ) -> list[RegisterRange]:
+        """Return the ranges of a block to read, the full block on the first read."""
+        if block not in self._snapshots:
+            return [RegisterRange.of_block(block)]
+        return plan_block_ranges(block, tiers)
+
+    def __merge_registers(
+        self,
+        block: RegisterBlockDescriptor,
+        ranges: Sequence[RegisterRange],
+        registers: dict[RegisterRange, list[int]],
+    ) -> list[int]:
+        """Overlay the registers read on the registers of the last read of a block."""
+        snapshot = self._snapshots.get(block)
+        merged = (
+            list(snapshot[0])
+            if snapshot is not None
+            else [0] * block.number_of_registers
         )
-        if len(data.registers) != DATA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers:
+        for rng in ranges:
+            offset = rng.starting_register - block.starting_register
+            merged[offset : offset + rng.number_of_registers] = registers[rng]
+        return merged
+
+    def __decode(
+        self, block: RegisterBlockDescriptor, registers: list[int]
+    ) -> AskoheatBlockData:
+        """Decode registers of a block, re-decoding only changed registers."""
+        snapshot = self._snapshots.get(block)
+        if snapshot is None:
+            data = self._decode_plan(block).decode(registers)
+            self._snapshots[block] = (registers, data)
+            return AskoheatBlockData(data, None)
+
+        previous_registers, previous_data = snapshot
+        if previous_registers == registers:
+            return AskoheatBlockData(previous_data, frozenset())
+        data, changed_keys = self._decode_plan(block).decode_changes(
+            registers, previous_registers, previous_data
+        )
+        if not changed_keys:
+            # keep previous data as the changed registers did not affect any value
+            data = previous_data
+        self._snapshots[block] = (registers, data)
+        return AskoheatBlockData(data, changed_keys)
+
+    async def __async_process_requests(self) -> None:
+        """Execute pending writes and reads until no request is left."""
+        pending: dict[RegisterBlockDescriptor, asyncio.Future[AskoheatBlockData]] = {}
+        try:
+            while (
+                self._pending_writes
+                or self._pending_reads
+                or self._pending_heartbeat is not None
+            ):
+                await self.__async_process_pending_writes()
+                pending, self._pending_reads = self._pending_reads, {}
+                await self.__async_process_pending_reads(pending)
+                await self.__async_process_pending_heartbeat()
+        finally:
+            futures: list[asyncio.Future[Any]] = [
+                *pending.values(),
+                *self._pending_reads.values(),
+                *(future for _, future in self._pending_writes),
+            ]
+            if self._pending_heartbeat is not None:
+                futures.append(self._pending_heartbeat)
+            for future in futures:
+                if not future.done():
+                    future.cancel()
+            self._pending_reads = {}
+            self._pending_writes.clear()
+            self._pending_heartbeat = None
+            self._request_task = None
+
+    async def __async_process_pending_writes(self) -> None:
+        """Execute all pending writes in the order they were requested."""
+        while self._pending_writes:
+            write, future = self._pending_writes.popleft()
+            if future.done():
+                # caller gave up waiting before the write was started
+                continue
+            try:
+                result = await write()
+            except Exception as err:  # noqa: BLE001
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    async def __async_process_pending_heartbeat(self) -> None:
+        """Execute the heartbeat read, unless other requests used the connection."""
+        future, self._pending_heartbeat = self._pending_heartbeat, None
+        if future is None or future.done():
+            return
+        if (
+            self._pending_writes
+            or self._pending_reads
+            or monotonic() - self._last_request_at < self._heartbeat_interval
+        ):
+            # the connection is kept open by the other requests
+            future.set_result(None)
+            return
+        try:
+            await self.__async_probe()
+        except Exception as err:  # noqa: BLE001
+            if not future.done():
+                future.set_exception(err)
+        else:
+            if not future.done():
+                future.set_result(None)
+
+    async def __async_process_pending_reads(
+        self,
+        pending: dict[RegisterBlockDescriptor, asyncio.Future[AskoheatBlockData]],
+    ) -> None:
+        """Execute pending block reads with a combined read plan."""
+        registers: dict[RegisterRange, list[int]] = {}
+        failures: dict[RegisterRange, Exception] = {}
+        # only the registers of values due in their poll tier are read
+        now = monotonic()
+        due_tiers = {block: self.__due_poll_tiers(block, now) for block in pending}
+        block_ranges = {
+            block: self.__plan_block_ranges(block, tiers)
+            for block, tiers in due_tiers.items()
+        }
+        reads = plan_reads(rng for ranges in block_ranges.values() for rng in ranges)
+        while reads:
+            # writes requested meanwhile take priority over the remaining reads
+            await self.__async_process_pending_writes()
+            clients = [self._client]
+            if self._parallel_reads:
+                clients.extend(self._parallel_clients)
+            started, reads = reads[: len(clients)], reads[len(clients) :]
+            results = await asyncio.gather(
+                *(
+                    self.__async_try_read_planned_registers(read, client)
+                    for read, client in zip(started, clients, strict=False)
+                )
+            )
+            for read, result in zip(started, results, strict=True):
+                if isinstance(result, Exception):
+                    failures.update(dict.fromkeys(read.ranges, result))
+                    continue
+                split_registers(read, result.registers, registers)
+
+        for block, future in pending.items():
+            if future.done():
+                continue
+            ranges = block_ranges[block]
+            failure = next((failures[rng] for rng in ranges if rng in failures), None)
+            if failure is not None:
+                future.set_exception(failure)
+                continue
+            block_registers = self.__merge_registers(block, ranges, registers)
+            if (history := self.register_history(_BLOCK_NAMES[block])) is not None:
+                history.add(
+                    datetime.now(UTC).timestamp(),
+                    block_registers,
+                    _read_registers(block, ranges),
+                )
+            try:
+                result = self.__decode(block, block_registers)
+            except Exception as err:  # noqa: BLE001
+                future.set_exception(err)
+                continue
+            self._poll_tier_reads.update(
+                dict.fromkeys(((block, tier) for tier in due_tiers[block]), now)
+            )
+            future.set_result(
+                result._replace(
+                    registers_read=sum(rng.number_of_registers for rng in ranges)
+                )
+            )
+
+    async def __async_try_read_planned_registers(
+        self, read: PlannedRead, client: AsyncModbusTcpClient
+    ) -> ModbusPDU | Exception:
+        """Execute a planned read, retrying on the main connection on failures."""
+        try:
+            result = await self.__async_read_planned_registers(read, client)
+        except Exception as err:  # noqa: BLE001
+            if client is self._client:
+                return err
+            if self._parallel_reads:
+                self.__fall_back_to_serial_reads(err)
+        else:
+            if client is not self._client:
+                self._parallel_attempt = 0
+            return result
+        self.__request_metrics(
+            _read_operation(read.register_type),
+            read.register_type,
+            read.starting_register,
+            read.number_of_registers,
+        ).add_retry()
+        try:
+            return await self.__async_read_planned_registers(read, self._client)
+        except Exception as err:  # noqa: BLE001
+            return err
+
+    async def __async_read_planned_registers(
+        self, read: PlannedRead, client: AsyncModbusTcpClient
+    ) -> ModbusPDU:
+        """Execute a single planned read transaction on the provided connection."""
+        if read.register_type == RegisterType.HOLDING:
+            data = await self.__async_read_holding_registers_data(
+                read.starting_register, read.number_of_registers, client
+            )
+        else:
+            data = await self.__async_read_input_registers_data(
+                read.starting_register, read.number_of_registers, client
+            )
+        if len(data.registers) != read.number_of_registers:
             msg = "Unexpected number of registers read."
+            LOGGER.error(
+                "%s: number of registers=%s, expected=%s",
+                msg,
+                len(data.registers),
+                read.number_of_registers,
+            )
             raise AskoheatModbusApiClientCommunicationError(
                 translation_domain=DOMAIN, translation_key=msg
             )
-        LOGGER.debug("async_read_op_data %s", data)
-        return self.__map_data(DATA_REGISTER_BLOCK_DESCRIPTOR, data)
+        LOGGER.debug(
+            "read %s registers %s+%s: %s",
+            read.register_type,
+            read.starting_register,
+            read.number_of_registers,
+            data,
+        )
+        return data
+
+    async def __async_probe(self) -> None:
+        """Read a single register to check whether the device answers."""
+        address = EMA_REGISTER_BLOCK_DESCRIPTOR.starting_register
+        await self.__async_request(
+            self._client,
+            lambda: self._client.read_input_registers(address=address, count=1),
+            self.__request_metrics(
+                ModbusOperation.HEARTBEAT, RegisterType.INPUT, address, 1
+            ),
+            1,
+        )
 
     async def __async_read_single_input_register(
         self,
@@ -215,19 +890,21 @@ class AskoheatModbusApiClient:
         return (await self.__async_read_input_registers_data(address, 1)).registers[0]
 
     async def __async_read_input_registers_data(
-        self, address: int, count: int
+        self, address: int, count: int, client: AsyncModbusTcpClient | None = None
     ) -> ModbusPDU:
         """Read holding registers through modbus."""
-        if not self._client.connected:
-            msg = "not_connected"
-            raise AskoheatModbusApiClientCommunicationError(
-                translation_domain=DOMAIN, translation_key=msg
-            )
-
-        try:
-            return await self._client.read_input_registers(address=address, count=count)
-        finally:
-            self._last_communication_success = True
+        client = client or self._client
+        return await self.__async_request(
+            client,
+            lambda: client.read_input_registers(address=address, count=count),
+            self.__request_metrics(
+                ModbusOperation.READ_INPUT_REGISTERS,
+                RegisterType.INPUT,
+                address,
+                count,
+            ),
+            count,
+        )
 
     async def __async_read_single_holding_register(
         self,
@@ -236,36 +913,110 @@ class AskoheatModbusApiClient:
         return (await self.__async_read_holding_registers_data(address, 1)).registers[0]
 
     async def __async_read_holding_registers_data(
-        self, address: int, count: int
+        self, address: int, count: int, client: AsyncModbusTcpClient | None = None
     ) -> ModbusPDU:
         """Read input registers through modbus."""
-        if not self._client.connected:
-            msg = "not_connected"
-            raise AskoheatModbusApiClientCommunicationError(
-                translation_domain=DOMAIN, translation_key=msg
-            )
-
-        try:
-            return await self._client.read_holding_registers(
-                address=address, count=count
-            )
-        finally:
-            self._last_communication_success = True
+        client = client or self._client
+        return await self.__async_request(
+            client,
+            lambda: client.read_holding_registers(address=address, count=count),
+            self.__request_metrics(
+                ModbusOperation.READ_HOLDING_REGISTERS,
+                RegisterType.HOLDING,
+                address,
+                count,
+            ),
+            count,
+        )
 
     async def __async_write_register_values(
         self, address: int, values: list[int]
-    ) -> None:
+    ) -> ModbusPDU | None:
         """Write a register value through modbus."""
-        if not self._client.connected:
+        return await self.__async_request(
+            self._client,
+            lambda: self._client.write_registers(address=address, values=values),
+            self.__request_metrics(
+                ModbusOperation.WRITE_REGISTERS,
+                RegisterType.HOLDING,
+                address,
+                len(values),
+            ),
+            len(values),
+        )
+
+    def __request_metrics(
+        self,
+        operation: ModbusOperation,
+        register_type: RegisterType,
+        address: int,
+        count: int,
+    ) -> AskoheatRequestMetrics:
+        """Return the metrics of a request, accounted to the blocks it covers."""
+        blocks = [
+            name
+            for block, name in _BLOCK_NAMES.items()
+            if block.register_type == register_type
+            and block.starting_register < address + count
+            and address < block.starting_register + block.number_of_registers
+        ]
+        return self._metrics.get(
+            operation, "+".join(blocks) if blocks else RegisterBlockName.UNKNOWN
+        )
+
+    async def __async_request[T](
+        self,
+        client: AsyncModbusTcpClient,
+        request: Callable[[], Coroutine[Any, Any, T]],
+        metrics: AskoheatRequestMetrics,
+        registers: int,
+    ) -> T:
+        """
+        Execute a modbus request, tracking the health of the main connection.
+
+        Requests time out based on the round-trip times measured before, so a dead
+        connection is detected quickly without failing requests over slow links.
+        Latencies and errors of requests of all connections are recorded by the
+        provided metrics.
+        """
+        tracked = client is self._client
+        if not client.connected:
+            if tracked:
+                self._connection.record_failure(connected=False)
             msg = "not_connected"
-            raise AskoheatModbusApiClientCommunicationError(
+            error = AskoheatModbusApiClientCommunicationError(
                 translation_domain=DOMAIN, translation_key=msg
             )
+            metrics.add(0, registers=registers, error=error)
+            raise error
 
+        timeout = self._round_trip_times.timeout
+        started = monotonic()
         try:
-            await self._client.write_registers(address=address, values=values)
-        finally:
-            self._last_communication_success = True
+            async with asyncio.timeout(timeout):
+                result = await request()
+                self._last_request_at = monotonic()
+        except TimeoutError as err:
+            # the timeout grows if the link slowed down for all further requests
+            self._round_trip_times.add(timeout)
+            metrics.add(timeout, registers=registers, error=err)
+            if tracked:
+                self._connection.record_failure(connected=client.connected)
+            msg = "request_timeout"
+            raise AskoheatModbusApiClientCommunicationError(
+                translation_domain=DOMAIN, translation_key=msg
+            ) from err
+        except Exception as err:
+            metrics.add(monotonic() - started, registers=registers, error=err)
+            if tracked:
+                self._connection.record_failure(connected=client.connected)
+            raise
+        latency = monotonic() - started
+        self._round_trip_times.add(latency)
+        metrics.add(latency, registers=registers)
+        if tracked:
+            self._connection.record_success()
+        return result
 
     async def _prepare_register_value(
         self,
@@ -305,228 +1056,43 @@ class AskoheatModbusApiClient:
                 result = []
         return cast("list[int]", result)
 
-    def __map_data(
-        self, descr: RegisterBlockDescriptor, data: ModbusPDU
-    ) -> AskoheatDataBlock:
-        binary_sensors = {
-            k: v
-            for k, v in {
-                item.key: _read_register_boolean_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.binary_sensors
-            }.items()
-            if v is not None
-        }
-        number_inputs = {
-            k: v
-            for k, v in {
-                item.key: _read_register_number_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.number_inputs
-            }.items()
-            if v is not None
-        }
-        sensors = {
-            k: v
-            for k, v in {
-                item.key: _read_register_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.sensors
-            }.items()
-            if v is not None
-        }
-        switches = {
-            k: v
-            for k, v in {
-                item.key: _read_register_boolean_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.switches
-            }.items()
-            if v is not None
-        }
-        text_inputs = {
-            k: v
-            for k, v in {
-                item.key: _read_register_string_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.text_inputs
-            }.items()
-            if v is not None
-        }
-        time_inputs = {
-            k: v
-            for k, v in {
-                item.key: _read_register_time_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.time_inputs
-            }.items()
-            if v is not None
-        }
-        select_inputs = dict(
-            {
-                item.key: _read_register_enum_input(data, item.api_descriptor)  # type: ignore  # noqa: PGH003
-                for item in descr.select_inputs
-            }.items()
-        )
-        return AskoheatDataBlock(
-            binary_sensors=binary_sensors,
-            sensors=sensors,
-            switches=switches,
-            number_inputs=number_inputs,
-            text_inputs=text_inputs,
-            time_inputs=time_inputs,
-            select_inputs=select_inputs,
-        )
-
-
-def _read_register_input(  # noqa: PLR0912
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> Any:
-    result: Any = None
-    match desc:
-        case FlagRegisterInputDescriptor(starting_register, bit):
-            result = _read_flag(data.registers[starting_register], bit)
-        case IntEnumInputDescriptor(starting_register, factory):
-            try:
-                value = _read_byte(data.registers[starting_register])
-                result = None if value is None else factory(int(value))
-            except ValueError as err:
-                LOGGER.warning(err)
-                result = None
-        case ByteRegisterInputDescriptor(starting_register):
-            result = _read_byte(data.registers[starting_register])
-        case UnsignedInt16RegisterInputDescriptor(starting_register):
-            result = _read_uint16(data.registers[starting_register])
-        case UnsignedInt32RegisterInputDescriptor(starting_register):
-            result = _read_uint32(
-                data.registers[starting_register : starting_register + 2]
-            )
-        case UnsignedInt32RegisterInputDescriptor(starting_register):
-            result = _read_uint32(
-                data.registers[starting_register : starting_register + 2]
-            )
-        case SignedInt16RegisterInputDescriptor(starting_register):
-            result = _read_int16(data.registers[starting_register])
-        case Float32RegisterInputDescriptor(starting_register):
-            result = _read_float32(
-                data.registers[starting_register : starting_register + 2]
-            )
-        case StrEnumInputDescriptor(starting_register, number_of_words, factory):
-            try:
-                result = factory(
-                    _read_str(
-                        data.registers[
-                            starting_register : starting_register + number_of_words
-                        ]
-                    )
-                )
-            except ValueError as err:
-                LOGGER.warning(err)
-                result = None
-
-        case StringRegisterInputDescriptor(starting_register, number_of_words):
-            result = _read_str(
-                data.registers[starting_register : starting_register + number_of_words]
-            )
-        case TimeRegisterInputDescriptor(starting_register):
-            result = _read_time(
-                register_value_hours=data.registers[starting_register],
-                register_value_minutes=data.registers[starting_register + 1],
-            )
-        case StructRegisterInputDescriptor(starting_register, bytes, structure):
-            result = _read_struct(
-                data.registers[starting_register : starting_register + bytes], structure
-            )
-        case _:
-            LOGGER.error("Cannot read number input from descriptor %r", desc)
-            result = None
-    return result
-
-
-def _read_register_boolean_input(
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> bool | None:
-    result = _read_register_input(data, desc)
-    if isinstance(result, bool):
-        return result
-
-    if isinstance(result, int):
-        return bool(result == 1)
 
-    if result is not None:
-        LOGGER.error(
-            "Cannot read bool input from descriptor %r, unsupported value %r",
-            desc,
-            result,
-        )
-    return None
-
-
-def _read_register_number_input(
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> int | float | None:
-    result = _read_register_input(data, desc)
-    if isinstance(result, int | float):
-        return result
-
-    if result is not None:
-        LOGGER.error(
-            "Cannot read number input from descriptor %r, unsupported value %r",
-            desc,
-            type(result),
-        )
-    return None
+def _raise_if_empty(register_values: list[int], value: object) -> None:
+    """Reject values which could not be converted to register values."""
+    if not register_values:
+        raise _invalid_value_error(value)
 
 
-def _read_register_string_input(
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> str | None:
-    result = _read_register_input(data, desc)
-    if isinstance(result, str):
-        return result
-
-    if result is not None:
-        LOGGER.error(
-            "Cannot read str input from descriptor %r, unsupported value %r",
-            desc,
-            result,
-        )
-    return None
+def _raise_if_not_finite(value: float) -> None:
+    """Reject NaN and infinite values, which have no integer representation."""
+    if not math.isfinite(value):
+        raise _invalid_value_error(value)
 
 
-def _read_register_time_input(
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> time | None:
-    result = _read_register_input(data, desc)
-    if isinstance(result, time):
-        return result
-
-    if result is not None:
-        LOGGER.error(
-            "Cannot read time input from descriptor %r, unsupported value %r",
-            desc,
-            result,
-        )
-    return None
-
+def _invalid_value_error(value: object) -> AskoheatModbusApiClientError:
+    return AskoheatModbusApiClientError(
+        translation_domain=DOMAIN,
+        translation_key="invalid_value",
+        translation_placeholders={"value": repr(value)},
+    )
 
-def _read_register_enum_input(
-    data: ModbusPDU, desc: RegisterInputDescriptor
-) -> ReprEnum | None:
-    result = _read_register_input(data, desc)
-    if isinstance(result, ReprEnum):
-        return result
 
-    if result is not None:
-        LOGGER.error(
-            "Cannot read enum input from descriptor %r, unsupported value %r",
-            desc,
-            result,
-        )
-    return None
+def _read_registers(
+    block: RegisterBlockDescriptor, ranges: Sequence[RegisterRange]
+) -> list[bool]:
+    """Return flags of the registers of a block read within the ranges."""
+    read = [False] * block.number_of_registers
+    for rng in ranges:
+        start = rng.starting_register - block.starting_register
+        end = start + rng.number_of_registers
+        read[start:end] = [True] * rng.number_of_registers
+    return read
 
 
-def _read_time(register_value_hours: int, register_value_minutes: int) -> time | None:
-    """Read register values as string and parse as time."""
-    hours = _read_uint16(register_value_hours)
-    minutes = _read_uint16(register_value_minutes)
-    if hours is not None and minutes is not None:
-        return time(hour=hours, minute=minutes)
-    return None
+def _read_operation(register_type: RegisterType) -> ModbusOperation:
+    if register_type == RegisterType.HOLDING:
+        return ModbusOperation.READ_HOLDING_REGISTERS
+    return ModbusOperation.READ_INPUT_REGISTERS
 
 
 def _prepare_time(value: object) -> list[int]:
@@ -540,17 +1106,6 @@ def _prepare_time(value: object) -> list[int]:
     return _prepare_uint16(time_value.hour).__add__(_prepare_uint16(time_value.minute))
 
 
-def _read_str(register_values: list[int]) -> str:
-    """Read register values as str."""
-    # custom implementation as strings are represented with little endian
-    byte_list = bytearray()
-    for x in register_values:
-        byte_list.extend(int.to_bytes(x, 2, "little"))
-    while byte_list[-1:] == b"\00":
-        byte_list = byte_list[:-1]
-    return byte_list.decode().strip(" ")
-
-
 def _prepare_str(value: object) -> list[int]:
     """Prepare string value for writing to registers."""
     if not isinstance(value, str):
@@ -569,19 +1124,6 @@ def _prepare_str(value: object) -> list[int]:
     return result
 
 
-def _read_byte(register_value: int) -> int | None:
-    """Read register value as byte."""
-    value = AsyncModbusTcpClient.convert_from_registers(
-        [register_value], AsyncModbusTcpClient.DATATYPE.INT16
-    )
-    if not isinstance(value, SupportsInt):
-        LOGGER.error(
-            "Cannot read register value %s as byte, wrong result %r", value, type(value)
-        )
-        return None
-    return int(value)
-
-
 def _prepare_byte(value: object) -> list[int]:
     """Prepare byte value for writing to registers."""
     if not isinstance(value, number | float | bool | int):
@@ -594,27 +1136,12 @@ def _prepare_byte(value: object) -> list[int]:
     if isinstance(value, bool):
         value = 1 if value else 0
 
+    _raise_if_not_finite(value)
     return AsyncModbusTcpClient.convert_to_registers(
         int(value), AsyncModbusTcpClient.DATATYPE.INT16
     )
 
 
-def _read_int16(register_value: int) -> int | None:
-    """Read register value as int16."""
-    value = AsyncModbusTcpClient.convert_from_registers(
-        [register_value], AsyncModbusTcpClient.DATATYPE.INT16
-    )
-    if not isinstance(value, SupportsInt):
-        LOGGER.error(
-            "Cannot read register value %s as int16, wrong result type %r",
-            value,
-            type(value),
-        )
-        return None
-
-    return int(value)
-
-
 def _prepare_int16(value: object) -> list[int]:
     """Prepare signed int value for writing to registers."""
     if not isinstance(value, number | float | int):
@@ -624,27 +1151,12 @@ def _prepare_int16(value: object) -> list[int]:
             type(value),
         )
         return []
+    _raise_if_not_finite(value)
     return AsyncModbusTcpClient.convert_to_registers(
         int(value), AsyncModbusTcpClient.DATATYPE.INT16
     )
 
 
-def _read_uint16(register_value: int) -> int | None:
-    """Read register value as uint16."""
-    value = AsyncModbusTcpClient.convert_from_registers(
-        [register_value], AsyncModbusTcpClient.DATATYPE.UINT16
-    )
-    if not isinstance(value, SupportsInt):
-        LOGGER.error(
-            "Cannot read register value %s as uint16, wrong result type %r",
-            value,
-            type(value),
-        )
-        return None
-
-    return int(value)
-
-
 def _prepare_uint16(value: object) -> list[int]:
     """Prepare unsigned int 16 value for writing to registers."""
     if not isinstance(value, number | float | int):
@@ -655,26 +1167,12 @@ def _prepare_uint16(value: object) -> list[int]:
         )
         return []
 
+    _raise_if_not_finite(value)
     return AsyncModbusTcpClient.convert_to_registers(
         int(value), AsyncModbusTcpClient.DATATYPE.UINT16
     )
 
 
-def _read_uint32(register_values: list[int]) -> int | None:
-    """Read register value as uint32."""
-    value = AsyncModbusTcpClient.convert_from_registers(
-        register_values, AsyncModbusTcpClient.DATATYPE.UINT32
-    )
-    if not isinstance(value, SupportsInt):
-        LOGGER.error(
-            "Cannot read register value %s as uint32, wrong result type %r",
-            value,
-            type(value),
-        )
-        return None
-    return int(value)
-
-
 def _prepare_uint32(value: object) -> list[int]:
     """Prepare unsigned int 32 value for writing to registers."""
     if not isinstance(value, number | float | int):
@@ -685,26 +1183,12 @@ def _prepare_uint32(value: object) -> list[int]:
         )
         return []
 
+    _raise_if_not_finite(value)
     return AsyncModbusTcpClient.convert_to_registers(
         int(value), AsyncModbusTcpClient.DATATYPE.UINT32
     )
 
 
-def _read_float32(register_values: list[int]) -> float | None:
-    """Read register value as uint16."""
-    value = AsyncModbusTcpClient.convert_from_registers(
-        register_values, AsyncModbusTcpClient.DATATYPE.FLOAT32
-    )
-    if not isinstance(value, SupportsFloat):
-        LOGGER.error(
-            "Cannot read register value %s as float32, wrong result type %r",
-            value,
-            type(value),
-        )
-        return None
-    return float(value)
-
-
 def _prepare_float32(value: object) -> list[int]:
     """Prepare float32 value writing to registers."""
     if not isinstance(value, number | float | int):
@@ -717,11 +1201,6 @@ def _prepare_float32(value: object) -> list[int]:
     )
 
 
-def _read_flag(register_value: int, index: int) -> bool:
-    """Validate if bit at provided index is set."""
-    return (register_value >> index) & 0x01 == 0x01
-
-
 def _prepare_flag(register_value: int, flag: object, index: int) -> list[int]:
     """Prepare flag value as mask with current value for writing to a register."""
     if not isinstance(flag, bool):
@@ -741,24 +1220,6 @@ def _prepare_flag(register_value: int, flag: object, index: int) -> list[int]:
     return [register_value & (0xFFFF ^ (True << index))]
 
 
-def _read_struct(register_values: list[int], structure: str | bytes) -> Any | None:
-    """Read register values and unpack using python struct."""
-    byte_string = b"".join([x.to_bytes(2, byteorder="big") for x in register_values])
-    if byte_string == b"nan\x00":
-        return None
-
-    try:
-        val = struct.unpack(structure, byte_string)
-    except struct.error as err:
-        recv_size = len(register_values) * 2
-        msg = f"Received {recv_size} bytes, unpack error {err}"
-        LOGGER.error(msg)
-        return None
-    if len(val) == 1:
-        return val[0]
-    return val
-
-
 def _prepare_struct(value: object, structure: str | bytes) -> list[int]:
     """Pack value based on python struct for writing to registers."""
     as_bytes = struct.pack(structure, value)
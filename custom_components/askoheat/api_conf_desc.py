@@ -20,6 +20,7 @@ from custom_components.askoheat.api_desc import (
     Float32RegisterInputDescriptor,
     IntEnumInputDescriptor,
     RegisterBlockDescriptor,
+    RegisterType,
     SignedInt16RegisterInputDescriptor,
     StrEnumInputDescriptor,
     StringRegisterInputDescriptor,
@@ -61,6 +62,7 @@ CONF_FEED_IN_ENABLED_SWITCH_ENTITY_DESCRIPTOR = AskoheatSwitchEntityDescription(
 CONF_REGISTER_BLOCK_DESCRIPTOR = RegisterBlockDescriptor(
     starting_register=500,
     number_of_registers=100,
+    register_type=RegisterType.HOLDING,
     number_inputs=[
         AskoheatNumberEntityDescription(
             key=NumberAttrKey.CON_RELAY_SEC_COUNT_SECONDS,
@@ -0,0 +1,232 @@
+"""Health of the modbus connection with reconnects using exponential backoff."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections import deque
+from typing import TYPE_CHECKING, Any, cast
+
+from custom_components.askoheat.api_metrics import percentile
+from custom_components.askoheat.const import (
+    LOGGER,
+    MAX_CONSECUTIVE_FAILURES,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    REQUEST_TIMEOUT_FACTOR,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+    ROUND_TRIP_SAMPLES,
+    ConnectionState,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine
+    from datetime import timedelta
+
+
+class AskoheatConnection:
+    """
+    Track the health of the modbus connection and reconnect once it is down.
+
+    The connection is ready while requests succeed, degraded after failed requests
+    and down once the connection is lost or too many requests failed in a row. The
+    first reconnect is attempted immediately, further attempts are delayed by an
+    exponentially growing backoff with jitter.
+
+    This acts as circuit breaker: requests are only sent while the connection is
+    ready or degraded, the connect callable probes the device with a single
+    request while connecting, before requests are resumed.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Coroutine[Any, Any, bool]],
+        close: Callable[[], None],
+        *,
+        backoff_min: timedelta = RECONNECT_BACKOFF_MIN,
+        backoff_max: timedelta = RECONNECT_BACKOFF_MAX,
+        max_consecutive_failures: int = MAX_CONSECUTIVE_FAILURES,
+    ) -> None:
+        """Initialize the connection with callables to connect and close clients."""
+        self._connect = connect
+        self._close = close
+        self._backoff_min = backoff_min.total_seconds()
+        self._backoff_max = backoff_max.total_seconds()
+        self._max_consecutive_failures = max_consecutive_failures
+        self._state = ConnectionState.CONNECTING
+        self._failures = 0
+        self._reconnect_task: asyncio.Task[None] | None = None
+        self._listeners: list[Callable[[ConnectionState], None]] = []
+
+    @property
+    def state(self) -> ConnectionState:
+        """Return the current health state of the connection."""
+        return self._state
+
+    @property
+    def is_usable(self) -> bool:
+        """Return true if requests may be sent through the connection."""
+        return self._state in (ConnectionState.READY, ConnectionState.DEGRADED)
+
+    def add_listener(
+        self, listener: Callable[[ConnectionState], None]
+    ) -> Callable[[], None]:
+        """Listen for changes of the connection state."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    async def async_connect(self, *, retry: bool = False) -> bool:
+        """
+        Connect once, reconnecting is left to the caller if this fails.
+
+        If retry is set, connecting is retried with backoff until it succeeds or the
+        connection is closed.
+        """
+        if (connected := await self.__async_try_connect()) or not retry:
+            return connected
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self.__async_reconnect(attempt=1)
+            )
+        # closing the connection cancels the reconnect without cancelling the caller
+        await asyncio.wait([self._reconnect_task])
+        return self._state == ConnectionState.READY
+
+    def close(self) -> None:
+        """Close the connection and stop reconnecting."""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        self.__set_state(ConnectionState.DOWN)
+        self._close()
+
+    def record_success(self) -> None:
+        """Mark a request as succeeded."""
+        self._failures = 0
+        if self._state == ConnectionState.DEGRADED:
+            self.__set_state(ConnectionState.READY)
+
+    def record_failure(self, *, connected: bool) -> None:
+        """Mark a request as failed, reconnecting if the connection is down."""
+        if not self.is_usable:
+            return
+        self._failures += 1
+        if not connected:
+            self.connection_lost()
+        elif self._failures < self._max_consecutive_failures:
+            self.__set_state(ConnectionState.DEGRADED)
+        else:
+            LOGGER.warning(
+                "Modbus connection down after %s failed requests, reconnecting",
+                self._failures,
+            )
+            self.__reconnect()
+
+    def connection_lost(self) -> None:
+        """Reconnect after the connection was closed."""
+        if not self.is_usable:
+            return
+        LOGGER.warning("Modbus connection lost, reconnecting")
+        self.__reconnect()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return the delay before a reconnect attempt, the first one is immediate."""
+        if attempt == 0:
+            return 0
+        delay = min(self._backoff_max, self._backoff_min * 2 ** (attempt - 1))
+        # jitter spreads reconnects of several clients after a device reboot
+        return random.uniform(delay / 2, delay)  # noqa: S311
+
+    def __reconnect(self) -> None:
+        self.__set_state(ConnectionState.DOWN)
+        self._close()
+        if self._reconnect_task is None:
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self.__async_reconnect()
+            )
+
+    async def __async_reconnect(self, attempt: int = 0) -> None:
+        try:
+            while not await self.__async_try_connect(self.backoff_delay(attempt)):
+                attempt += 1
+        finally:
+            self._reconnect_task = None
+
+    async def __async_try_connect(self, delay: float = 0) -> bool:
+        if delay > 0:
+            LOGGER.debug("Reconnect to modbus in %.1f s", delay)
+            await asyncio.sleep(delay)
+        self.__set_state(ConnectionState.CONNECTING)
+        try:
+            connected = await self._connect()
+        except Exception as err:  # noqa: BLE001
+            LOGGER.debug("Connecting to modbus failed: %s", err)
+            connected = False
+        if not connected:
+            # start over with a new connection on the next attempt
+            self._close()
+        self._failures = 0
+        self.__set_state(ConnectionState.READY if connected else ConnectionState.DOWN)
+        return connected
+
+    def __set_state(self, state: ConnectionState) -> None:
+        if state == self._state:
+            return
+        LOGGER.debug("Modbus connection %s", state)
+        self._state = state
+        for listener in list(self._listeners):
+            listener(state)
+
+
+class AskoheatRoundTripTimes:
+    """
+    Rolling distribution of the round-trip times of modbus requests.
+
+    Requests time out after the 99th percentile of the recent round-trip times
+    multiplied by a factor, bounded by a floor and a ceiling. The ceiling is used
+    until enough round-trips were measured.
+    """
+
+    def __init__(
+        self,
+        *,
+        samples: int = ROUND_TRIP_SAMPLES,
+        factor: float = REQUEST_TIMEOUT_FACTOR,
+        timeout_min: timedelta = REQUEST_TIMEOUT_MIN,
+        timeout_max: timedelta = REQUEST_TIMEOUT_MAX,
+    ) -> None:
+        """Initialize an empty distribution."""
+        self._samples: deque[float] = deque(maxlen=samples)
+        self._min_samples = max(1, samples // 10)
+        self._factor = factor
+        self._timeout_min = timeout_min.total_seconds()
+        self._timeout_max = timeout_max.total_seconds()
+        self._timeout = self._timeout_max
+
+    @property
+    def timeout(self) -> float:
+        """Return the timeout in seconds derived from the recent round-trip times."""
+        return self._timeout
+
+    def add(self, round_trip_time: float) -> None:
+        """Add the round-trip time in seconds of a request."""
+        self._samples.append(round_trip_time)
+        if len(self._samples) >= self._min_samples:
+            p99 = cast("float", self.percentile(99))
+            self._timeout = min(
+                self._timeout_max, max(self._timeout_min, p99 * self._factor)
+            )
+
+    def percentile(self, percentile_: float) -> float | None:
+        """Return the nearest-rank percentile of the recent round-trip times."""
+        return percentile(self._samples, percentile_)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the distribution summary for diagnostics."""
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "timeout": self._timeout,
+        }
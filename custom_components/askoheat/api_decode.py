@@ -0,0 +1,347 @@
+"""Precompiled decode plans mapping register blocks to entity values."""
+
+from __future__ import annotations
+
+import struct
+from datetime import time
+from enum import ReprEnum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_desc import (
+    ByteRegisterInputDescriptor,
+    FlagRegisterInputDescriptor,
+    Float32RegisterInputDescriptor,
+    IntEnumInputDescriptor,
+    RegisterBlockDescriptor,
+    RegisterInputDescriptor,
+    SignedInt16RegisterInputDescriptor,
+    StrEnumInputDescriptor,
+    StringRegisterInputDescriptor,
+    StructRegisterInputDescriptor,
+    TimeRegisterInputDescriptor,
+    UnsignedInt16RegisterInputDescriptor,
+    UnsignedInt32RegisterInputDescriptor,
+)
+from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from custom_components.askoheat.model import AskoheatEntityDescription
+
+type Decoder = Callable[[Sequence[int], int], Any]
+
+_FLOAT32 = struct.Struct(">f")
+_WORDS = struct.Struct(">HH")
+# marker of values not available on the device
+NAN_BYTES = b"nan\x00"
+_MISSING = object()
+
+
+class DecodeStep(NamedTuple):
+    """Single value decoded from a register block."""
+
+    offset: int
+    width: int
+    decode: Decoder
+    key: str
+    # keep the key in the result even if no value could be decoded
+    keep_none: bool = False
+
+
+class DecodePlan(NamedTuple):
+    """Flat list of decode steps of a register block."""
+
+    steps: tuple[DecodeStep, ...]
+    # decode steps reading from each register offset of the block
+    register_steps: tuple[tuple[DecodeStep, ...], ...]
+
+    def decode(self, registers: Sequence[int]) -> dict[str, Any]:
+        """Decode all values of the register block."""
+        result: dict[str, Any] = {}
+        for offset, _, decode, key, keep_none in self.steps:
+            value = decode(registers, offset)
+            if value is not None or keep_none:
+                result[key] = value
+        return result
+
+    def decode_changes(
+        self,
+        registers: Sequence[int],
+        previous_registers: Sequence[int],
+        previous_data: dict[str, Any],
+    ) -> tuple[dict[str, Any], frozenset[str]]:
+        """Re-decode only values reading from registers changed since last read."""
+        register_steps = self.register_steps
+        steps: dict[DecodeStep, None] = {}
+        for offset, (value, previous) in enumerate(
+            zip(registers, previous_registers, strict=True)
+        ):
+            if value != previous:
+                steps.update(dict.fromkeys(register_steps[offset]))
+
+        data = dict(previous_data)
+        changed: list[str] = []
+        for offset, _, decode, key, keep_none in steps:
+            value = decode(registers, offset)
+            previous = data.get(key, _MISSING)
+            if value is None and not keep_none:
+                if previous is not _MISSING:
+                    del data[key]
+                    changed.append(key)
+            elif previous is _MISSING or _differs(previous, value):
+                data[key] = value
+                changed.append(key)
+        return data, frozenset(changed)
+
+
+def compile_decode_plan(block: RegisterBlockDescriptor) -> DecodePlan:
+    """Resolve decoders of all entities of a register block once."""
+    steps: list[DecodeStep] = []
+    for descriptions, result_type in (
+        (block.binary_sensors, bool),
+        (block.sensors, object),
+        (block.switches, bool),
+        (block.number_inputs, int | float),
+        (block.text_inputs, str),
+        (block.time_inputs, time),
+        (block.select_inputs, ReprEnum),
+    ):
+        for description in descriptions:
+            step = _compile_step(description, result_type)
+            if step is not None:
+                steps.append(step)
+
+    register_steps: list[list[DecodeStep]] = [
+        [] for _ in range(block.number_of_registers)
+    ]
+    for step in steps:
+        for offset in range(step.offset, step.offset + step.width):
+            register_steps[offset].append(step)
+    return DecodePlan(
+        steps=tuple(steps),
+        register_steps=tuple(tuple(offset_steps) for offset_steps in register_steps),
+    )
+
+
+def changed_keys(previous_data: dict[str, Any], data: dict[str, Any]) -> frozenset[str]:
+    """Return keys of values added, removed or changed between two decodes."""
+    return frozenset(
+        key
+        for key in previous_data.keys() | data.keys()
+        if _differs(previous_data.get(key, _MISSING), data.get(key, _MISSING))
+    )
+
+
+def _differs(previous: Any, value: Any) -> bool:
+    """Return true if a value changed, NaN values never equal themselves."""
+    return previous != value and not (previous != previous and value != value)  # noqa: PLR0124
+
+
+def decode_plan(block: RegisterBlockDescriptor) -> DecodePlan:
+    """Return the precompiled decode plan of a register block."""
+    plan = _DECODE_PLANS.get(block)
+    if plan is None:
+        plan = _DECODE_PLANS[block] = compile_decode_plan(block)
+    return plan
+
+
+def _compile_step(  # noqa: PLR0912
+    description: AskoheatEntityDescription[Any, Any],
+    result_type: type | Any,
+) -> DecodeStep | None:
+    """Resolve decoder of a single entity description for the expected result."""
+    desc: RegisterInputDescriptor | None = description.api_descriptor
+    if desc is None:
+        return None
+    offset = desc.starting_register
+    key: str = description.data_key  # type: ignore[attr-defined]
+    keep_none = result_type is ReprEnum
+
+    match desc:
+        case FlagRegisterInputDescriptor(_, bit):
+            width, value_type = 1, bool
+            decode = _flag_decoder(bit)
+        case IntEnumInputDescriptor(_, factory):
+            width, value_type = 1, ReprEnum
+            decode = _enum_decoder(factory, _read_int16)
+        case ByteRegisterInputDescriptor() | SignedInt16RegisterInputDescriptor():
+            width, value_type = 1, int
+            decode = _read_int16
+        case UnsignedInt16RegisterInputDescriptor():
+            width, value_type = 1, int
+            decode = _read_uint16
+        case UnsignedInt32RegisterInputDescriptor():
+            width, value_type = 2, int
+            decode = _read_uint32
+        case Float32RegisterInputDescriptor():
+            width, value_type = 2, float
+            decode = _read_float32
+        case StrEnumInputDescriptor(_, number_of_words, factory):
+            width, value_type = number_of_words, ReprEnum
+            decode = _enum_decoder(factory, _str_decoder(number_of_words))
+        case StringRegisterInputDescriptor(_, number_of_words):
+            width, value_type = number_of_words, str
+            decode = _str_decoder(number_of_words)
+        case TimeRegisterInputDescriptor():
+            width, value_type = 2, time
+            decode = _read_time
+        case StructRegisterInputDescriptor(_, number_of_words, structure):
+            width, value_type = number_of_words, object
+            decode = _struct_decoder(number_of_words, structure)
+        case _:
+            LOGGER.error("Cannot read input from descriptor %r", desc)
+            return None
+
+    if result_type is object or issubclass(value_type, result_type):
+        pass
+    elif result_type is bool and value_type is int:
+        # int values represent a boolean state if equal to 1
+        decode = _bool_decoder(decode)
+    elif value_type is object:
+        decode = _checked_decoder(decode, result_type, desc)
+    else:
+        LOGGER.error(
+            "Cannot read %s input from descriptor %r, unsupported value type %r",
+            result_type,
+            desc,
+            value_type,
+        )
+        return None
+    return DecodeStep(offset, width, decode, key, keep_none)
+
+
+def _flag_decoder(bit: int) -> Decoder:
+    mask = 1 << bit
+    return lambda registers, offset: registers[offset] & mask == mask
+
+
+def _enum_decoder(factory: Callable[[Any], ReprEnum], read: Decoder) -> Decoder:
+    return lambda registers, offset: to_enum(factory, read(registers, offset))
+
+
+def to_enum(factory: Callable[[Any], ReprEnum], value: Any) -> ReprEnum | None:
+    """Convert a decoded value to its enum, logging unknown values."""
+    try:
+        return factory(value)
+    except ValueError as err:
+        LOGGER.warning(err)
+        return None
+
+
+def _str_decoder(number_of_words: int) -> Decoder:
+    return lambda registers, offset: _read_str(
+        registers[offset : offset + number_of_words]
+    )
+
+
+def _struct_decoder(number_of_words: int, structure: str | bytes) -> Decoder:
+    return lambda registers, offset: _read_struct(
+        registers[offset : offset + number_of_words], structure
+    )
+
+
+def _bool_decoder(read: Decoder) -> Decoder:
+    return lambda registers, offset: read(registers, offset) == 1
+
+
+def _checked_decoder(read: Decoder, result_type: Any, desc: object) -> Decoder:
+    """Validate type of values which cannot be determined upfront."""
+
+    def decode(registers: Sequence[int], offset: int) -> Any:
+        return check_value(read(registers, offset), result_type, desc)
+
+    return decode
+
+
+def check_value(result: Any, result_type: Any, desc: object) -> Any:
+    """Validate type of a decoded value which could not be determined upfront."""
+    if result_type is bool and isinstance(result, int):
+        return bool(result == 1)
+    if result is None or isinstance(result, result_type):
+        return result
+    LOGGER.error(
+        "Cannot read %s input from descriptor %r, unsupported value %r",
+        result_type,
+        desc,
+        result,
+    )
+    return None
+
+
+def _read_int16(registers: Sequence[int], offset: int) -> int:
+    """Read register value as signed int16."""
+    value = registers[offset]
+    return value - 0x10000 if value & 0x8000 else value
+
+
+def _read_uint16(registers: Sequence[int], offset: int) -> int:
+    """Read register value as unsigned int16."""
+    return registers[offset]
+
+
+def _read_uint32(registers: Sequence[int], offset: int) -> int:
+    """Read two big endian ordered register values as unsigned int32."""
+    return registers[offset] << 16 | registers[offset + 1]
+
+
+def _read_float32(registers: Sequence[int], offset: int) -> float:
+    """Read two big endian ordered register values as float32."""
+    return _FLOAT32.unpack(_WORDS.pack(registers[offset], registers[offset + 1]))[0]
+
+
+def _read_time(registers: Sequence[int], offset: int) -> time:
+    """Read two following register values as hours and minutes of a time."""
+    return time(hour=registers[offset], minute=registers[offset + 1])
+
+
+def _read_str(register_values: Sequence[int]) -> str:
+    """Read register values as str."""
+    # custom implementation as strings are represented with little endian
+    byte_list = bytearray()
+    for x in register_values:
+        byte_list.extend(int.to_bytes(x, 2, "little"))
+    return to_str(bytes(byte_list))
+
+
+def to_str(byte_string: bytes) -> str:
+    """Convert little endian ordered register bytes to str."""
+    return byte_string.rstrip(b"\00").decode().strip(" ")
+
+
+def _read_struct(register_values: Sequence[int], structure: str | bytes) -> Any | None:
+    """Read register values and unpack using python struct."""
+    byte_string = b"".join([x.to_bytes(2, byteorder="big") for x in register_values])
+    return unpack_struct(byte_string, structure)
+
+
+def unpack_struct(byte_string: bytes, structure: str | bytes) -> Any | None:
+    """Unpack big endian ordered register bytes using python struct."""
+    if byte_string == NAN_BYTES:
+        return None
+
+    try:
+        val = struct.unpack(structure, byte_string)
+    except struct.error as err:
+        recv_size = len(byte_string)
+        msg = f"Received {recv_size} bytes, unpack error {err}"
+        LOGGER.error(msg)
+        return None
+    if len(val) == 1:
+        return val[0]
+    return val
+
+
+_DECODE_PLANS: dict[RegisterBlockDescriptor, DecodePlan] = {
+    block: compile_decode_plan(block)
+    for block in (
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    )
+}
@@ -0,0 +1,334 @@
+"""Decode register blocks at once by viewing them through numpy structured dtypes."""
+
+from __future__ import annotations
+
+from datetime import time
+from enum import ReprEnum
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import numpy as np
+
+from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_decode import (
+    NAN_BYTES,
+    changed_keys,
+    check_value,
+    to_enum,
+    to_str,
+    unpack_struct,
+)
+from custom_components.askoheat.api_desc import (
+    ByteRegisterInputDescriptor,
+    FlagRegisterInputDescriptor,
+    Float32RegisterInputDescriptor,
+    IntEnumInputDescriptor,
+    RegisterBlockDescriptor,
+    RegisterInputDescriptor,
+    SignedInt16RegisterInputDescriptor,
+    StrEnumInputDescriptor,
+    StringRegisterInputDescriptor,
+    StructRegisterInputDescriptor,
+    TimeRegisterInputDescriptor,
+    UnsignedInt16RegisterInputDescriptor,
+    UnsignedInt32RegisterInputDescriptor,
+)
+from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.const import LOGGER
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from custom_components.askoheat.model import AskoheatEntityDescription
+
+type Converter = Callable[[Any], Any]
+
+# struct formats of single big endian values which can be viewed by numpy directly
+_STRUCT_DTYPES = {
+    ">h": ">i2",
+    ">H": ">u2",
+    ">l": ">i4",
+    ">L": ">u4",
+    ">i": ">i4",
+    ">I": ">u4",
+    ">f": ">f4",
+}
+
+
+class NumpyField(NamedTuple):
+    """Value of a structured dtype field converted to the entity value."""
+
+    key: str
+    convert: Converter | None
+    # keep the key in the result even if no value could be decoded
+    keep_none: bool = False
+
+
+class NumpyDecodePlan(NamedTuple):
+    """Structured dtypes and flag masks decoding a register block in one pass."""
+
+    # fields read from the big endian ordered register bytes, starting with the
+    # fields whose values are used as is
+    big_endian: np.dtype[Any]
+    plain_keys: tuple[str, ...]
+    big_endian_fields: tuple[NumpyField, ...]
+    # strings are stored with little endian ordered register bytes
+    little_endian: np.dtype[Any] | None
+    little_endian_fields: tuple[NumpyField, ...]
+    flag_offsets: np.ndarray[Any, np.dtype[np.intp]]
+    flag_masks: np.ndarray[Any, np.dtype[np.uint16]]
+    flag_keys: tuple[str, ...]
+
+    def decode(self, registers: Sequence[int]) -> dict[str, Any]:
+        """Decode all values of the register block."""
+        values = np.asarray(registers, dtype="<u2")
+        result: dict[str, Any] = {}
+        if self.flag_keys:
+            masks = self.flag_masks
+            flags = values[self.flag_offsets] & masks == masks
+            result.update(zip(self.flag_keys, flags.tolist(), strict=True))
+
+        big_endian = values.astype(">u2").view(self.big_endian)[0].item()
+        plain_keys = self.plain_keys
+        result.update(zip(plain_keys, big_endian, strict=False))
+        _convert_fields(result, self.big_endian_fields, big_endian[len(plain_keys) :])
+        if self.little_endian is not None:
+            _convert_fields(
+                result,
+                self.little_endian_fields,
+                values.view(self.little_endian)[0].item(),
+            )
+        return result
+
+    def decode_changes(
+        self,
+        registers: Sequence[int],
+        previous_registers: Sequence[int],  # noqa: ARG002
+        previous_data: dict[str, Any],
+    ) -> tuple[dict[str, Any], frozenset[str]]:
+        """Decode the whole block and determine values changed since last read."""
+        data = self.decode(registers)
+        return data, changed_keys(previous_data, data)
+
+
+def _convert_fields(
+    result: dict[str, Any], fields: tuple[NumpyField, ...], values: tuple[Any, ...]
+) -> None:
+    for (key, convert, keep_none), value in zip(fields, values, strict=True):
+        if convert is not None:
+            value = convert(value)  # noqa: PLW2901
+        if value is not None or keep_none:
+            result[key] = value
+
+
+class _DtypeBuilder:
+    """Collect possibly overlapping fields of a structured dtype."""
+
+    def __init__(self, itemsize: int) -> None:
+        self.itemsize = itemsize
+        self.plain: list[tuple[str, int, NumpyField]] = []
+        self.converted: list[tuple[str, int, NumpyField]] = []
+
+    def add(self, fmt: str, offset: int, field: NumpyField) -> None:
+        if field.convert is None and not field.keep_none:
+            self.plain.append((fmt, offset * 2, field))
+        else:
+            self.converted.append((fmt, offset * 2, field))
+
+    @property
+    def plain_keys(self) -> tuple[str, ...]:
+        return tuple(field.key for _, _, field in self.plain)
+
+    @property
+    def converted_fields(self) -> tuple[NumpyField, ...]:
+        return tuple(field for _, _, field in self.converted)
+
+    def build(self) -> np.dtype[Any]:
+        fields = self.plain + self.converted
+        return np.dtype(
+            {
+                "names": [f"f{i}" for i in range(len(fields))],
+                "formats": [fmt for fmt, _, _ in fields],
+                "offsets": [offset for _, offset, _ in fields],
+                "itemsize": self.itemsize,
+            }
+        )
+
+
+def compile_numpy_decode_plan(block: RegisterBlockDescriptor) -> NumpyDecodePlan:
+    """Generate structured dtypes of all entities of a register block once."""
+    itemsize = block.number_of_registers * 2
+    big_endian = _DtypeBuilder(itemsize)
+    little_endian = _DtypeBuilder(itemsize)
+    flag_offsets: list[int] = []
+    flag_masks: list[int] = []
+    flag_keys: list[str] = []
+
+    for descriptions, result_type in (
+        (block.binary_sensors, bool),
+        (block.sensors, object),
+        (block.switches, bool),
+        (block.number_inputs, int | float),
+        (block.text_inputs, str),
+        (block.time_inputs, time),
+        (block.select_inputs, ReprEnum),
+    ):
+        for description in descriptions:
+            compiled = _compile_field(description, result_type)
+            if compiled is None:
+                continue
+            fmt, offset, field = compiled
+            if isinstance(fmt, int):
+                flag_offsets.append(offset)
+                flag_masks.append(fmt)
+                flag_keys.append(field.key)
+            elif fmt.startswith("S"):
+                little_endian.add(fmt, offset, field)
+            else:
+                big_endian.add(fmt, offset, field)
+
+    return NumpyDecodePlan(
+        big_endian=big_endian.build(),
+        plain_keys=big_endian.plain_keys,
+        big_endian_fields=big_endian.converted_fields,
+        little_endian=little_endian.build() if little_endian.converted else None,
+        little_endian_fields=little_endian.converted_fields,
+        flag_offsets=np.array(flag_offsets, dtype=np.intp),
+        flag_masks=np.array(flag_masks, dtype=np.uint16),
+        flag_keys=tuple(flag_keys),
+    )
+
+
+def numpy_decode_plan(block: RegisterBlockDescriptor) -> NumpyDecodePlan:
+    """Return the precompiled numpy decode plan of a register block."""
+    plan = _NUMPY_DECODE_PLANS.get(block)
+    if plan is None:
+        plan = _NUMPY_DECODE_PLANS[block] = compile_numpy_decode_plan(block)
+    return plan
+
+
+def _compile_field(  # noqa: PLR0912
+    description: AskoheatEntityDescription[Any, Any],
+    result_type: type | Any,
+) -> tuple[str | int, int, NumpyField] | None:
+    """
+    Resolve dtype format of a single entity description for the expected result.
+
+    Bit flags are returned with their mask instead of a format as they are
+    evaluated vectorised over all flags of the block.
+    """
+    desc: RegisterInputDescriptor | None = description.api_descriptor
+    if desc is None:
+        return None
+    offset = desc.starting_register
+    key: str = description.data_key  # type: ignore[attr-defined]
+    keep_none = result_type is ReprEnum
+    convert: Converter | None = None
+
+    fmt: str | int
+    match desc:
+        case FlagRegisterInputDescriptor(_, bit):
+            fmt, value_type = 1 << bit, bool
+        case IntEnumInputDescriptor(_, factory):
+            fmt, value_type = ">i2", ReprEnum
+            convert = _enum_converter(factory, None)
+        case ByteRegisterInputDescriptor() | SignedInt16RegisterInputDescriptor():
+            fmt, value_type = ">i2", int
+        case UnsignedInt16RegisterInputDescriptor():
+            fmt, value_type = ">u2", int
+        case UnsignedInt32RegisterInputDescriptor():
+            fmt, value_type = ">u4", int
+        case Float32RegisterInputDescriptor():
+            fmt, value_type = ">f4", float
+        case StrEnumInputDescriptor(_, number_of_words, factory):
+            fmt, value_type = f"S{number_of_words * 2}", ReprEnum
+            convert = _enum_converter(factory, to_str)
+        case StringRegisterInputDescriptor(_, number_of_words):
+            fmt, value_type = f"S{number_of_words * 2}", str
+            convert = to_str
+        case TimeRegisterInputDescriptor():
+            fmt, value_type = ">u4", time
+            convert = _to_time
+        case StructRegisterInputDescriptor(_, number_of_words, structure):
+            fmt, convert = _struct_field(number_of_words, structure)
+            value_type = object
+        case _:
+            LOGGER.error("Cannot read input from descriptor %r", desc)
+            return None
+
+    if result_type is object or issubclass(value_type, result_type):
+        pass
+    elif result_type is bool and value_type is int:
+        # int values represent a boolean state if equal to 1
+        convert = _to_bool
+    elif value_type is object:
+        convert = _checked_converter(convert, result_type, desc)
+    else:
+        LOGGER.error(
+            "Cannot read %s input from descriptor %r, unsupported value type %r",
+            result_type,
+            desc,
+            value_type,
+        )
+        return None
+    return fmt, offset, NumpyField(key, convert, keep_none)
+
+
+def _struct_field(
+    number_of_words: int, structure: str | bytes
+) -> tuple[str, Converter]:
+    """Resolve dtype format of a struct, falling back to unpacking raw bytes."""
+    if isinstance(structure, bytes):
+        structure = structure.decode()
+    dtype = _STRUCT_DTYPES.get(structure)
+    if dtype is not None and np.dtype(dtype).itemsize == len(NAN_BYTES) == (
+        number_of_words * 2
+    ):
+        nan_value = np.frombuffer(NAN_BYTES, dtype=dtype)[0].item()
+        return dtype, _nan_converter(nan_value)
+    return f"V{number_of_words * 2}", _struct_converter(structure)
+
+
+def _nan_converter(nan_value: Any) -> Converter:
+    return lambda value: None if value == nan_value else value
+
+
+def _struct_converter(structure: str) -> Converter:
+    return lambda value: unpack_struct(bytes(value), structure)
+
+
+def _enum_converter(
+    factory: Callable[[Any], ReprEnum], convert: Converter | None
+) -> Converter:
+    if convert is None:
+        return lambda value: to_enum(factory, value)
+    return lambda value: to_enum(factory, convert(value))
+
+
+def _checked_converter(
+    convert: Converter | None, result_type: Any, desc: object
+) -> Converter:
+    if convert is None:
+        return lambda value: check_value(value, result_type, desc)
+    return lambda value: check_value(convert(value), result_type, desc)
+
+
+def _to_bool(value: int) -> bool:
+    return value == 1
+
+
+def _to_time(value: int) -> time:
+    """Convert hours and minutes of two following registers to a time."""
+    return time(hour=value >> 16, minute=value & 0xFFFF)
+
+
+_NUMPY_DECODE_PLANS: dict[RegisterBlockDescriptor, NumpyDecodePlan] = {
+    block: compile_numpy_decode_plan(block)
+    for block in (
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    )
+}
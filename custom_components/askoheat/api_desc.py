@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import math
+import struct
 import typing
 from abc import ABC
 from dataclasses import dataclass, field
@@ -26,12 +28,24 @@ class SwitchAttrKey(StrEnum):
     """Askoheat binary switch attribute keys."""
 
 
+class RegisterType(StrEnum):
+    """Modbus register types a register block can be read from."""
+
+    INPUT = "input"
+    HOLDING = "holding"
+
+
 @dataclass(frozen=True)
 class RegisterInputDescriptor(ABC):  # noqa: B024
     """Description of a register based input."""
 
     starting_register: typing.Final[int] = field()
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return 1
+
 
 @dataclass(frozen=True)
 class FlagRegisterInputDescriptor(RegisterInputDescriptor):
@@ -49,6 +63,11 @@ class ByteRegisterInputDescriptor(RegisterInputDescriptor):
 class Float32RegisterInputDescriptor(RegisterInputDescriptor):
     """Input register representing a float32."""
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return 2
+
 
 @dataclass(frozen=True)
 class SignedInt16RegisterInputDescriptor(RegisterInputDescriptor):
@@ -64,6 +83,11 @@ class UnsignedInt16RegisterInputDescriptor(RegisterInputDescriptor):
 class UnsignedInt32RegisterInputDescriptor(RegisterInputDescriptor):
     """Input register representing an unsigned int 32."""
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return 2
+
 
 @dataclass(frozen=True)
 class StringRegisterInputDescriptor(RegisterInputDescriptor):
@@ -71,11 +95,21 @@ class StringRegisterInputDescriptor(RegisterInputDescriptor):
 
     number_of_words: int
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return self.number_of_words
+
 
 @dataclass(frozen=True)
 class TimeRegisterInputDescriptor(RegisterInputDescriptor):
     """Input register representing a time string combined of two following registers."""
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return 2
+
 
 @dataclass(frozen=True)
 class StructRegisterInputDescriptor(RegisterInputDescriptor):
@@ -85,6 +119,11 @@ class StructRegisterInputDescriptor(RegisterInputDescriptor):
     # format as defined in python struct https://docs.python.org/3/library/struct.html
     structure: str | bytes
 
+    @property
+    def number_of_registers(self) -> int:
+        """Return the number of registers holding the value."""
+        return math.ceil(struct.calcsize(self.structure) / 2)
+
 
 @dataclass(frozen=True)
 class StrEnumInputDescriptor[E: StrEnum](StringRegisterInputDescriptor):
@@ -102,12 +141,14 @@ class IntEnumInputDescriptor[E: IntEnum](ByteRegisterInputDescriptor):
     values: list[E] = field(hash=False)
 
 
-@dataclass(frozen=True)
+# compared by identity as blocks are used as keys of their precompiled decode plans
+@dataclass(eq=False)
 class RegisterBlockDescriptor:
     """Based askoheat modbus block (range of registers) descriptor."""
 
     starting_register: int
     number_of_registers: int
+    register_type: RegisterType = RegisterType.INPUT
 
     binary_sensors: list[AskoheatBinarySensorEntityDescription] = field(
         default_factory=list
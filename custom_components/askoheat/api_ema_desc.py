@@ -22,6 +22,7 @@ from custom_components.askoheat.const import (
     BinarySensorAttrKey,
     DeviceKey,
     NumberAttrKey,
+    PollTier,
     SensorAttrKey,
 )
 from custom_components.askoheat.model import (
@@ -295,6 +296,7 @@ EMA_REGISTER_BLOCK_DESCRIPTOR = RegisterBlockDescriptor(
             entity_category=None,
             mode=NumberMode.SLIDER,
             api_descriptor=ByteRegisterInputDescriptor(18),
+            poll_tier=PollTier.SLOW,
         ),
         AskoheatNumberEntityDescription(
             key=NumberAttrKey.LOAD_SETPOINT_VALUE,
@@ -307,6 +309,7 @@ EMA_REGISTER_BLOCK_DESCRIPTOR = RegisterBlockDescriptor(
             native_unit_of_measurement=UnitOfPower.WATT,
             entity_category=None,
             api_descriptor=SignedInt16RegisterInputDescriptor(19),
+            poll_tier=PollTier.SLOW,
             entity_registry_enabled_default=False,
         ),
         EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
@@ -0,0 +1,101 @@
+"""History of raw register frames read from the device."""
+
+from __future__ import annotations
+
+from array import array
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class AskoheatRegisterHistory:
+    """
+    Ring buffer of the most recent raw register frames of a register block.
+
+    The registers of all frames are copied into a single preallocated array of
+    unsigned 16 bit values, the oldest frame is overwritten once the capacity is
+    reached. Registers which were not read with a frame, as they were taken over
+    from a previous read of the block, are returned as `None`.
+    """
+
+    def __init__(self, number_of_registers: int, capacity: int) -> None:
+        """Initialize an empty history holding up to capacity frames."""
+        self._number_of_registers = number_of_registers
+        self._capacity = capacity
+        # unix timestamps of the frames
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._registers = array("H", bytes(2 * capacity * number_of_registers))
+        # flags of the registers read with each frame
+        self._read = bytearray(capacity * number_of_registers)
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Return the number of recorded frames."""
+        return self._size
+
+    def add(
+        self,
+        timestamp: float,
+        registers: Sequence[int],
+        read: Sequence[bool] | None = None,
+    ) -> None:
+        """
+        Add the registers of a block read at the unix timestamp.
+
+        If provided, read flags which of the registers were read, all otherwise.
+        """
+        if len(registers) != self._number_of_registers or (
+            read is not None and len(read) != self._number_of_registers
+        ):
+            return
+        start = self._next * self._number_of_registers
+        end = start + self._number_of_registers
+        self._registers[start:end] = array("H", registers)
+        self._read[start:end] = (
+            bytes(read) if read is not None else b"\x01" * self._number_of_registers
+        )
+        self._timestamps[self._next] = timestamp
+        self._next = (self._next + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def frames(
+        self, *, since: float | None = None, limit: int | None = None
+    ) -> list[tuple[float, list[int | None]]]:
+        """Return the frames oldest first, optionally since a unix timestamp."""
+        first = (self._next - self._size) % self._capacity
+        indexes = [
+            index
+            for index in (
+                (first + offset) % self._capacity for offset in range(self._size)
+            )
+            if since is None or self._timestamps[index] >= since
+        ]
+        if limit is not None:
+            # the most recent frames are the relevant ones
+            indexes = indexes[-limit:] if limit > 0 else []
+        return [(self._timestamps[index], self._frame(index)) for index in indexes]
+
+    def _frame(self, index: int) -> list[int | None]:
+        start = index * self._number_of_registers
+        end = start + self._number_of_registers
+        return [
+            register if read else None
+            for register, read in zip(
+                self._registers[start:end], self._read[start:end], strict=True
+            )
+        ]
+
+    def as_list(
+        self, *, since: float | None = None, limit: int | None = None
+    ) -> list[dict[str, Any]]:
+        """Return the frames oldest first for diagnostics and services."""
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(timestamp, UTC).isoformat(),
+                "registers": registers,
+            }
+            for timestamp, registers in self.frames(since=since, limit=limit)
+        ]
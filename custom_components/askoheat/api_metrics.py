@@ -0,0 +1,203 @@
+"""Latency and error metrics of modbus requests."""
+
+from __future__ import annotations
+
+import bisect
+import math
+from array import array
+from collections import deque
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from custom_components.askoheat.const import (
+    LATENCY_BUCKETS,
+    ROUND_TRIP_SAMPLES,
+    TIMELINE_EVENTS,
+    TimelineEventKind,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def percentile(samples: Iterable[float], percentile: float) -> float | None:
+    """Return the nearest-rank percentile of the samples, None if there are none."""
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    rank = math.ceil(percentile / 100 * len(ordered))
+    return ordered[max(rank - 1, 0)]
+
+
+class AskoheatRequestMetrics:
+    """
+    Counters and latency distribution of modbus requests of one kind.
+
+    Counters and the latency histogram cover all requests since the client was
+    created, percentiles and the failure rate cover the most recent requests only.
+    """
+
+    def __init__(self, *, samples: int = ROUND_TRIP_SAMPLES) -> None:
+        """Initialize metrics without any request."""
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.transferred_bytes = 0
+        self.errors: dict[str, int] = {}
+        # requests per latency bucket, the last bucket counts slower requests
+        self._histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._latencies: deque[float] = deque(maxlen=samples)
+        self._outcomes: deque[bool] = deque(maxlen=samples)
+
+    def add(
+        self, latency: float, *, registers: int, error: Exception | None = None
+    ) -> None:
+        """Add a request, its latency in seconds and the number of registers."""
+        self.requests += 1
+        self._outcomes.append(error is None)
+        if error is not None:
+            self.failures += 1
+            error_type = type(error).__name__
+            self.errors[error_type] = self.errors.get(error_type, 0) + 1
+            return
+        # each register holds two bytes
+        self.transferred_bytes += 2 * registers
+        self._latencies.append(latency)
+        self._histogram[bisect.bisect_left(LATENCY_BUCKETS, latency * 1000)] += 1
+
+    def add_retry(self) -> None:
+        """Add a request repeated after a failure."""
+        self.retries += 1
+
+    def latency(self, percentile_: float) -> float | None:
+        """Return the percentile of the recent latencies in seconds."""
+        return percentile(self._latencies, percentile_)
+
+    @property
+    def failure_rate(self) -> float | None:
+        """Return the share of recent requests which failed."""
+        if not self._outcomes:
+            return None
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics."""
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "retries": self.retries,
+            "transferred_bytes": self.transferred_bytes,
+            "errors": dict(self.errors),
+            "failure_rate": self.failure_rate,
+            "p50": self.latency(50),
+            "p95": self.latency(95),
+            "p99": self.latency(99),
+            "histogram": {
+                **{
+                    f"{bucket}ms": count
+                    for bucket, count in zip(
+                        LATENCY_BUCKETS, self._histogram, strict=False
+                    )
+                },
+                "inf": self._histogram[-1],
+            },
+        }
+
+
+class AskoheatModbusMetrics:
+    """Request metrics of a modbus client by operation and register block."""
+
+    def __init__(self) -> None:
+        """Initialize metrics without any request."""
+        self._metrics: dict[tuple[str, str], AskoheatRequestMetrics] = {}
+
+    def get(self, operation: str, block: str) -> AskoheatRequestMetrics:
+        """Return the metrics of requests of an operation on a register block."""
+        metrics = self._metrics.get((operation, block))
+        if metrics is None:
+            metrics = self._metrics[(operation, block)] = AskoheatRequestMetrics()
+        return metrics
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the metrics for diagnostics, grouped by operation."""
+        result: dict[str, dict[str, Any]] = {}
+        for (operation, block), metrics in sorted(self._metrics.items()):
+            result.setdefault(operation, {})[block] = metrics.as_dict()
+        return result
+
+
+# flags of a timeline event
+_WRITE = 0x1
+_SUCCESS = 0x2
+_CHANGED = 0x4
+
+
+class AskoheatTimeline:
+    """
+    Ring buffer of the most recent poll and write events of a coordinator.
+
+    Events are stored column-wise in preallocated arrays, the oldest event is
+    overwritten once the capacity is reached. Recording an event does not allocate
+    any object, so the timeline is always recorded.
+    """
+
+    def __init__(self, capacity: int = TIMELINE_EVENTS) -> None:
+        """Initialize an empty timeline holding up to capacity events."""
+        self._capacity = capacity
+        # start as unix timestamp and duration in seconds
+        self._started = array("d", bytes(8 * capacity))
+        self._durations = array("f", bytes(4 * capacity))
+        self._registers = array("H", bytes(2 * capacity))
+        self._flags = array("B", bytes(capacity))
+        self._size = 0
+        self._next = 0
+
+    def __len__(self) -> int:
+        """Return the number of recorded events."""
+        return self._size
+
+    def add(  # noqa: PLR0913
+        self,
+        kind: TimelineEventKind,
+        *,
+        started: float,
+        duration: float,
+        registers: int,
+        success: bool,
+        changed: bool,
+    ) -> None:
+        """Add an event started at the unix timestamp and lasting duration seconds."""
+        index = self._next
+        self._started[index] = started
+        self._durations[index] = duration
+        self._registers[index] = min(registers, 0xFFFF)
+        self._flags[index] = (
+            (_WRITE if kind == TimelineEventKind.WRITE else 0)
+            | (_SUCCESS if success else 0)
+            | (_CHANGED if changed else 0)
+        )
+        self._next = (index + 1) % self._capacity
+        self._size = min(self._size + 1, self._capacity)
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the events oldest first for diagnostics."""
+        first = (self._next - self._size) % self._capacity
+        events = []
+        for offset in range(self._size):
+            index = (first + offset) % self._capacity
+            flags = self._flags[index]
+            events.append(
+                {
+                    "kind": TimelineEventKind.WRITE
+                    if flags & _WRITE
+                    else TimelineEventKind.POLL,
+                    "started": datetime.fromtimestamp(
+                        self._started[index], UTC
+                    ).isoformat(),
+                    "duration": round(self._durations[index], 6),
+                    "registers": self._registers[index],
+                    "success": bool(flags & _SUCCESS),
+                    "changed": bool(flags & _CHANGED),
+                }
+            )
+        return events
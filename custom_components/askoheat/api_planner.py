@@ -0,0 +1,198 @@
+"""Modbus read planner combining register ranges into minimal transactions."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from custom_components.askoheat.const import (
+    MODBUS_MAX_READ_GAP,
+    MODBUS_MAX_READ_REGISTERS,
+    PollTier,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Sequence
+
+    from custom_components.askoheat.api_desc import (
+        RegisterBlockDescriptor,
+        RegisterType,
+    )
+
+_POLL_TIERS: dict[RegisterBlockDescriptor, tuple[PollTier | None, ...]] = {}
+
+
+@dataclass(frozen=True)
+class RegisterRange:
+    """Range of absolute register addresses requested to be read."""
+
+    register_type: RegisterType
+    starting_register: int
+    number_of_registers: int
+
+    @property
+    def end_register(self) -> int:
+        """Return the first register address after this range."""
+        return self.starting_register + self.number_of_registers
+
+    @staticmethod
+    def of_block(block: RegisterBlockDescriptor) -> RegisterRange:
+        """Return the register range covering a full register block."""
+        return RegisterRange(
+            register_type=block.register_type,
+            starting_register=block.starting_register,
+            number_of_registers=block.number_of_registers,
+        )
+
+
+@dataclass(frozen=True)
+class PlannedRead(RegisterRange):
+    """Single modbus transaction serving one or more requested ranges."""
+
+    # requested ranges (partially) covered by this transaction
+    ranges: tuple[RegisterRange, ...] = ()
+
+
+def plan_reads(
+    ranges: Iterable[RegisterRange],
+    max_registers: int = MODBUS_MAX_READ_REGISTERS,
+) -> list[PlannedRead]:
+    """
+    Merge adjacent or overlapping ranges into the fewest modbus transactions.
+
+    Ranges of the same register type touching or overlapping each other are combined
+    into one continuous span, which is then cut into transactions of at most
+    `max_registers` registers. Gaps between ranges are never read as the device
+    might reject undefined registers.
+    """
+    by_type: dict[RegisterType, list[RegisterRange]] = {}
+    for rng in dict.fromkeys(ranges):
+        by_type.setdefault(rng.register_type, []).append(rng)
+
+    reads: list[PlannedRead] = []
+    for register_type, typed_ranges in by_type.items():
+        typed_ranges.sort(key=lambda r: (r.starting_register, r.end_register))
+        span: list[RegisterRange] = []
+        span_start = span_end = 0
+        for rng in typed_ranges:
+            if span and rng.starting_register <= span_end:
+                span.append(rng)
+                span_end = max(span_end, rng.end_register)
+                continue
+            reads.extend(
+                _split_span(register_type, span_start, span_end, span, max_registers)
+            )
+            span = [rng]
+            span_start, span_end = rng.starting_register, rng.end_register
+        reads.extend(
+            _split_span(register_type, span_start, span_end, span, max_registers)
+        )
+    return reads
+
+
+def _split_span(
+    register_type: RegisterType,
+    span_start: int,
+    span_end: int,
+    span: Sequence[RegisterRange],
+    max_registers: int,
+) -> list[PlannedRead]:
+    """Cut a continuous span of registers into transactions of limited size."""
+    reads: list[PlannedRead] = []
+    for start in range(span_start, span_end, max_registers):
+        end = min(start + max_registers, span_end)
+        reads.append(
+            PlannedRead(
+                register_type=register_type,
+                starting_register=start,
+                number_of_registers=end - start,
+                ranges=tuple(
+                    rng
+                    for rng in span
+                    if rng.starting_register < end and rng.end_register > start
+                ),
+            )
+        )
+    return reads
+
+
+def register_poll_tiers(block: RegisterBlockDescriptor) -> tuple[PollTier | None, ...]:
+    """Return the fastest poll tier of the values read from each register of a block."""
+    tiers = _POLL_TIERS.get(block)
+    if tiers is not None:
+        return tiers
+    register_tiers: list[PollTier | None] = [None] * block.number_of_registers
+    for descriptions in (
+        block.binary_sensors,
+        block.sensors,
+        block.switches,
+        block.number_inputs,
+        block.text_inputs,
+        block.time_inputs,
+        block.select_inputs,
+    ):
+        for description in descriptions:
+            api_desc = description.api_descriptor
+            if api_desc is None:
+                continue
+            for offset in range(
+                api_desc.starting_register,
+                api_desc.starting_register + api_desc.number_of_registers,
+            ):
+                tier = register_tiers[offset]
+                register_tiers[offset] = (
+                    description.poll_tier
+                    if tier is None
+                    else min(tier, description.poll_tier)
+                )
+    tiers = _POLL_TIERS[block] = tuple(register_tiers)
+    return tiers
+
+
+def plan_block_ranges(
+    block: RegisterBlockDescriptor,
+    tiers: Collection[PollTier],
+    max_gap: int = MODBUS_MAX_READ_GAP,
+) -> list[RegisterRange]:
+    """
+    Return the ranges of a block holding the values of the provided poll tiers.
+
+    Registers not holding any value of the tiers are skipped, unless they separate
+    two ranges by at most `max_gap` registers. All registers of a block are defined,
+    so reading them along is safe and saves an additional transaction.
+    """
+    ranges: list[RegisterRange] = []
+    start = end = -1
+    for offset, tier in enumerate(register_poll_tiers(block)):
+        if tier is None or tier not in tiers:
+            continue
+        if end < 0 or offset - end > max_gap:
+            if end >= 0:
+                ranges.append(_block_range(block, start, end))
+            start = offset
+        end = offset + 1
+    if end >= 0:
+        ranges.append(_block_range(block, start, end))
+    return ranges
+
+
+def _block_range(block: RegisterBlockDescriptor, start: int, end: int) -> RegisterRange:
+    return RegisterRange(
+        register_type=block.register_type,
+        starting_register=block.starting_register + start,
+        number_of_registers=end - start,
+    )
+
+
+def split_registers(
+    read: PlannedRead,
+    registers: Sequence[int],
+    result: dict[RegisterRange, list[int]],
+) -> None:
+    """Distribute registers of a planned read to the requested ranges it covers."""
+    for rng in read.ranges:
+        start = max(rng.starting_register, read.starting_register)
+        end = min(rng.end_register, read.end_register)
+        result.setdefault(rng, []).extend(
+            registers[start - read.starting_register : end - read.starting_register]
+        )
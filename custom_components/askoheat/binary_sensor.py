@@ -85,10 +85,7 @@ class AskoheatBinarySensor(
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return (
-            super().available
-            and self.entity_description.data_key in self.coordinator.data
-        )
+        return super().available and self._has_value(self.entity_description.data_key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
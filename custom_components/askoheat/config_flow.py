@@ -15,7 +15,13 @@ from homeassistant.config_entries import (
     OptionsFlow,
     OptionsFlowWithConfigEntry,
 )
-from homeassistant.const import CONF_HOST, CONF_PORT, Platform
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PORT,
+    Platform,
+    UnitOfPower,
+    UnitOfTime,
+)
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import selector
@@ -31,19 +37,57 @@ from .api import (
     AskoheatModbusApiClientCommunicationError,
 )
 from .const import (
+    CONF_ADVANCED,
     CONF_ANALOG_INPUT_UNIT,
+    CONF_DECODE_ENGINE,
     CONF_DEVICE_UNITS,
+    CONF_EMA_SCAN_INTERVAL_ACTIVE,
+    CONF_EMA_SCAN_INTERVAL_IDLE,
     CONF_FEED_IN,
+    CONF_FEED_IN_AGGREGATION_METHOD,
+    CONF_FEED_IN_AGGREGATION_WINDOW,
+    CONF_FEED_IN_DEADBAND,
+    CONF_FEED_IN_KEEPALIVE_INTERVAL,
+    CONF_FEED_IN_MIN_WRITE_INTERVAL,
+    CONF_FEED_IN_OUTLIER_THRESHOLD,
+    CONF_FEED_IN_STALE_TIMEOUT,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_HEATPUMP_UNIT,
     CONF_LEGIONELLA_PROTECTION_UNIT,
+    CONF_MAX_CONNECTIONS,
     CONF_MODBUS_MASTER_UNIT,
     CONF_POWER_ENTITY_ID,
     CONF_POWER_INVERT,
+    CONF_REGISTER_HISTORY,
+    CONF_SCAN_INTERVALS,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_TCP_KEEPALIVE,
+    DEFAULT_DECODE_ENGINE,
+    DEFAULT_EMA_SCAN_INTERVAL_ACTIVE,
+    DEFAULT_EMA_SCAN_INTERVAL_IDLE,
+    DEFAULT_FEED_IN_AGGREGATION_METHOD,
+    DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+    DEFAULT_FEED_IN_DEADBAND,
+    DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+    DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+    DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+    DEFAULT_FEED_IN_STALE_TIMEOUT,
+    DEFAULT_HEARTBEAT_INTERVAL,
     DEFAULT_HOST,
+    DEFAULT_MAX_CONNECTIONS,
     DEFAULT_PORT,
+    DEFAULT_REGISTER_HISTORY,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DEFAULT_TCP_KEEPALIVE,
     DOMAIN,
     LOGGER,
+    MAX_CONNECTIONS,
+    MAX_EMA_SCAN_INTERVAL,
+    MAX_REGISTER_HISTORY,
+    MIN_EMA_SCAN_INTERVAL,
     REPO_URL,
+    DecodeEngine,
+    FeedInAggregation,
 )
 
 if TYPE_CHECKING:
@@ -60,6 +104,15 @@ PORT_SELECTOR = vol.All(
     vol.Coerce(int),
 )
 
+MAX_CONNECTIONS_SELECTOR = vol.All(
+    selector.NumberSelector(
+        selector.NumberSelectorConfig(
+            min=1, step=1, max=MAX_CONNECTIONS, mode=selector.NumberSelectorMode.BOX
+        )
+    ),
+    vol.Coerce(int),
+)
+
 
 def _get_section_entry_or_none(
     data: MappingProxyType[str, Any] | None, section: str, entry: str
@@ -72,13 +125,38 @@ def _get_section_entry_or_none(
     return cast("str | None", section_values.get(entry))
 
 
+def _get_section_entry_or_default(
+    data: MappingProxyType[str, Any] | None, section: str, entry: str, default: Any
+) -> Any:
+    value = _get_section_entry_or_none(data, section, entry)
+    return default if value is None else value
+
+
+def _number_selector(unit: str, maximum: int, minimum: int = 0) -> vol.All:
+    return vol.All(
+        selector.NumberSelector(
+            selector.NumberSelectorConfig(
+                min=minimum,
+                step=1,
+                max=maximum,
+                unit_of_measurement=unit,
+                mode=selector.NumberSelectorMode.BOX,
+            )
+        ),
+        vol.Coerce(int),
+    )
+
+
 def _step_user_data_schema(
     data: MappingProxyType[str, Any] | None = None,
 ) -> vol.Schema:
     LOGGER.debug("_step_user_data_schema: %s", data)
-    power_entity_default = _get_section_entry_or_none(
+    power_entity_default: str | list[str] | None = _get_section_entry_or_none(
         data, CONF_FEED_IN, CONF_POWER_ENTITY_ID
     )
+    # single power entity configured by previous versions
+    if isinstance(power_entity_default, str):
+        power_entity_default = [power_entity_default]
 
     power_entity_field = (
         vol.Optional(CONF_POWER_ENTITY_ID, default=power_entity_default)
@@ -103,7 +181,7 @@ def _step_user_data_schema(
                                     domain=Platform.SENSOR,
                                     device_class=SensorDeviceClass.POWER,
                                 ),
-                                multiple=False,
+                                multiple=True,
                             )
                         ),
                         vol.Required(
@@ -121,6 +199,74 @@ def _step_user_data_schema(
                                 else x
                             ),
                         ): cv.boolean,
+                        vol.Required(
+                            CONF_FEED_IN_DEADBAND,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_DEADBAND,
+                                DEFAULT_FEED_IN_DEADBAND,
+                            ),
+                        ): _number_selector(UnitOfPower.WATT, 10000),
+                        vol.Required(
+                            CONF_FEED_IN_MIN_WRITE_INTERVAL,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_MIN_WRITE_INTERVAL,
+                                DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_FEED_IN_KEEPALIVE_INTERVAL,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_KEEPALIVE_INTERVAL,
+                                DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_FEED_IN_AGGREGATION_WINDOW,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_AGGREGATION_WINDOW,
+                                DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_FEED_IN_AGGREGATION_METHOD,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_AGGREGATION_METHOD,
+                                DEFAULT_FEED_IN_AGGREGATION_METHOD,
+                            ),
+                        ): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[method.value for method in FeedInAggregation],
+                                translation_key=CONF_FEED_IN_AGGREGATION_METHOD,
+                            )
+                        ),
+                        vol.Required(
+                            CONF_FEED_IN_OUTLIER_THRESHOLD,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_OUTLIER_THRESHOLD,
+                                DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+                            ),
+                        ): _number_selector(UnitOfPower.WATT, 10000),
+                        vol.Required(
+                            CONF_FEED_IN_STALE_TIMEOUT,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_FEED_IN,
+                                CONF_FEED_IN_STALE_TIMEOUT,
+                                DEFAULT_FEED_IN_STALE_TIMEOUT,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
                     }
                 ),
                 {"collapsed": True},
@@ -192,6 +338,112 @@ def _step_user_data_schema(
                 ),
                 {"collapsed": False},
             ),
+            vol.Required(CONF_ADVANCED): data_entry_flow.section(
+                vol.Schema(
+                    {
+                        vol.Required(
+                            CONF_MAX_CONNECTIONS,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_MAX_CONNECTIONS,
+                                DEFAULT_MAX_CONNECTIONS,
+                            ),
+                        ): MAX_CONNECTIONS_SELECTOR,
+                        vol.Required(
+                            CONF_TCP_KEEPALIVE,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_TCP_KEEPALIVE,
+                                DEFAULT_TCP_KEEPALIVE,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_HEARTBEAT_INTERVAL,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_HEARTBEAT_INTERVAL,
+                                DEFAULT_HEARTBEAT_INTERVAL,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_STALE_GRACE_PERIOD,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_STALE_GRACE_PERIOD,
+                                DEFAULT_STALE_GRACE_PERIOD,
+                            ),
+                        ): _number_selector(UnitOfTime.SECONDS, 3600),
+                        vol.Required(
+                            CONF_REGISTER_HISTORY,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_REGISTER_HISTORY,
+                                DEFAULT_REGISTER_HISTORY,
+                            ),
+                        ): _number_selector("frames", MAX_REGISTER_HISTORY),
+                        vol.Required(
+                            CONF_DECODE_ENGINE,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_ADVANCED,
+                                CONF_DECODE_ENGINE,
+                                DEFAULT_DECODE_ENGINE,
+                            ),
+                        ): selector.SelectSelector(
+                            selector.SelectSelectorConfig(
+                                options=[engine.value for engine in DecodeEngine],
+                                translation_key=CONF_DECODE_ENGINE,
+                            )
+                        ),
+                    }
+                ),
+                {"collapsed": True},
+            ),
+        }
+    )
+
+
+def _step_init_data_schema(data: MappingProxyType[str, Any]) -> vol.Schema:
+    return _step_user_data_schema(data).extend(
+        {
+            vol.Required(CONF_SCAN_INTERVALS): data_entry_flow.section(
+                vol.Schema(
+                    {
+                        vol.Required(
+                            CONF_EMA_SCAN_INTERVAL_ACTIVE,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_SCAN_INTERVALS,
+                                CONF_EMA_SCAN_INTERVAL_ACTIVE,
+                                DEFAULT_EMA_SCAN_INTERVAL_ACTIVE,
+                            ),
+                        ): _number_selector(
+                            UnitOfTime.SECONDS,
+                            MAX_EMA_SCAN_INTERVAL,
+                            MIN_EMA_SCAN_INTERVAL,
+                        ),
+                        vol.Required(
+                            CONF_EMA_SCAN_INTERVAL_IDLE,
+                            default=_get_section_entry_or_default(
+                                data,
+                                CONF_SCAN_INTERVALS,
+                                CONF_EMA_SCAN_INTERVAL_IDLE,
+                                DEFAULT_EMA_SCAN_INTERVAL_IDLE,
+                            ),
+                        ): _number_selector(
+                            UnitOfTime.SECONDS,
+                            MAX_EMA_SCAN_INTERVAL,
+                            MIN_EMA_SCAN_INTERVAL,
+                        ),
+                    }
+                ),
+                {"collapsed": True},
+            ),
         }
     )
 
@@ -337,7 +589,7 @@ class AskoheatOptionsFlowHandler(OptionsFlowWithConfigEntry):
             step_id="init",
             errors=_errors,
             description_placeholders={"repo_url": REPO_URL},
-            data_schema=_step_user_data_schema(
+            data_schema=_step_init_data_schema(
                 MappingProxyType(self.config_entry.data)
             ),
         )
@@ -7,6 +7,7 @@ from logging import Logger, getLogger
 LOGGER: Logger = getLogger(__package__)
 
 DOMAIN = "askoheat"
+STORAGE_VERSION = 1
 ATTRIBUTION = ""
 
 DEFAULT_HOST = "askoheat.local"
@@ -16,11 +17,129 @@ DEFAULT_SCAN_INTERVAL = 5
 REPO_URL = "https://github.com/toggm/askoheat"
 
 # per coordinator scan intervals
-SCAN_INTERVAL_EMA = timedelta(seconds=5)
 SCAN_INTERVAL_CONFIG = timedelta(hours=1)
 SCAN_INTERVAL_OP_DATA = timedelta(minutes=1)
+# bounds of the energy manager scan interval in seconds, polled at the active
+# interval while the device is active and backing off up to the idle interval
+# otherwise
+DEFAULT_EMA_SCAN_INTERVAL_ACTIVE = 2
+DEFAULT_EMA_SCAN_INTERVAL_IDLE = 30
+MIN_EMA_SCAN_INTERVAL = 1
+MAX_EMA_SCAN_INTERVAL = 300
+
+# maximum number of registers a single modbus read request may return
+MODBUS_MAX_READ_REGISTERS = 125
+# registers not due within a block read along at most, as reading them costs less
+# than an additional modbus transaction
+MODBUS_MAX_READ_GAP = 8
+# modbus connections used to execute reads concurrently, 1 reads serially
+DEFAULT_MAX_CONNECTIONS = 1
+MAX_CONNECTIONS = 4
+# reconnects after a lost connection are delayed exponentially within these bounds
+RECONNECT_BACKOFF_MIN = timedelta(seconds=1)
+RECONNECT_BACKOFF_MAX = timedelta(minutes=5)
+# idle time in seconds before keep-alive probes or heartbeat reads are sent,
+# by default the connection is kept as is
+DEFAULT_TCP_KEEPALIVE = 0
+DEFAULT_HEARTBEAT_INTERVAL = 0
+# unanswered keep-alive probes before the operating system drops the connection
+TCP_KEEPALIVE_COUNT = 3
+# seconds the last known values are served after the connection failed
+DEFAULT_STALE_GRACE_PERIOD = 0
+# consecutive failed requests before an open connection is considered down
+MAX_CONSECUTIVE_FAILURES = 3
+# requests time out after a multiple of the slowest recent round-trip times
+REQUEST_TIMEOUT_FACTOR = 3
+REQUEST_TIMEOUT_MIN = timedelta(milliseconds=300)
+REQUEST_TIMEOUT_MAX = timedelta(seconds=10)
+# number of recent round-trip times the request timeout is derived from
+ROUND_TRIP_SAMPLES = 100
+# upper bounds in milliseconds of the latency histogram buckets of requests
+LATENCY_BUCKETS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+# number of recent poll and write events kept per coordinator for diagnostics
+TIMELINE_EVENTS = 200
+# raw register frames kept per block, by default no history is kept. The maximum
+# covers a day of energy manager polls.
+DEFAULT_REGISTER_HISTORY = 0
+MAX_REGISTER_HISTORY = 17280
+
+
+class DecodeEngine(StrEnum):
+    """Implementation used to decode register blocks."""
+
+    # value by value using precompiled python decoders
+    PLAN = "plan"
+    # whole block at once using a numpy structured dtype
+    NUMPY = "numpy"
+
+
+DEFAULT_DECODE_ENGINE = DecodeEngine.PLAN
+
+
+class PollTier(IntEnum):
+    """Minimal interval in seconds between two reads of the registers of a value."""
+
+    # read with every poll of the register block
+    FAST = 0
+    # read with the first poll of the register block after five minutes
+    SLOW = 300
+
+
+class ConnectionState(StrEnum):
+    """Health states of the modbus connection."""
+
+    CONNECTING = "connecting"
+    READY = "ready"
+    DEGRADED = "degraded"
+    DOWN = "down"
+
+
+class ModbusOperation(StrEnum):
+    """Modbus operations requests are accounted to."""
+
+    READ_INPUT_REGISTERS = "read_input_registers"
+    READ_HOLDING_REGISTERS = "read_holding_registers"
+    WRITE_REGISTERS = "write_registers"
+    # single register reads probing the device or keeping the connection alive,
+    # accounted apart to not skew the metrics of block reads
+    HEARTBEAT = "heartbeat"
+
+
+class TimelineEventKind(StrEnum):
+    """Kinds of events recorded in the timeline of a coordinator."""
+
+    POLL = "poll"
+    WRITE = "write"
+
+
+class RegisterBlockName(StrEnum):
+    """Names of the register blocks requests are accounted to."""
 
+    ENERGY_MANAGER = "energy_manager"
+    CONFIG = "config"
+    OPERATION = "operation"
+    PARAMETER = "parameter"
+    UNKNOWN = "unknown"
+
+
+SERVICE_GET_REGISTER_HISTORY = "get_register_history"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_BLOCK = "block"
+ATTR_SINCE = "since"
+ATTR_LIMIT = "limit"
+
+
+CONF_MAX_CONNECTIONS = "max_connections"
+CONF_TCP_KEEPALIVE = "tcp_keepalive"
+CONF_HEARTBEAT_INTERVAL = "heartbeat_interval"
+CONF_STALE_GRACE_PERIOD = "stale_grace_period"
+CONF_REGISTER_HISTORY = "register_history"
+CONF_DECODE_ENGINE = "decode_engine"
+CONF_EMA_SCAN_INTERVAL_ACTIVE = "ema_scan_interval_active"
+CONF_EMA_SCAN_INTERVAL_IDLE = "ema_scan_interval_idle"
 CONF_FEED_IN = "auto-feed-in"
+CONF_ADVANCED = "advanced"
+CONF_SCAN_INTERVALS = "scan_intervals"
 CONF_DEVICE_UNITS = "devices"
 CONF_ANALOG_INPUT_UNIT = "analog_input_unit"
 CONF_LEGIONELLA_PROTECTION_UNIT = "legionella_protection_unit"
@@ -28,6 +147,33 @@ CONF_MODBUS_MASTER_UNIT = "modbus_master_unit"
 CONF_HEATPUMP_UNIT = "heatpump_unit"
 CONF_POWER_ENTITY_ID = "power_entity_id"
 CONF_POWER_INVERT = "power_invert"
+CONF_FEED_IN_DEADBAND = "deadband"
+CONF_FEED_IN_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_FEED_IN_KEEPALIVE_INTERVAL = "keepalive_interval"
+CONF_FEED_IN_AGGREGATION_WINDOW = "aggregation_window"
+CONF_FEED_IN_AGGREGATION_METHOD = "aggregation_method"
+CONF_FEED_IN_OUTLIER_THRESHOLD = "outlier_threshold"
+CONF_FEED_IN_STALE_TIMEOUT = "stale_timeout"
+
+
+class FeedInAggregation(StrEnum):
+    """Methods aggregating the power samples of a feed-in window."""
+
+    MEAN = "mean"
+    MEDIAN = "median"
+    LAST = "last"
+
+
+# feed-in limits, by default every change is written without keep-alive writes
+DEFAULT_FEED_IN_DEADBAND = 0
+DEFAULT_FEED_IN_MIN_WRITE_INTERVAL = 0
+DEFAULT_FEED_IN_KEEPALIVE_INTERVAL = 0
+# power samples are only aggregated if a window is configured
+DEFAULT_FEED_IN_AGGREGATION_WINDOW = 0
+DEFAULT_FEED_IN_AGGREGATION_METHOD = FeedInAggregation.MEAN
+DEFAULT_FEED_IN_OUTLIER_THRESHOLD = 0
+# values of power entities are used until they change if no timeout is configured
+DEFAULT_FEED_IN_STALE_TIMEOUT = 0
 
 CONF_INPUT_SETTINGS_REGISTER = 2
 CONF_AUTO_HEATER_SETTINGS_REGISTER = 4
@@ -413,6 +559,13 @@ class SensorAttrKey(StrEnum):
     DATA_COUNT_MINIMAL_TEMP = "count_minimal_temp"
     DATA_MAX_MEASURED_TEMP = "max_measured_temp"
 
+    # -----------------------------------------------
+    # modbus request metrics
+    # -----------------------------------------------
+    EMA_POLL_LATENCY_P50 = "ema_poll_latency_p50"
+    EMA_POLL_LATENCY_P95 = "ema_poll_latency_p95"
+    EMA_POLL_FAILURE_RATE = "ema_poll_failure_rate"
+
 
 class Baudrate(StrEnum):
     """Available Baudrates."""
@@ -474,6 +627,7 @@ class AttributeKeys(StrEnum):
 
     API_DESCRIPTOR = "api_descriptor"
     FORMATTED = "formatted"
+    STALE_SINCE = "stale_since"
 
 
 HTTP_RESPONSE_CODE_OK = 200
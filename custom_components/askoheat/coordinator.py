@@ -3,27 +3,71 @@
 from __future__ import annotations
 
 from abc import abstractmethod
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from time import monotonic
 from typing import TYPE_CHECKING, Any
 
 import async_timeout
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .api import AskoheatModbusApiClient, AskoheatModbusApiClientError
+from .api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from .api_ema_desc import (
+    EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
+    EMA_REGISTER_BLOCK_DESCRIPTOR,
+)
+from .api_metrics import AskoheatTimeline
+from .api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from .api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
 from .const import (
+    DEFAULT_EMA_SCAN_INTERVAL_ACTIVE,
+    DEFAULT_EMA_SCAN_INTERVAL_IDLE,
+    DEFAULT_STALE_GRACE_PERIOD,
     DOMAIN,
     LOGGER,
+    MIN_EMA_SCAN_INTERVAL,
     SCAN_INTERVAL_CONFIG,
-    SCAN_INTERVAL_EMA,
     SCAN_INTERVAL_OP_DATA,
+    BinarySensorAttrKey,
+    ConnectionState,
+    TimelineEventKind,
 )
 
 if TYPE_CHECKING:
-    from datetime import timedelta
+    from collections.abc import AsyncIterator, Callable
+    from datetime import datetime
 
     from homeassistant.core import HomeAssistant
-
-    from custom_components.askoheat.api_desc import RegisterInputDescriptor
-    from custom_components.askoheat.data import AskoheatDataBlock
+    from homeassistant.helpers.storage import Store
+
+    from custom_components.askoheat.api import AskoheatBlockData
+    from custom_components.askoheat.api_desc import (
+        RegisterBlockDescriptor,
+        RegisterInputDescriptor,
+    )
+
+_DEFAULT_STALE_GRACE_PERIOD = timedelta(seconds=DEFAULT_STALE_GRACE_PERIOD)
+_DEFAULT_EMA_SCAN_INTERVAL_ACTIVE = timedelta(seconds=DEFAULT_EMA_SCAN_INTERVAL_ACTIVE)
+_DEFAULT_EMA_SCAN_INTERVAL_IDLE = timedelta(seconds=DEFAULT_EMA_SCAN_INTERVAL_IDLE)
+_MIN_EMA_SCAN_INTERVAL = timedelta(seconds=MIN_EMA_SCAN_INTERVAL)
+
+# status flags of the energy manager block indicating the device is active
+_EMA_ACTIVITY_KEYS = tuple(
+    description.data_key
+    for description in EMA_REGISTER_BLOCK_DESCRIPTOR.binary_sensors
+    if description.key
+    in (
+        BinarySensorAttrKey.HEATER1_ACTIVE,
+        BinarySensorAttrKey.HEATER2_ACTIVE,
+        BinarySensorAttrKey.HEATER3_ACTIVE,
+        BinarySensorAttrKey.PUMP_ACTIVE,
+        BinarySensorAttrKey.LOAD_FEEDIN_ACTIVE,
+    )
+)
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
@@ -31,13 +75,17 @@ class AskoheatDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching state of askoheat through a single API call."""
 
     _client: AskoheatModbusApiClient
-    _writing: bool = False
+    # keys of values changed by the last update, None if unknown
+    _changed_keys: frozenset[str] | None = None
+    # number of registers read by the last update
+    _registers_read = 0
 
     def __init__(
         self,
         hass: HomeAssistant,
         scan_interval: timedelta | None,
         client: AskoheatModbusApiClient,
+        stale_grace_period: timedelta = _DEFAULT_STALE_GRACE_PERIOD,
     ) -> None:
         """Initialize."""
         super().__init__(
@@ -45,12 +93,192 @@ class AskoheatDataUpdateCoordinator(DataUpdateCoordinator):
             logger=LOGGER,
             name=DOMAIN,
             update_interval=scan_interval,
-            # Set always_update to `False` if the data returned from the
-            # api can be compared via `__eq__` to avoid duplicate updates
-            # being dispatched to listeners
-            always_update=True,
+            # the api client returns the previous data as is if the registers
+            # did not change, skip dispatching updates to listeners in that case
+            always_update=False,
         )
         self._client = client
+        # update callbacks of listeners by the data key they subscribed to
+        self._subscriptions: dict[object, list[CALLBACK_TYPE]] = {}
+        self._paused = False
+        # the last known data is served for the grace period once it got stale
+        self.stale_grace_period = stale_grace_period
+        self._stale_since: datetime | None = None
+        self._unsub_stale_expiry: CALLBACK_TYPE | None = None
+        # recent polls and writes for diagnostics
+        self.timeline = AskoheatTimeline()
+        client.add_connection_listener(self._handle_connection_state)
+
+    @property
+    def stale_since(self) -> datetime | None:
+        """Return since when the last known data is served, None if it is current."""
+        return self._stale_since
+
+    @property
+    def available(self) -> bool:
+        """Return true while the data is current or stale within the grace period."""
+        if self._client.is_ready:
+            return True
+        return (
+            self._stale_since is not None
+            and dt_util.utcnow() < self._stale_since + self.stale_grace_period
+        )
+
+    @callback
+    def _handle_connection_state(self, state: ConnectionState) -> None:
+        """Pause polling while the connection is down, refresh once it is back."""
+        if state == ConnectionState.DOWN and not self._paused:
+            self._paused = True
+            self._unschedule_refresh()
+        elif state == ConnectionState.READY and self._paused:
+            self._paused = False
+            if self.update_interval is not None or not self.last_update_success:
+                self.hass.async_create_background_task(
+                    self.async_refresh(), f"{self.name} refresh after reconnect"
+                )
+        # entities change their availability together with the connection, unless
+        # the last known data is served within the grace period
+        if state == ConnectionState.READY and self._stale_since is not None:
+            self._clear_stale()
+            self._async_update_all_listeners()
+        elif state != ConnectionState.READY and self._stale_since is None:
+            self._set_stale()
+            self._async_update_all_listeners()
+
+    @callback
+    def _set_stale(self) -> None:
+        self._stale_since = dt_util.utcnow()
+        if self.stale_grace_period > timedelta(0):
+            self._unsub_stale_expiry = async_call_later(
+                self.hass, self.stale_grace_period, self._handle_stale_expiry
+            )
+
+    @callback
+    def _clear_stale(self) -> None:
+        self._stale_since = None
+        if self._unsub_stale_expiry is not None:
+            self._unsub_stale_expiry()
+            self._unsub_stale_expiry = None
+
+    @callback
+    def _handle_stale_expiry(self, _: datetime) -> None:
+        """Make entities unavailable once the grace period expired."""
+        self._unsub_stale_expiry = None
+        self._async_update_all_listeners()
+
+    @callback
+    def _async_update_all_listeners(self) -> None:
+        """Update all listeners, i.e. as the availability of all values changed."""
+        self._changed_keys = None
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel the expiry of stale data on shutdown."""
+        await super().async_shutdown()
+        self._clear_stale()
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        if not self._paused:
+            super()._schedule_refresh()
+
+    async def _async_refresh(
+        self,
+        *,
+        log_failures: bool = True,
+        raise_on_auth_failed: bool = False,
+        scheduled: bool = False,
+        raise_on_entry_error: bool = False,
+    ) -> None:
+        """Refresh data and record the poll in the timeline."""
+        started, start = dt_util.utcnow().timestamp(), monotonic()
+        previous_data = self.data
+        self._registers_read = 0
+        try:
+            await super()._async_refresh(
+                log_failures=log_failures,
+                raise_on_auth_failed=raise_on_auth_failed,
+                scheduled=scheduled,
+                raise_on_entry_error=raise_on_entry_error,
+            )
+        finally:
+            # changes are not dispatched if the data did not change, they must not
+            # restrict the next update of listeners
+            self._changed_keys = None
+            self.timeline.add(
+                TimelineEventKind.POLL,
+                started=started,
+                duration=monotonic() - start,
+                registers=self._registers_read,
+                success=self.last_update_success,
+                changed=self.data is not previous_data,
+            )
+
+    @asynccontextmanager
+    async def _async_record_write(self, registers: int) -> AsyncIterator[None]:
+        """Record the write executed within the context in the timeline."""
+        started, start = dt_util.utcnow().timestamp(), monotonic()
+        previous_data = self.data
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.timeline.add(
+                TimelineEventKind.WRITE,
+                started=started,
+                duration=monotonic() - start,
+                registers=registers,
+                success=success,
+                changed=self.data is not previous_data,
+            )
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates, indexed by the context of the listener."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        subscriptions = self._subscriptions.setdefault(context, [])
+        subscriptions.append(update_callback)
+
+        @callback
+        def remove_subscription() -> None:
+            remove_listener()
+            subscriptions.remove(update_callback)
+            if not subscriptions:
+                del self._subscriptions[context]
+
+        return remove_subscription
+
+    async def _async_read_block(self, block: RegisterBlockDescriptor) -> dict[str, Any]:
+        """Read register block and keep track of the changed values."""
+        (result,) = await self._client.async_read_blocks([block])
+        return self._take_block_data(result)
+
+    def _take_block_data(self, result: AskoheatBlockData) -> dict[str, Any]:
+        self._registers_read = result.registers_read
+        # all entities need to update their availability after a failed update
+        self._changed_keys = result.changed_keys if self.last_update_success else None
+        return result.data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only listeners of changed values if the changes are known."""
+        changed_keys, self._changed_keys = self._changed_keys, None
+        if changed_keys is None or not self.last_update_success:
+            super().async_update_listeners()
+            return
+        # entities subscribe with the data key of their value as context
+        subscriptions = self._subscriptions
+        update_callbacks = [
+            update_callback
+            for context in (None, *changed_keys)
+            if context in subscriptions
+            for update_callback in subscriptions[context]
+        ]
+        for update_callback in update_callbacks:
+            update_callback()
 
     @abstractmethod
     async def async_write(
@@ -62,35 +290,75 @@ class AskoheatDataUpdateCoordinator(DataUpdateCoordinator):
 class AskoheatEMADataUpdateCoordinator(AskoheatDataUpdateCoordinator):
     """Class to manage fetching askoheat energymanager states."""
 
-    def __init__(self, hass: HomeAssistant, client: AskoheatModbusApiClient) -> None:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: AskoheatModbusApiClient,
+        stale_grace_period: timedelta = _DEFAULT_STALE_GRACE_PERIOD,
+        scan_interval_active: timedelta = _DEFAULT_EMA_SCAN_INTERVAL_ACTIVE,
+        scan_interval_idle: timedelta = _DEFAULT_EMA_SCAN_INTERVAL_IDLE,
+    ) -> None:
         """Initialize."""
-        super().__init__(hass=hass, scan_interval=SCAN_INTERVAL_EMA, client=client)
+        super().__init__(
+            hass=hass,
+            scan_interval=scan_interval_active,
+            client=client,
+            stale_grace_period=stale_grace_period,
+        )
+        self.set_scan_intervals(scan_interval_active, scan_interval_idle)
+
+    def set_scan_intervals(self, active: timedelta, idle: timedelta) -> None:
+        """Set the scan intervals while the device is active and idle."""
+        self._scan_interval_active = max(active, _MIN_EMA_SCAN_INTERVAL)
+        self._scan_interval_idle = max(idle, self._scan_interval_active)
+        self.update_interval = self._scan_interval_active
+
+    @callback
+    def _adapt_scan_interval(self, data: dict[str, Any]) -> None:
+        """Poll fast while the device is active, back off while it is idle."""
+        if any(data.get(key) for key in _EMA_ACTIVITY_KEYS):
+            self.update_interval = self._scan_interval_active
+        else:
+            self.update_interval = min(
+                2 * (self.update_interval or self._scan_interval_active),
+                self._scan_interval_idle,
+            )
+
+    @callback
+    def _poll_fast(self) -> None:
+        """Follow the reaction of the device to a write at the active interval."""
+        if self.update_interval == self._scan_interval_active:
+            return
+        self.update_interval = self._scan_interval_active
+        # reschedule the pending refresh, which was scheduled at the idle interval
+        if self._unsub_refresh is not None:
+            self._schedule_refresh()
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update ema data via library."""
-        # prevent concurrent reads while writing is in progress
-        if self._writing:
-            return self.data
         try:
             async with async_timeout.timeout(10):
-                data = await self._client.async_read_ema_data()
-                return _map_data_block_to_dict(data)
+                data = await self._async_read_block(EMA_REGISTER_BLOCK_DESCRIPTOR)
         except AskoheatModbusApiClientError as exception:
-            self._client.last_communication_failed()
             raise UpdateFailed(exception) from exception
         except TimeoutError as error:
-            self._client.last_communication_failed()
             raise error from error
+        self._adapt_scan_interval(data)
+        return data
 
     async def async_write(
         self, api_desc: RegisterInputDescriptor, value: object
     ) -> None:
         """Write parameter ema block of Askoheat."""
         try:
-            self._writing = True
-            async with async_timeout.timeout(10):
-                data = await self._client.async_write_ema_data(api_desc, value)
-                self.data = _map_data_block_to_dict(data)
+            async with (
+                self._async_record_write(api_desc.number_of_registers),
+                async_timeout.timeout(10),
+            ):
+                result = await self._client.async_write_ema_data(api_desc, value)
+                self.data = self._take_block_data(result)
+            self.async_update_listeners()
+            self._poll_fast()
         except AskoheatModbusApiClientError as exception:
             LOGGER.info(
                 "Could not write state %s to askoheat register %s => %s",
@@ -98,7 +366,6 @@ class AskoheatEMADataUpdateCoordinator(AskoheatDataUpdateCoordinator):
                 api_desc,
                 exception,
             )
-            self._client.last_communication_failed()
         except TimeoutError as error:
             LOGGER.info(
                 "Could not write state %s to askoheat register %s => %s",
@@ -106,9 +373,27 @@ class AskoheatEMADataUpdateCoordinator(AskoheatDataUpdateCoordinator):
                 api_desc,
                 error,
             )
-            self._client.last_communication_failed()
-        finally:
-            self._writing = False
+
+    async def async_write_feed_in_value(self, value: float) -> bool:
+        """
+        Write feed-in value, leaving reading the EMA block to the next poll.
+
+        Returns whether the value was written.
+        """
+        api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+        try:
+            async with (
+                self._async_record_write(
+                    api_desc.number_of_registers if api_desc is not None else 1
+                ),
+                async_timeout.timeout(10),
+            ):
+                await self._client.async_write_feed_in_value(value)
+        except (AskoheatModbusApiClientError, TimeoutError) as error:
+            LOGGER.info("Could not write feed-in value %s => %s", value, error)
+            return False
+        self._poll_fast()
+        return True
 
 
 class AskoheatConfigDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
@@ -118,24 +403,24 @@ class AskoheatConfigDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: AskoheatModbusApiClient,
+        stale_grace_period: timedelta = _DEFAULT_STALE_GRACE_PERIOD,
     ) -> None:
         """Initialize."""
-        super().__init__(hass=hass, scan_interval=SCAN_INTERVAL_CONFIG, client=client)
+        super().__init__(
+            hass=hass,
+            scan_interval=SCAN_INTERVAL_CONFIG,
+            client=client,
+            stale_grace_period=stale_grace_period,
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update config data via library."""
-        # prevent concurrent reads while writing is in progress
-        if self._writing:
-            return self.data
         try:
             async with async_timeout.timeout(10):
-                data = await self._client.async_read_config_data()
-                return _map_data_block_to_dict(data)
+                return await self._async_read_block(CONF_REGISTER_BLOCK_DESCRIPTOR)
         except AskoheatModbusApiClientError as exception:
-            self._client.last_communication_failed()
             raise UpdateFailed(exception) from exception
         except TimeoutError as error:
-            self._client.last_communication_failed()
             raise error from error
 
     async def async_write(
@@ -143,10 +428,13 @@ class AskoheatConfigDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
     ) -> None:
         """Write parameter ema block of Askoheat."""
         try:
-            self._writing = True
-            async with async_timeout.timeout(10):
-                data = await self._client.async_write_config_data(api_desc, value)
-                self.data = _map_data_block_to_dict(data)
+            async with (
+                self._async_record_write(api_desc.number_of_registers),
+                async_timeout.timeout(10),
+            ):
+                result = await self._client.async_write_config_data(api_desc, value)
+                self.data = self._take_block_data(result)
+            self.async_update_listeners()
         except AskoheatModbusApiClientError as exception:
             LOGGER.info(
                 "Could not write state %s to askoheat register %s => %s",
@@ -154,7 +442,6 @@ class AskoheatConfigDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
                 api_desc,
                 exception,
             )
-            self._client.last_communication_failed()
         except TimeoutError as error:
             LOGGER.info(
                 "Could not write state %s to askoheat register %s => %s",
@@ -162,9 +449,6 @@ class AskoheatConfigDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
                 api_desc,
                 error,
             )
-            self._client.last_communication_failed()
-        finally:
-            self._writing = False
 
 
 class AskoheatParameterDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
@@ -174,25 +458,64 @@ class AskoheatParameterDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: AskoheatModbusApiClient,
+        store: Store[dict[str, Any]] | None = None,
+        stale_grace_period: timedelta = _DEFAULT_STALE_GRACE_PERIOD,
     ) -> None:
         """Initialize."""
-        super().__init__(hass=hass, scan_interval=None, client=client)
+        super().__init__(
+            hass=hass,
+            scan_interval=None,
+            client=client,
+            stale_grace_period=stale_grace_period,
+        )
+        # registers of the parameter block cached across restarts
+        self._store = store
+        self._cached_registers: list[int] | None = None
+
+    async def async_load_cached_parameters(self) -> bool:
+        """Initialize parameters from the registers cached by the last read."""
+        if self._store is None or (cached := await self._store.async_load()) is None:
+            return False
+        registers = cached.get("registers")
+        if (
+            not isinstance(registers, list)
+            or len(registers) != PARAM_REGISTER_BLOCK_DESCRIPTOR.number_of_registers
+        ):
+            LOGGER.warning("Ignore invalid cached askoheat parameters: %s", cached)
+            return False
+        self._cached_registers = registers
+        self.async_set_updated_data(
+            self._client.restore_block_data(PARAM_REGISTER_BLOCK_DESCRIPTOR, registers)
+        )
+        return True
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update parameter data via library."""
-        return await self.load_parameters(self._client)
+        try:
+            async with async_timeout.timeout(10):
+                data = await self._async_read_block(PARAM_REGISTER_BLOCK_DESCRIPTOR)
+        except AskoheatModbusApiClientError as exception:
+            raise UpdateFailed(exception) from exception
+        except TimeoutError as error:
+            raise error from error
+        registers = self._client.block_registers(PARAM_REGISTER_BLOCK_DESCRIPTOR)
+        if (
+            self._store is not None
+            and registers is not None
+            and registers != self._cached_registers
+        ):
+            self._cached_registers = registers
+            await self._store.async_save({"registers": registers})
+        return data
 
     async def load_parameters(self, client: AskoheatModbusApiClient) -> dict[str, Any]:
         """Load askoheat parameters through provided client."""
         try:
             async with async_timeout.timeout(10):
-                data = await client.async_read_par_data()
-                return _map_data_block_to_dict(data)
+                return await client.async_read_par_data()
         except AskoheatModbusApiClientError as exception:
-            self._client.last_communication_failed()
             raise UpdateFailed(exception) from exception
         except TimeoutError as error:
-            self._client.last_communication_failed()
             raise error from error
 
     async def async_write(self, _: RegisterInputDescriptor, __: object) -> None:
@@ -208,56 +531,27 @@ class AskoheatOperationDataUpdateCoordinator(AskoheatDataUpdateCoordinator):
         self,
         hass: HomeAssistant,
         client: AskoheatModbusApiClient,
+        stale_grace_period: timedelta = _DEFAULT_STALE_GRACE_PERIOD,
     ) -> None:
         """Initialize."""
-        super().__init__(hass=hass, scan_interval=SCAN_INTERVAL_OP_DATA, client=client)
+        super().__init__(
+            hass=hass,
+            scan_interval=SCAN_INTERVAL_OP_DATA,
+            client=client,
+            stale_grace_period=stale_grace_period,
+        )
 
     async def _async_update_data(self) -> dict[str, Any]:
         """Update config data via library."""
         try:
             async with async_timeout.timeout(10):
-                data = await self._client.async_read_op_data()
-                return _map_data_block_to_dict(data)
+                return await self._async_read_block(DATA_REGISTER_BLOCK_DESCRIPTOR)
         except AskoheatModbusApiClientError as exception:
-            self._client.last_communication_failed()
             raise UpdateFailed(exception) from exception
         except TimeoutError as error:
-            self._client.last_communication_failed()
             raise error from error
 
     async def async_write(self, _: RegisterInputDescriptor, __: object) -> None:
         """Write parameter data block of Askoheat."""
         msg = "Writing values to data block not allowed"
         raise UpdateFailed(msg)
-
-
-def _map_data_block_to_dict(data: AskoheatDataBlock) -> dict[str, Any]:
-    """Map askoheat data block to dict."""
-    result: dict[str, Any] = {}
-    if data.binary_sensors:
-        result.update(
-            {f"binary_sensor.{k}": data.binary_sensors[k] for k in data.binary_sensors}
-        )
-
-    if data.sensors:
-        result.update({f"sensor.{k}": data.sensors[k] for k in data.sensors})
-
-    if data.switches:
-        result.update({f"switch.{k}": data.switches[k] for k in data.switches})
-
-    if data.number_inputs:
-        result.update(
-            {f"number.{k}": data.number_inputs[k] for k in data.number_inputs}
-        )
-
-    if data.text_inputs:
-        result.update({f"text.{k}": data.text_inputs[k] for k in data.text_inputs})
-
-    if data.select_inputs:
-        result.update(
-            {f"select.{k}": data.select_inputs[k] for k in data.select_inputs}
-        )
-
-    if data.time_inputs:
-        result.update({f"time.{k}": data.time_inputs[k] for k in data.time_inputs})
-    return result
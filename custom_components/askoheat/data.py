@@ -8,23 +8,13 @@ from typing import TYPE_CHECKING, Any
 from custom_components.askoheat.const import SensorAttrKey
 
 if TYPE_CHECKING:
-    from datetime import time
-    from enum import ReprEnum
-
     from homeassistant.config_entries import ConfigEntry
     from homeassistant.loader import Integration
 
-    from custom_components.askoheat.const import (
-        BinarySensorAttrKey,
-        DeviceKey,
-        NumberAttrKey,
-        SelectAttrKey,
-        SwitchAttrKey,
-        TextAttrKey,
-        TimeAttrKey,
-    )
+    from custom_components.askoheat.const import DeviceKey
     from custom_components.askoheat.coordinator import (
         AskoheatConfigDataUpdateCoordinator,
+        AskoheatDataUpdateCoordinator,
         AskoheatEMADataUpdateCoordinator,
         AskoheatOperationDataUpdateCoordinator,
         AskoheatParameterDataUpdateCoordinator,
@@ -53,18 +43,15 @@ class AskoheatData:
         """Resolve and return askoheat device infos."""
         return AskoheatDeviceInfos(self.par_coordinator.data)
 
-
-@dataclass
-class AskoheatDataBlock:
-    """Data returns when querying EMA attributes of askoheat."""
-
-    binary_sensors: dict[BinarySensorAttrKey, bool] | None = None
-    sensors: dict[SensorAttrKey, object] | None = None
-    switches: dict[SwitchAttrKey, bool] | None = None
-    text_inputs: dict[TextAttrKey, str] | None = None
-    select_inputs: dict[SelectAttrKey, ReprEnum | None] | None = None
-    number_inputs: dict[NumberAttrKey, int | float] | None = None
-    time_inputs: dict[TimeAttrKey, time] | None = None
+    @property
+    def coordinators(self) -> tuple[AskoheatDataUpdateCoordinator, ...]:
+        """Return the coordinators of all register blocks."""
+        return (
+            self.ema_coordinator,
+            self.config_coordinator,
+            self.par_coordinator,
+            self.data_coordinator,
+        )
 
 
 @dataclass
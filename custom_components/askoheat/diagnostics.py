@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+from .const import RegisterBlockName
+
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
@@ -15,8 +17,26 @@ async def async_get_config_entry_diagnostics(
     entry: AskoheatConfigEntry,
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
+    client = entry.runtime_data.client
     return {
         "entry_data": dict(entry.data),
+        "connection": {
+            "state": client.connection_state,
+            "round_trip_times": client.round_trip_times,
+            "requests": client.request_metrics.as_dict(),
+        },
+        "timeline": {
+            "energy_manager": entry.runtime_data.ema_coordinator.timeline.as_list(),
+            "config": entry.runtime_data.config_coordinator.timeline.as_list(),
+            "operation": entry.runtime_data.data_coordinator.timeline.as_list(),
+            "parameter": entry.runtime_data.par_coordinator.timeline.as_list(),
+        },
+        "register_history": {
+            block: history.as_list()
+            for block in RegisterBlockName
+            if block != RegisterBlockName.UNKNOWN
+            and (history := client.register_history(block)) is not None
+        },
         "data": {
             "energy_manager": entry.runtime_data.ema_coordinator.data,
             "config": entry.runtime_data.config_coordinator.data,
@@ -15,6 +15,9 @@ from .const import ATTRIBUTION, AttributeKeys, DeviceKey
 from .coordinator import AskoheatDataUpdateCoordinator
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from datetime import datetime
+
     from .data import AskoheatConfigEntry
 
 
@@ -64,6 +67,8 @@ class AskoheatEntity[D: AskoheatEntityDescription[Any, Any]](
     _attr_attribution = ATTRIBUTION
 
     _unrecorded_attributes = frozenset({AttributeKeys.API_DESCRIPTOR})
+    # availability, state, icon and staleness last written to the state machine
+    _written_state: tuple[bool, Any, str | None, datetime | None] | None = None
 
     def __init__(
         self,
@@ -72,7 +77,13 @@ class AskoheatEntity[D: AskoheatEntityDescription[Any, Any]](
         entity_description: D,
     ) -> None:
         """Initialize."""
-        super().__init__(coordinator=coordinator)
+        # subscribe to changes of the own value only, see async_update_listeners
+        super().__init__(
+            coordinator=coordinator,
+            context=entity_description.data_key  # type: ignore[attr-defined]
+            if entity_description.api_descriptor is not None
+            else None,
+        )
         AskoheatBaseEntity.__init__(
             self=self, entry=entry, entity_description=entity_description
         )
@@ -93,7 +104,24 @@ class AskoheatEntity[D: AskoheatEntityDescription[Any, Any]](
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self.entry.runtime_data.client.is_ready
+        return self.coordinator.available
+
+    def _has_value(
+        self, data_key: str, coordinator: AskoheatDataUpdateCoordinator | None = None
+    ) -> bool:
+        """Return True if the coordinator got data containing the key."""
+        # coordinators have no data until their first refresh, i.e. while entities
+        # are set up from cached parameters
+        data = (coordinator or self.coordinator).data
+        return data is not None and data_key in data
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return the attributes, including since when the value is stale."""
+        attributes = super().extra_state_attributes
+        if (stale_since := self.coordinator.stale_since) is None:
+            return attributes
+        return {**(attributes or {}), AttributeKeys.STALE_SINCE: stale_since}
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -109,4 +137,20 @@ class AskoheatEntity[D: AskoheatEntityDescription[Any, Any]](
         else:
             self._attr_icon = descr.icon
 
+        if not self.force_update and self._written_state == self._state_snapshot():
+            return
         super()._handle_coordinator_update()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state to the state machine and remember what was written."""
+        self._written_state = self._state_snapshot()
+        super().async_write_ha_state()
+
+    def _state_snapshot(self) -> tuple[bool, Any, str | None, datetime | None]:
+        return (
+            self.available,
+            self.state,
+            self.icon,
+            self.coordinator.stale_since if self.available else None,
+        )
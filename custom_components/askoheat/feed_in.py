@@ -0,0 +1,241 @@
+"""Feed-in pipeline limiting the values written to the askoheat."""
+
+from __future__ import annotations
+
+import math
+from statistics import fmean, median
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HassJob, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import LOGGER, FeedInAggregation
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Coroutine, Sequence
+    from datetime import datetime, timedelta
+
+    from homeassistant.core import HomeAssistant
+
+
+class AskoheatPowerSum:
+    """
+    Incrementally updated sum of the power values of several sources.
+
+    Values of sources which did not report their state within the stale timeout are
+    excluded from the sum.
+    """
+
+    def __init__(self, stale_timeout: timedelta | None = None) -> None:
+        """Initialize the power sum."""
+        self._stale_timeout = stale_timeout.total_seconds() if stale_timeout else 0
+        self._values: dict[str, float] = {}
+        self._reported_at: dict[str, float] = {}
+        self._sum = 0.0
+
+    def update(self, source: str, value: float | None, reported_at: float) -> None:
+        """Update the power value of a source, `None` removes the source."""
+        self._remove(source)
+        # states like "nan" or "inf" are valid floats, but would poison the sum
+        if value is None or not math.isfinite(value):
+            return
+        self._values[source] = value
+        self._reported_at[source] = reported_at
+        self._sum += value
+
+    def report(self, source: str, reported_at: float) -> None:
+        """Mark the unchanged power value of a source as up to date."""
+        if source in self._reported_at:
+            self._reported_at[source] = reported_at
+
+    def total(self, now: float) -> float | None:
+        """Return the sum of all up to date sources, `None` if no source is left."""
+        if self._stale_timeout > 0:
+            for source, reported_at in list(self._reported_at.items()):
+                if now - reported_at > self._stale_timeout:
+                    LOGGER.debug("Ignore stale power value of %s", source)
+                    self._remove(source)
+        return self._sum if self._values else None
+
+    def _remove(self, source: str) -> None:
+        value = self._values.pop(source, None)
+        self._reported_at.pop(source, None)
+        if value is None:
+            return
+        # start over without accumulated rounding errors once all sources are gone
+        self._sum = self._sum - value if self._values else 0.0
+
+
+class AskoheatFeedInPipeline:
+    """
+    Forward feed-in values to the askoheat, limiting the number of writes.
+
+    If an aggregation window is configured, values are collected and aggregated to
+    a single value at the end of each window. Values differing less than the
+    deadband from the last written value are dropped, writes are delayed to respect
+    the minimal write interval and the last value is written again after the
+    keep-alive interval without any writes.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        hass: HomeAssistant,
+        write: Callable[[float], Coroutine[Any, Any, bool]],
+        *,
+        deadband: float,
+        min_write_interval: timedelta,
+        keepalive_interval: timedelta,
+        aggregation_window: timedelta | None = None,
+        aggregation_method: FeedInAggregation = FeedInAggregation.MEAN,
+        outlier_threshold: float = 0,
+    ) -> None:
+        """Initialize the feed-in pipeline."""
+        self._hass = hass
+        self._write = write
+        self._deadband = deadband
+        self._min_write_interval = min_write_interval.total_seconds()
+        self._keepalive_interval = keepalive_interval.total_seconds()
+        self._aggregation_window = (
+            aggregation_window.total_seconds() if aggregation_window else 0
+        )
+        self._aggregation_method = aggregation_method
+        self._outlier_threshold = outlier_threshold
+        self._samples: list[float] = []
+        self._value: float | None = None
+        self._written_value: float | None = None
+        self._written_at: float | None = None
+        self._cancel_deferred_write: Callable[[], None] | None = None
+        self._cancel_keepalive: Callable[[], None] | None = None
+        self._cancel_window: Callable[[], None] | None = None
+        self._deferred_write_job = HassJob(
+            self._async_deferred_write, "askoheat feed-in deferred write"
+        )
+        self._keepalive_job = HassJob(
+            self._async_keepalive, "askoheat feed-in keep-alive"
+        )
+        self._window_job = HassJob(
+            self._async_close_window, "askoheat feed-in aggregation window"
+        )
+
+    async def async_send(self, value: float, *, force: bool = False) -> None:
+        """Send a new feed-in value, bypassing all limits if forced."""
+        if force:
+            self._cancel_window_aggregation()
+            self._value = value
+            await self._async_write_value()
+            return
+        if self._aggregation_window > 0:
+            self._samples.append(value)
+            if self._cancel_window is None:
+                self._cancel_window = async_call_later(
+                    self._hass, self._aggregation_window, self._window_job
+                )
+            return
+        await self._async_submit(value)
+
+    async def _async_submit(self, value: float) -> None:
+        self._value = value
+        if not self._exceeds_deadband():
+            return
+
+        wait = self._remaining_write_interval()
+        if wait > 0:
+            # the latest value is written once the write interval passed
+            if self._cancel_deferred_write is None:
+                self._cancel_deferred_write = async_call_later(
+                    self._hass, wait, self._deferred_write_job
+                )
+            return
+        await self._async_write_value()
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel pending aggregations, deferred and keep-alive writes."""
+        self._cancel_window_aggregation()
+        self._cancel_writes()
+
+    def _cancel_window_aggregation(self) -> None:
+        self._samples.clear()
+        if self._cancel_window is not None:
+            self._cancel_window()
+            self._cancel_window = None
+
+    def _cancel_writes(self) -> None:
+        if self._cancel_deferred_write is not None:
+            self._cancel_deferred_write()
+            self._cancel_deferred_write = None
+        if self._cancel_keepalive is not None:
+            self._cancel_keepalive()
+            self._cancel_keepalive = None
+
+    def _exceeds_deadband(self) -> bool:
+        return (
+            self._written_value is None
+            or self._value is None
+            or abs(self._value - self._written_value) >= self._deadband
+        )
+
+    def _remaining_write_interval(self) -> float:
+        if self._written_at is None:
+            return 0
+        return self._written_at + self._min_write_interval - monotonic()
+
+    async def _async_close_window(self, _: datetime) -> None:
+        self._cancel_window = None
+        if not self._samples:
+            return
+        value = aggregate(
+            self._samples, self._aggregation_method, self._outlier_threshold
+        )
+        self._samples.clear()
+        LOGGER.debug("Aggregated feed-in value %s of window", value)
+        await self._async_submit(value)
+
+    async def _async_deferred_write(self, _: datetime) -> None:
+        self._cancel_deferred_write = None
+        if self._exceeds_deadband():
+            await self._async_write_value()
+
+    async def _async_keepalive(self, _: datetime) -> None:
+        self._cancel_keepalive = None
+        LOGGER.debug("Re-send feed-in value %s as keep-alive", self._written_value)
+        await self._async_write_value()
+
+    async def _async_write_value(self) -> None:
+        self._cancel_writes()
+        value = self._value if self._value is not None else self._written_value
+        if value is None:
+            return
+        if self._keepalive_interval > 0:
+            self._cancel_keepalive = async_call_later(
+                self._hass, self._keepalive_interval, self._keepalive_job
+            )
+        if not await self._write(value):
+            # not written, the value is retried with the next value or keep-alive
+            return
+        self._written_value = value
+        self._written_at = monotonic()
+
+
+def aggregate(
+    samples: Sequence[float], method: FeedInAggregation, outlier_threshold: float = 0
+) -> float:
+    """
+    Aggregate power samples of a window to a single value.
+
+    Samples deviating more than the outlier threshold from the median of the window
+    are ignored, unless no sample is left.
+    """
+    if outlier_threshold > 0:
+        center = median(samples)
+        samples = [
+            sample for sample in samples if abs(sample - center) <= outlier_threshold
+        ] or samples
+    match method:
+        case FeedInAggregation.MEDIAN:
+            return median(samples)
+        case FeedInAggregation.LAST:
+            return samples[-1]
+        case _:
+            return fmean(samples)
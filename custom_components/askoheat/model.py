@@ -35,7 +35,10 @@ from custom_components.askoheat.const import (
     DOMAIN,
     BinarySensorAttrKey,
     DeviceKey,
+    ModbusOperation,
     NumberAttrKey,
+    PollTier,
+    RegisterBlockName,
     SelectAttrKey,
     SensorAttrKey,
     SwitchAttrKey,
@@ -44,9 +47,12 @@ from custom_components.askoheat.const import (
 )
 
 if TYPE_CHECKING:
+    from collections.abc import Callable
     from datetime import date, datetime
     from decimal import Decimal
 
+    from custom_components.askoheat.api_metrics import AskoheatRequestMetrics
+
 
 @dataclass(frozen=True)
 class AskoheatEntityDescription[K: StrEnum, A: RegisterInputDescriptor](
@@ -58,6 +64,8 @@ class AskoheatEntityDescription[K: StrEnum, A: RegisterInputDescriptor](
     api_descriptor: A | None = None
     icon_by_state: dict[date | datetime | Decimal, str] | None = None
     device_key: DeviceKey | None = None
+    # how often the registers of the value are read along with its block
+    poll_tier: PollTier = PollTier.FAST
 
 
 @dataclass(frozen=True)
@@ -152,6 +160,15 @@ class AskoheatDurationSensorEntityDescription(AskoheatSensorEntityDescription):
     """Class describing an askoheat specific duration sensor entity."""
 
 
+@dataclass(frozen=True, kw_only=True)
+class AskoheatMetricsSensorEntityDescription(AskoheatSensorEntityDescription):
+    """Class describing a sensor entity exposing metrics of modbus requests."""
+
+    operation: ModbusOperation
+    block: RegisterBlockName
+    value_fn: Callable[[AskoheatRequestMetrics], float | None]
+
+
 @dataclass(frozen=True)
 class AskoheatNumberEntityDescription(
     AskoheatEntityDescription[
@@ -6,21 +6,33 @@ from datetime import date, datetime, timedelta
 from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
-from homeassistant.components.sensor import ENTITY_ID_FORMAT, SensorEntity
-from homeassistant.const import UnitOfTime
+from homeassistant.components.sensor import (
+    ENTITY_ID_FORMAT,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
 from homeassistant.core import callback
 
 from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
 from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
 from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
 from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
-from custom_components.askoheat.const import AttributeKeys
+from custom_components.askoheat.const import (
+    AttributeKeys,
+    DeviceKey,
+    ModbusOperation,
+    RegisterBlockName,
+    SensorAttrKey,
+)
 from custom_components.askoheat.model import (
     AskoheatDurationSensorEntityDescription,
+    AskoheatMetricsSensorEntityDescription,
     AskoheatSensorEntityDescription,
 )
 
-from .entity import AskoheatEntity
+from .entity import AskoheatBaseEntity, AskoheatEntity
 
 if TYPE_CHECKING:
     from decimal import Decimal
@@ -33,6 +45,59 @@ if TYPE_CHECKING:
     from .data import AskoheatConfigEntry
 
 
+def _latency_ms(latency: float | None) -> float | None:
+    return None if latency is None else latency * 1000
+
+
+def _percentage(rate: float | None) -> float | None:
+    return None if rate is None else rate * 100
+
+
+METRICS_SENSOR_ENTITY_DESCRIPTIONS = [
+    AskoheatMetricsSensorEntityDescription(
+        key=SensorAttrKey.EMA_POLL_LATENCY_P50,
+        device_key=DeviceKey.ENERGY_MANAGER,
+        icon="mdi:timer-outline",
+        operation=ModbusOperation.READ_INPUT_REGISTERS,
+        block=RegisterBlockName.ENERGY_MANAGER,
+        value_fn=lambda metrics: _latency_ms(metrics.latency(50)),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    AskoheatMetricsSensorEntityDescription(
+        key=SensorAttrKey.EMA_POLL_LATENCY_P95,
+        device_key=DeviceKey.ENERGY_MANAGER,
+        icon="mdi:timer-alert-outline",
+        operation=ModbusOperation.READ_INPUT_REGISTERS,
+        block=RegisterBlockName.ENERGY_MANAGER,
+        value_fn=lambda metrics: _latency_ms(metrics.latency(95)),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+    AskoheatMetricsSensorEntityDescription(
+        key=SensorAttrKey.EMA_POLL_FAILURE_RATE,
+        device_key=DeviceKey.ENERGY_MANAGER,
+        icon="mdi:lan-disconnect",
+        operation=ModbusOperation.READ_INPUT_REGISTERS,
+        block=RegisterBlockName.ENERGY_MANAGER,
+        value_fn=lambda metrics: _percentage(metrics.failure_rate),
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+    ),
+]
+
+
 def _instanciate(
     entry: AskoheatConfigEntry,
     coordinator: AskoheatDataUpdateCoordinator,
@@ -86,6 +151,13 @@ async def async_setup_entry(
         if entity_description.device_key is None
         or entity_description.device_key in entry.runtime_data.supported_devices
     )
+    async_add_entities(
+        (
+            AskoheatMetricsSensor(entry=entry, entity_description=entity_description)
+            for entity_description in METRICS_SENSOR_ENTITY_DESCRIPTIONS
+        ),
+        update_before_add=True,
+    )
 
 
 class AskoheatSensor(AskoheatEntity[AskoheatSensorEntityDescription], SensorEntity):
@@ -109,10 +181,7 @@ class AskoheatSensor(AskoheatEntity[AskoheatSensorEntityDescription], SensorEnti
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return (
-            super().available
-            and self.entity_description.data_key in self.coordinator.data
-        )
+        return super().available and self._has_value(self.entity_description.data_key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -187,3 +256,33 @@ class AskoheatDurationSensor(AskoheatSensor):
                 converted_value = minutes + (hours * 60) + (days * 24 * 60)
 
         return converted_value
+
+
+class AskoheatMetricsSensor(
+    AskoheatBaseEntity[AskoheatMetricsSensorEntityDescription], SensorEntity
+):
+    """askoheat sensor class exposing metrics of modbus requests."""
+
+    entity_description: AskoheatMetricsSensorEntityDescription
+    # metrics are recorded by the api client with each request, the sensor polls
+    # them instead of updating the state with every request
+    _attr_should_poll = True
+
+    def __init__(
+        self,
+        entry: AskoheatConfigEntry,
+        entity_description: AskoheatMetricsSensorEntityDescription,
+    ) -> None:
+        """Initialize the metrics sensor class."""
+        super().__init__(entry, entity_description)
+        self.entity_id = ENTITY_ID_FORMAT.format(
+            f"{self._device_unique_id}_{entity_description.key}"
+        )
+        self._attr_unique_id = self.entity_id
+
+    async def async_update(self) -> None:
+        """Update the value from the metrics of the api client."""
+        metrics = self.entry.runtime_data.client.request_metrics.get(
+            self.entity_description.operation, self.entity_description.block
+        )
+        self._attr_native_value = self.entity_description.value_fn(metrics)
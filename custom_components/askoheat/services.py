@@ -0,0 +1,81 @@
+"""Services of the askoheat integration."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ATTR_BLOCK,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_LIMIT,
+    ATTR_SINCE,
+    DOMAIN,
+    SERVICE_GET_REGISTER_HISTORY,
+    RegisterBlockName,
+)
+
+if TYPE_CHECKING:
+    from .data import AskoheatConfigEntry
+
+GET_REGISTER_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Required(ATTR_BLOCK): vol.In(
+            [block for block in RegisterBlockName if block != RegisterBlockName.UNKNOWN]
+        ),
+        vol.Optional(ATTR_SINCE): cv.datetime,
+        vol.Optional(ATTR_LIMIT): cv.positive_int,
+    }
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the askoheat integration."""
+
+    async def get_register_history(call: ServiceCall) -> ServiceResponse:
+        """Return the raw registers of the recent reads of a block."""
+        entry: AskoheatConfigEntry | None = hass.config_entries.async_get_entry(
+            call.data[ATTR_CONFIG_ENTRY_ID]
+        )
+        if (
+            entry is None
+            or entry.domain != DOMAIN
+            or entry.state != ConfigEntryState.LOADED
+        ):
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="entry_not_loaded"
+            )
+        history = entry.runtime_data.client.register_history(call.data[ATTR_BLOCK])
+        if history is None:
+            raise ServiceValidationError(
+                translation_domain=DOMAIN, translation_key="register_history_disabled"
+            )
+        since = call.data.get(ATTR_SINCE)
+        return {
+            "frames": history.as_list(
+                since=dt_util.as_utc(since).timestamp() if since else None,
+                limit=call.data.get(ATTR_LIMIT),
+            )
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_REGISTER_HISTORY,
+        get_register_history,
+        schema=GET_REGISTER_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.switch import ENTITY_ID_FORMAT, SwitchEntity
@@ -10,14 +11,24 @@ from homeassistant.const import (
     STATE_OFF,
     STATE_ON,
 )
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
-from homeassistant.exceptions import ConfigEntryError
+from homeassistant.core import (
+    Event,
+    EventStateChangedData,
+    EventStateReportedData,
+    HomeAssistant,
+    State,
+    callback,
+)
 from homeassistant.helpers import (
     restore_state as rs,
 )
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_state_report_event,
+)
 from homeassistant.helpers.httpx_client import get_async_client
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.util import dt as dt_util
 
 from custom_components.askoheat.api_conf_desc import (
     CONF_REGISTER_BLOCK_DESCRIPTOR,
@@ -30,11 +41,26 @@ from custom_components.askoheat.api_ema_desc import (
 from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
 from custom_components.askoheat.const import (
     CONF_FEED_IN,
+    CONF_FEED_IN_AGGREGATION_METHOD,
+    CONF_FEED_IN_AGGREGATION_WINDOW,
+    CONF_FEED_IN_DEADBAND,
+    CONF_FEED_IN_KEEPALIVE_INTERVAL,
+    CONF_FEED_IN_MIN_WRITE_INTERVAL,
+    CONF_FEED_IN_OUTLIER_THRESHOLD,
+    CONF_FEED_IN_STALE_TIMEOUT,
     CONF_POWER_ENTITY_ID,
     CONF_POWER_INVERT,
+    DEFAULT_FEED_IN_AGGREGATION_METHOD,
+    DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+    DEFAULT_FEED_IN_DEADBAND,
+    DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+    DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+    DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+    DEFAULT_FEED_IN_STALE_TIMEOUT,
     HTTP_RESPONSE_CODE_OK,
     LOGGER,
     DeviceKey,
+    FeedInAggregation,
     NumberAttrKey,
     SwitchAttrKey,
 )
@@ -44,6 +70,7 @@ from custom_components.askoheat.model import (
 )
 
 from .entity import AskoheatEntity
+from .feed_in import AskoheatFeedInPipeline, AskoheatPowerSum
 
 if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
@@ -59,17 +86,23 @@ if TYPE_CHECKING:
 
 
 async def async_setup_entry(
-    hass: HomeAssistant,  # noqa: ARG001
+    hass: HomeAssistant,
     entry: AskoheatConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up the switch platform."""
 
-    def config_power_entity() -> str | None:
+    def config_power_entities() -> list[str]:
         dev = entry.data.get(CONF_FEED_IN)
-        return dev[CONF_POWER_ENTITY_ID] if dev else None
-
-    power_entity_id = config_power_entity()
+        power_entity_id = dev.get(CONF_POWER_ENTITY_ID) if dev else None
+        if power_entity_id is None:
+            return []
+        # single power entity configured by previous versions
+        if isinstance(power_entity_id, str):
+            return [power_entity_id]
+        return list(power_entity_id)
+
+    power_entity_ids = config_power_entities()
     async_add_entities(
         AskoheatSwitch(
             entry=entry,
@@ -93,15 +126,16 @@ async def async_setup_entry(
         if entity_description.device_key is None
         or entity_description.device_key in entry.runtime_data.supported_devices
     )
-    if power_entity_id is not None and power_entity_id != []:
-        if isinstance(power_entity_id, list) and len(power_entity_id) != 1:
-            msg = "Cannot track multiple power_entities"
-            raise ConfigEntryError(msg)
+    if power_entity_ids:
 
         def config_power_invert() -> bool:
             dev = entry.data.get(CONF_FEED_IN)
             return dev[CONF_POWER_INVERT] if dev else False
 
+        def config_feed_in_value(key: str, default: Any) -> Any:
+            dev = entry.data.get(CONF_FEED_IN)
+            return dev.get(key, default) if dev else default
+
         async_add_entities(
             [
                 AskoheatAutoFeedInSwitch(
@@ -114,7 +148,50 @@ async def async_setup_entry(
                         icon="mdi:solar-power",
                         api_descriptor=None,
                     ),
-                    power_entity_id=power_entity_id,
+                    power_entity_ids=power_entity_ids,
+                    power_sum=AskoheatPowerSum(
+                        stale_timeout=timedelta(
+                            seconds=config_feed_in_value(
+                                CONF_FEED_IN_STALE_TIMEOUT,
+                                DEFAULT_FEED_IN_STALE_TIMEOUT,
+                            )
+                        )
+                    ),
+                    feed_in=AskoheatFeedInPipeline(
+                        hass,
+                        entry.runtime_data.ema_coordinator.async_write_feed_in_value,
+                        deadband=config_feed_in_value(
+                            CONF_FEED_IN_DEADBAND, DEFAULT_FEED_IN_DEADBAND
+                        ),
+                        min_write_interval=timedelta(
+                            seconds=config_feed_in_value(
+                                CONF_FEED_IN_MIN_WRITE_INTERVAL,
+                                DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+                            )
+                        ),
+                        keepalive_interval=timedelta(
+                            seconds=config_feed_in_value(
+                                CONF_FEED_IN_KEEPALIVE_INTERVAL,
+                                DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+                            )
+                        ),
+                        aggregation_window=timedelta(
+                            seconds=config_feed_in_value(
+                                CONF_FEED_IN_AGGREGATION_WINDOW,
+                                DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+                            )
+                        ),
+                        aggregation_method=FeedInAggregation(
+                            config_feed_in_value(
+                                CONF_FEED_IN_AGGREGATION_METHOD,
+                                DEFAULT_FEED_IN_AGGREGATION_METHOD,
+                            )
+                        ),
+                        outlier_threshold=config_feed_in_value(
+                            CONF_FEED_IN_OUTLIER_THRESHOLD,
+                            DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+                        ),
+                    ),
                     invert_power=config_power_invert(),
                 )
             ]
@@ -157,16 +234,13 @@ class AskoheatSwitch(AskoheatEntity[AskoheatSwitchEntityDescription], SwitchEnti
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return (
-            super().available
-            and self.entity_description.data_key in self.coordinator.data
-        )
+        return super().available and self._has_value(self.entity_description.data_key)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         data = self.coordinator.data
-        if data.get(self.entity_description.data_key) is None:
+        if data is None or data.get(self.entity_description.data_key) is None:
             return
         self._attr_state = data[self.entity_description.data_key]
         if (
@@ -218,8 +292,10 @@ class AskoheatAutoFeedInSwitch(
         conf_coordinator: AskoheatConfigDataUpdateCoordinator,
         ema_coordinator: AskoheatEMADataUpdateCoordinator,
         entity_description: AskoheatSwitchEntityDescription,
-        power_entity_id: str,
+        power_entity_ids: list[str],
         *,
+        power_sum: AskoheatPowerSum,
+        feed_in: AskoheatFeedInPipeline,
         invert_power: bool,
     ) -> None:
         """Initialize the auto feed-in switch class."""
@@ -233,21 +309,32 @@ class AskoheatAutoFeedInSwitch(
         self._buffer_entity_id = (
             f"number.{self._device_unique_id}_{NumberAttrKey.EMA_AUTO_FEEDIN_BUFFER}"
         )
-        self._power_entity_id = power_entity_id
+        self._power_entity_ids = power_entity_ids
+        self._power_sum = power_sum
         self._invert_power = invert_power
         self._ema_coordinator = ema_coordinator
+        self._feed_in = feed_in
 
     async def async_added_to_hass(self) -> None:
         """Subscribe to the events."""
         await super().async_added_to_hass()
         rs.async_get(self.hass).async_restore_entity_added(self)
+        self.async_on_remove(self._feed_in.async_stop)
+        for power_entity_id in self._power_entity_ids:
+            if (state := self.hass.states.get(power_entity_id)) is not None:
+                self._update_power_sum(state)
         self.async_on_remove(
             async_track_state_change_event(
                 self.hass,
-                [self._power_entity_id, self._buffer_entity_id],
+                [*self._power_entity_ids, self._buffer_entity_id],
                 self.power_entity_change,
             )
         )
+        self.async_on_remove(
+            async_track_state_report_event(
+                self.hass, self._power_entity_ids, self._power_entity_report
+            )
+        )
         if not (last_state := await self.async_get_last_state()):
             LOGGER.warning(
                 "No last state found for askoheat autofeed switch %s, "
@@ -271,10 +358,8 @@ class AskoheatAutoFeedInSwitch(
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return (
-            super().available
-            and EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key
-            in self._ema_coordinator.data
+        return super().available and self._has_value(
+            EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key, self._ema_coordinator
         )
 
     async def power_entity_change(self, event: Event[EventStateChangedData]) -> None:
@@ -282,8 +367,13 @@ class AskoheatAutoFeedInSwitch(
         LOGGER.debug("Power entity (%s) has changed", event.data["entity_id"])
         new_state = event.data["new_state"]
         if new_state is None:
+            if event.data["entity_id"] in self._power_entity_ids:
+                self._power_sum.update(event.data["entity_id"], None, 0)
             return
 
+        if event.data["entity_id"] != self._buffer_entity_id:
+            self._update_power_sum(new_state)
+
         if not self.available:
             return
 
@@ -291,26 +381,42 @@ class AskoheatAutoFeedInSwitch(
             case self._buffer_entity_id:
                 if new_state and new_state.state != "unknown":
                     self._buffer = int(new_state.state)
-                    current_power_value = self.hass.states.get(self._power_entity_id)
+                    current_power_value = self._current_power_value()
                     if self._attr_is_on and current_power_value is not None:
-                        await self.send_feed_in(float(current_power_value.state))
-            case self._power_entity_id:
+                        await self.send_feed_in(current_power_value, force=True)
+            case _:
                 if self._attr_is_on:
-                    await self.send_feed_in(float(new_state.state))
+                    await self.send_feed_in(self._current_power_value())
 
-    async def send_feed_in(self, power_value: float | None) -> None:
-        """Send power value after adding buffer value."""
-        api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
-        if api_desc is None:
-            return
+    @callback
+    def _power_entity_report(self, event: Event[EventStateReportedData]) -> None:
+        """Power input reported an unchanged value."""
+        self._power_sum.report(
+            event.data["entity_id"], event.data["new_state"].last_reported_timestamp
+        )
+
+    def _update_power_sum(self, state: State) -> None:
+        try:
+            value: float | None = float(state.state)
+        except ValueError:
+            # unknown or unavailable power entities do not contribute to the sum
+            value = None
+        self._power_sum.update(state.entity_id, value, state.last_reported_timestamp)
+
+    def _current_power_value(self) -> float | None:
+        return self._power_sum.total(dt_util.utcnow().timestamp())
 
+    async def send_feed_in(
+        self, power_value: float | None, *, force: bool = False
+    ) -> None:
+        """Send power value after adding buffer value."""
         raw_value = power_value or float(0)
         if power_value is not None:
             if self._invert_power:
                 raw_value = raw_value * -1
             # add buffer
             raw_value = raw_value + self._buffer
-        await self._ema_coordinator.async_write(api_desc, raw_value)
+        await self._feed_in.async_send(raw_value, force=force)
 
     async def async_turn_on(self, **_: Any) -> None:
         """Turn on the feed-in."""
@@ -322,9 +428,9 @@ class AskoheatAutoFeedInSwitch(
 
         # additionally provide current power value to evaluate if heating should be
         # turned on immediately
-        current_power_value = self.hass.states.get(self._power_entity_id)
+        current_power_value = self._current_power_value()
         if current_power_value is not None:
-            await self.send_feed_in(float(current_power_value.state))
+            await self.send_feed_in(current_power_value, force=True)
 
     async def async_turn_off(self, **_: Any) -> None:
         """Turn off feed-in."""
@@ -332,7 +438,8 @@ class AskoheatAutoFeedInSwitch(
         self.async_write_ha_state()
 
         # additionally initialize with 0 power value
-        await self.send_feed_in(None)
+        await self.send_feed_in(None, force=True)
+        self._feed_in.async_stop()
 
 
 class AskoheatEmergencySwitch(AskoheatSwitch):
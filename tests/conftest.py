@@ -9,6 +9,7 @@ from homeassistant.core import HomeAssistant
 from pymodbus.pdu.register_message import (
     ReadHoldingRegistersResponse,
     ReadInputRegistersResponse,
+    WriteMultipleRegistersResponse,
 )
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
@@ -136,22 +137,37 @@ def mock_api_client(
     read_ema_input_registers_response: ReadInputRegistersResponse,
 ) -> Any:
     """Fixture to pymodbus AsyncModbusTcpClient."""
+    input_blocks = (
+        (PARAM_REGISTER_BLOCK_DESCRIPTOR, read_par_input_registers_response),
+        (DATA_REGISTER_BLOCK_DESCRIPTOR, read_data_input_registers_response),
+        (EMA_REGISTER_BLOCK_DESCRIPTOR, read_ema_input_registers_response),
+    )
 
     def dispatch_read_input_registers(
-        address: int,
-        count: int,  # noqa: ARG001
+        address: int, count: int
     ) -> ReadInputRegistersResponse:
-        match address:
-            case PARAM_REGISTER_BLOCK_DESCRIPTOR.starting_register:
-                return read_par_input_registers_response
-            case DATA_REGISTER_BLOCK_DESCRIPTOR.starting_register:
-                return read_data_input_registers_response
-            case EMA_REGISTER_BLOCK_DESCRIPTOR.starting_register:
-                return read_ema_input_registers_response
-            case _:
-                return ReadInputRegistersResponse()
-
-    def dispatch_write_input_registers(address: int, values: list[int]) -> None:
+        # any range within a block can be read
+        for block, response in input_blocks:
+            offset = address - block.starting_register
+            if 0 <= offset < block.number_of_registers:
+                return ReadInputRegistersResponse(
+                    registers=response.registers[offset : offset + count]
+                )
+        return ReadInputRegistersResponse()
+
+    def dispatch_read_holding_registers(
+        address: int, count: int
+    ) -> ReadHoldingRegistersResponse:
+        offset = address - CONF_REGISTER_BLOCK_DESCRIPTOR.starting_register
+        return ReadHoldingRegistersResponse(
+            registers=read_config_holding_registers_response.registers[
+                offset : offset + count
+            ]
+        )
+
+    def dispatch_write_input_registers(
+        address: int, values: list[int]
+    ) -> WriteMultipleRegistersResponse:
         def _in_register(address: int, register: RegisterBlockDescriptor) -> bool:
             return (
                 address > register.starting_register
@@ -177,13 +193,14 @@ def mock_api_client(
                 )
             case _:
                 LOGGER.error("Unsupported register at address %s", address)
+        return WriteMultipleRegistersResponse(address=address, count=len(values))
 
     patched = mock.patch.multiple(
         "custom_components.askoheat.api.AsyncModbusTcpClient",
         connect=mock.AsyncMock(),
         connected=True,
         read_holding_registers=mock.AsyncMock(
-            return_value=read_config_holding_registers_response
+            side_effect=dispatch_read_holding_registers
         ),
         read_input_registers=mock.AsyncMock(side_effect=dispatch_read_input_registers),
         write_registers=mock.AsyncMock(side_effect=dispatch_write_input_registers),
@@ -0,0 +1,518 @@
+"""Tests for the askoheat modbus api client."""
+
+import asyncio
+import time
+from functools import partial
+from typing import Any
+from unittest import mock
+
+import pytest
+from pymodbus.exceptions import ModbusException
+from pymodbus.pdu.register_message import (
+    ReadInputRegistersResponse,
+    WriteMultipleRegistersResponse,
+)
+
+from custom_components.askoheat.api import (
+    AskoheatModbusApiClient,
+    AskoheatModbusApiClientCommunicationError,
+    AskoheatModbusApiClientError,
+)
+from custom_components.askoheat.api_ema_desc import (
+    EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
+    EMA_REGISTER_BLOCK_DESCRIPTOR,
+)
+from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_planner import plan_block_ranges
+from custom_components.askoheat.const import (
+    MAX_CONSECUTIVE_FAILURES,
+    REQUEST_TIMEOUT_MAX,
+    REQUEST_TIMEOUT_MIN,
+    ROUND_TRIP_SAMPLES,
+    ConnectionState,
+    ModbusOperation,
+    NumberAttrKey,
+    PollTier,
+    RegisterBlockName,
+    SensorAttrKey,
+)
+from tests.conftest import HOST
+
+
+async def test_read_reuses_data_of_unchanged_registers(
+    mock_api_client: Any,  # noqa: ARG001
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test decoded data is reused as long as the raw registers did not change."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+
+    first = await client.async_read_ema_data()
+    assert await client.async_read_ema_data() is first
+
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    read_ema_input_registers_response.registers[api_desc.starting_register] = 100
+    changed = await client.async_read_ema_data()
+
+    assert changed is not first
+    assert changed[EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key] == 100  # noqa: PLR2004
+    assert await client.async_read_ema_data() is changed
+
+
+async def test_read_reports_changed_keys(
+    mock_api_client: Any,  # noqa: ARG001
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test only values of changed registers are reported as changed."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+
+    (first,) = await client.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR])
+    assert first.changed_keys is None
+    (unchanged,) = await client.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR])
+    assert unchanged.changed_keys == frozenset()
+
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    read_ema_input_registers_response.registers[api_desc.starting_register] = 100
+    (changed,) = await client.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR])
+
+    assert changed.changed_keys == {EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key}
+    assert changed.data == {
+        **first.data,
+        EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key: 100,
+    }
+
+
+async def test_write_feed_in_value_does_not_read(
+    mock_api_client: Any,  # noqa: ARG001
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test the feed-in value is written without re-reading the ema block."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+
+    with mock.patch.object(
+        client._client,  # noqa: SLF001
+        "read_input_registers",
+        wraps=client._client.read_input_registers,  # noqa: SLF001
+    ) as read_input_registers:
+        await client.async_write_feed_in_value(-100)
+
+    read_input_registers.assert_not_called()
+    assert read_ema_input_registers_response.registers[api_desc.starting_register] == (
+        0xFFFF - 99
+    )
+
+
+async def test_write_feed_in_value_validates_response(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test an unconfirmed feed-in write raises a communication error."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+
+    with (
+        mock.patch.object(
+            client._client,  # noqa: SLF001
+            "write_registers",
+            return_value=WriteMultipleRegistersResponse(address=0, count=1),
+        ),
+        pytest.raises(AskoheatModbusApiClientCommunicationError),
+    ):
+        await client.async_write_feed_in_value(100)
+
+
+async def test_values_without_register_values_are_not_written(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test values which cannot be converted to registers are rejected."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+
+    with mock.patch.object(
+        client._client,  # noqa: SLF001
+        "write_registers",
+        wraps=client._client.write_registers,  # noqa: SLF001
+    ) as write_registers:
+        with pytest.raises(AskoheatModbusApiClientError):
+            await client.async_write_ema_data(api_desc, "invalid")
+        with pytest.raises(AskoheatModbusApiClientError):
+            await client.async_write_feed_in_value("invalid")  # type: ignore[arg-type]
+        with pytest.raises(AskoheatModbusApiClientError):
+            await client.async_write_feed_in_value(float("nan"))
+        with pytest.raises(AskoheatModbusApiClientError):
+            await client.async_write_feed_in_value(float("inf"))
+
+    write_registers.assert_not_called()
+
+
+async def test_requests_are_deduplicated_and_writes_prioritized(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test pending reads of the same block are shared and writes run first."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+    inner_client = client._client  # noqa: SLF001
+    read_input_registers = inner_client.read_input_registers
+    write_registers = inner_client.write_registers
+    requests: list[tuple[str, int]] = []
+
+    async def record_read(address: int, count: int) -> Any:
+        requests.append(("read", address))
+        return await read_input_registers(address=address, count=count)
+
+    async def record_write(address: int, values: list[int]) -> Any:
+        requests.append(("write", address))
+        return await write_registers(address=address, values=values)
+
+    with (
+        mock.patch.object(inner_client, "read_input_registers", record_read),
+        mock.patch.object(inner_client, "write_registers", record_write),
+    ):
+        (ema,), (shared_ema, _), _ = await asyncio.gather(
+            client.async_read_blocks([EMA_REGISTER_BLOCK_DESCRIPTOR]),
+            client.async_read_blocks(
+                [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+            ),
+            client.async_write_feed_in_value(100),
+        )
+
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    assert shared_ema is ema
+    assert requests == [
+        ("write", EMA_REGISTER_BLOCK_DESCRIPTOR.absolute_register_index(api_desc)),
+        ("read", EMA_REGISTER_BLOCK_DESCRIPTOR.starting_register),
+        ("read", DATA_REGISTER_BLOCK_DESCRIPTOR.starting_register),
+    ]
+
+
+async def test_parallel_reads_fall_back_to_serial_reads(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test reads failing on an additional connection are retried serially."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, max_connections=2)
+    await client.connect()
+    (parallel_client,) = client._parallel_clients  # noqa: SLF001
+
+    with mock.patch.object(
+        parallel_client,
+        "read_input_registers",
+        side_effect=ModbusException("Connection reset"),
+    ) as read_input_registers:
+        ema, data = await client.async_read_blocks(
+            [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+        )
+
+    read_input_registers.assert_awaited_once()
+    assert not client._parallel_reads  # noqa: SLF001
+    serial_client = AskoheatModbusApiClient(host=HOST, port=502)
+    await serial_client.connect()
+    assert [ema.data, data.data] == [
+        result.data
+        for result in await serial_client.async_read_blocks(
+            [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+        )
+    ]
+
+
+async def test_parallel_reads_follow_connection_state(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test additional connections are closed while degraded and reconnected."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, max_connections=2)
+    await client.connect()
+    connection = client._connection  # noqa: SLF001
+    (parallel_client,) = client._parallel_clients  # noqa: SLF001
+
+    with (
+        mock.patch.object(
+            parallel_client,
+            "read_input_registers",
+            side_effect=ModbusException("Connection reset"),
+        ),
+        mock.patch.object(connection, "backoff_delay", return_value=60),
+    ):
+        await client.async_read_blocks(
+            [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+        )
+    # reconnected after a backoff while the main connection is ready
+    assert not client._parallel_reads  # noqa: SLF001
+    assert client._parallel_task is not None  # noqa: SLF001
+
+    connection.record_failure(connected=True)
+    assert client.connection_state == ConnectionState.DEGRADED
+    assert client._parallel_task is None  # noqa: SLF001
+
+    with mock.patch.object(connection, "backoff_delay", return_value=0):
+        connection.record_success()
+    assert client.connection_state == ConnectionState.READY
+    await client._parallel_task  # noqa: SLF001
+    assert client._parallel_reads  # noqa: SLF001
+
+    with mock.patch.object(
+        parallel_client,
+        "read_input_registers",
+        wraps=parallel_client.read_input_registers,
+    ) as read_input_registers:
+        await client.async_read_blocks(
+            [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+        )
+    read_input_registers.assert_awaited_once()
+
+    client.close()
+    assert not client._parallel_reads  # noqa: SLF001
+
+
+async def test_requests_are_accounted_to_their_register_blocks(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test latencies, errors and retries are recorded per operation and block."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, max_connections=2)
+    await client.connect()
+    (parallel_client,) = client._parallel_clients  # noqa: SLF001
+
+    with mock.patch.object(
+        parallel_client,
+        "read_input_registers",
+        side_effect=ModbusException("Connection reset"),
+    ):
+        await client.async_read_blocks(
+            [EMA_REGISTER_BLOCK_DESCRIPTOR, DATA_REGISTER_BLOCK_DESCRIPTOR]
+        )
+
+    metrics = client.request_metrics
+    ema = metrics.get(
+        ModbusOperation.READ_INPUT_REGISTERS, RegisterBlockName.ENERGY_MANAGER
+    )
+    assert (ema.requests, ema.failures, ema.retries) == (1, 0, 0)
+    assert (
+        ema.transferred_bytes == 2 * EMA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers
+    )
+    assert ema.latency(50) is not None
+    # the single register read to probe the connection is accounted apart
+    probe = metrics.get(ModbusOperation.HEARTBEAT, RegisterBlockName.ENERGY_MANAGER)
+    assert (probe.requests, probe.transferred_bytes) == (1, 2)
+
+    data = metrics.get(
+        ModbusOperation.READ_INPUT_REGISTERS, RegisterBlockName.OPERATION
+    )
+    assert (data.requests, data.failures, data.retries) == (2, 1, 1)
+    assert data.errors == {"ModbusException": 1}
+    assert data.failure_rate == 0.5  # noqa: PLR2004
+    assert (
+        data.transferred_bytes == 2 * DATA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers
+    )
+
+    diagnostics = metrics.as_dict()[ModbusOperation.READ_INPUT_REGISTERS]
+    assert diagnostics.keys() == {
+        RegisterBlockName.ENERGY_MANAGER,
+        RegisterBlockName.OPERATION,
+    }
+    assert sum(diagnostics[RegisterBlockName.OPERATION]["histogram"].values()) == 1
+
+
+async def test_request_times_out_after_measured_round_trip_times(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test unanswered requests fail after a multiple of the measured round-trips."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+    for _ in range(ROUND_TRIP_SAMPLES):
+        await client.async_read_ema_data()
+    assert client.round_trip_times["timeout"] == REQUEST_TIMEOUT_MIN.total_seconds()
+
+    async def no_response(**_: Any) -> None:
+        await asyncio.sleep(REQUEST_TIMEOUT_MAX.total_seconds())
+
+    with (
+        mock.patch.object(
+            client._client,  # noqa: SLF001
+            "read_input_registers",
+            no_response,
+        ),
+        pytest.raises(AskoheatModbusApiClientCommunicationError),
+    ):
+        async with asyncio.timeout(1):
+            await client.async_read_ema_data()
+
+
+async def test_open_circuit_fails_fast_until_probe_succeeds(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test requests are short-circuited while the device does not answer probes."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    await client.connect()
+    ready = asyncio.Event()
+    client.add_connection_listener(
+        lambda state: ready.set() if state == ConnectionState.READY else None
+    )
+    read_input_registers = client._client.read_input_registers  # noqa: SLF001
+    # the first probe fails as well
+    failures = iter([ModbusException("No response")] * (MAX_CONSECUTIVE_FAILURES + 1))
+
+    async def fail_before_read(address: int, count: int) -> Any:
+        if (failure := next(failures, None)) is not None:
+            raise failure
+        return await read_input_registers(address=address, count=count)
+
+    with (
+        mock.patch.object(
+            client._client,  # noqa: SLF001
+            "read_input_registers",
+            side_effect=fail_before_read,
+        ) as read,
+        mock.patch.object(
+            client._connection,  # noqa: SLF001
+            "backoff_delay",
+            return_value=0.05,
+        ),
+    ):
+        for _ in range(MAX_CONSECUTIVE_FAILURES):
+            with pytest.raises(ModbusException):
+                await client.async_read_ema_data()
+
+        with pytest.raises(AskoheatModbusApiClientCommunicationError):
+            await client.async_read_ema_data()
+        with pytest.raises(AskoheatModbusApiClientCommunicationError):
+            await client.async_write_feed_in_value(100)
+        assert not client.is_ready
+
+        async with asyncio.timeout(1):
+            await ready.wait()
+
+    # only the probe requests were sent while the circuit was open
+    assert read.await_count == MAX_CONSECUTIVE_FAILURES + 2
+    assert await client.async_read_ema_data()
+
+
+async def test_idle_connection_is_kept_alive_by_heartbeat(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test a single register is read once the connection was idle for a while."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, heartbeat_interval=0.05)
+
+    with mock.patch.object(
+        client._client,  # noqa: SLF001
+        "read_input_registers",
+        wraps=client._client.read_input_registers,  # noqa: SLF001
+    ) as read_input_registers:
+        await client.connect()
+        await client.async_read_ema_data()
+        await asyncio.sleep(0.2)
+        client.close()
+
+    heartbeats = read_input_registers.await_args_list[2:]
+    assert heartbeats
+    assert all(heartbeat.kwargs["count"] == 1 for heartbeat in heartbeats)
+
+
+async def test_heartbeat_is_skipped_after_pending_requests(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test the heartbeat is queued behind other requests and skipped after them."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, heartbeat_interval=0.05)
+    inner_client = client._client  # noqa: SLF001
+    read_input_registers = inner_client.read_input_registers
+    release = asyncio.Event()
+
+    async def slow_read(address: int, count: int) -> Any:
+        await release.wait()
+        return await read_input_registers(address=address, count=count)
+
+    await client.connect()
+    with mock.patch.object(
+        inner_client, "read_input_registers", wraps=slow_read
+    ) as read:
+        reading = asyncio.create_task(client.async_read_ema_data())
+        # the heartbeat becomes due while the read is in flight
+        await asyncio.sleep(0.1)
+        release.set()
+        await reading
+        await asyncio.sleep(0.01)
+        client.close()
+
+    assert read.await_args_list
+    assert all(call.kwargs["count"] != 1 for call in read.await_args_list)
+
+
+async def test_heartbeat_is_queued_like_other_requests(
+    mock_api_client: Any,  # noqa: ARG001
+) -> None:
+    """Test reads requested during a heartbeat wait until the heartbeat finished."""
+    client = AskoheatModbusApiClient(host=HOST, port=502, heartbeat_interval=0.05)
+    inner_client = client._client  # noqa: SLF001
+    read_input_registers = inner_client.read_input_registers
+    heartbeat_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def slow_heartbeat(address: int, count: int) -> Any:
+        if count == 1:
+            heartbeat_started.set()
+            await release.wait()
+        return await read_input_registers(address=address, count=count)
+
+    await client.connect()
+    with mock.patch.object(
+        inner_client, "read_input_registers", wraps=slow_heartbeat
+    ) as read:
+        async with asyncio.timeout(1):
+            await heartbeat_started.wait()
+        reading = asyncio.create_task(client.async_read_ema_data())
+        await asyncio.sleep(0.01)
+        assert read.await_count == 1
+        release.set()
+        await reading
+        client.close()
+
+    assert read.await_count == 2  # noqa: PLR2004
+
+
+async def test_slow_values_are_read_once_their_poll_tier_is_due(
+    mock_api_client: Any,  # noqa: ARG001
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test registers of slow values are skipped until their poll tier is due."""
+    client = AskoheatModbusApiClient(host=HOST, port=502)
+    client.set_register_history(3)
+    await client.connect()
+    elapsed = 0
+    setpoint = f"number.{NumberAttrKey.LOAD_SETPOINT_VALUE}"
+    heater_load = f"sensor.{SensorAttrKey.HEATER_LOAD}"
+
+    with (
+        mock.patch(
+            "custom_components.askoheat.api.monotonic",
+            side_effect=lambda: time.monotonic() + elapsed,
+        ),
+        # the setpoints are read along with the adjacent registers otherwise
+        mock.patch(
+            "custom_components.askoheat.api.plan_block_ranges",
+            partial(plan_block_ranges, max_gap=0),
+        ),
+    ):
+        first = await client.async_read_ema_data()
+        registers = read_ema_input_registers_response.registers
+        registers[17] = 500
+        registers[19] = 1000
+        fast = await client.async_read_ema_data()
+
+        assert fast[heater_load] == 500  # noqa: PLR2004
+        assert fast[setpoint] == first[setpoint]
+
+        elapsed = PollTier.SLOW
+        slow = await client.async_read_ema_data()
+
+    assert slow[setpoint] == 1000  # noqa: PLR2004
+    assert slow[heater_load] == 500  # noqa: PLR2004
+    # registers skipped by a read are not recorded in the history
+    history = client.register_history(RegisterBlockName.ENERGY_MANAGER)
+    assert history is not None
+    assert [frame[19] for _, frame in history.frames()] == [0, None, 1000]
+    assert [frame[17] for _, frame in history.frames()] == [0, 500, 500]
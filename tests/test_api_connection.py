@@ -0,0 +1,155 @@
+"""Tests for the health tracking of the modbus connection."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from custom_components.askoheat.api_connection import (
+    AskoheatConnection,
+    AskoheatRoundTripTimes,
+)
+from custom_components.askoheat.const import ConnectionState
+
+
+async def _connect() -> bool:
+    return True
+
+
+def _close() -> None:
+    return
+
+
+async def test_connection_degrades_before_going_down() -> None:
+    """Test failed requests degrade the connection until it is reconnected."""
+    connection = AskoheatConnection(_connect, _close, max_consecutive_failures=2)
+    states: list[ConnectionState] = []
+    connection.add_listener(states.append)
+    assert await connection.async_connect()
+
+    connection.record_failure(connected=True)
+    assert connection.state == ConnectionState.DEGRADED
+    connection.record_success()
+    assert connection.state == ConnectionState.READY
+
+    connection.record_failure(connected=True)
+    connection.record_failure(connected=True)
+    assert connection.state == ConnectionState.DOWN
+    await asyncio.sleep(0)
+
+    assert states == [
+        ConnectionState.READY,
+        ConnectionState.DEGRADED,
+        ConnectionState.READY,
+        ConnectionState.DEGRADED,
+        ConnectionState.DOWN,
+        ConnectionState.CONNECTING,
+        ConnectionState.READY,
+    ]
+
+
+async def test_reconnect_with_backoff() -> None:
+    """Test reconnects are retried until the device accepts the connection."""
+    attempts = iter([True, False, False, True])
+
+    async def connect() -> bool:
+        return next(attempts)
+
+    closed: list[bool] = []
+    connection = AskoheatConnection(
+        connect, lambda: closed.append(True), backoff_min=timedelta(milliseconds=1)
+    )
+    assert await connection.async_connect()
+    ready = asyncio.Event()
+    connection.add_listener(
+        lambda state: ready.set() if state == ConnectionState.READY else None
+    )
+
+    connection.connection_lost()
+    assert connection.state == ConnectionState.DOWN
+    async with asyncio.timeout(1):
+        await ready.wait()
+
+    # closed once the connection was lost and after each failed attempt
+    assert closed == [True, True, True]
+    assert next(attempts, None) is None
+
+
+async def test_connect_with_retry() -> None:
+    """Test connecting with retry waits until the device accepts the connection."""
+    attempts = iter([False, False, True])
+
+    async def connect() -> bool:
+        return next(attempts)
+
+    connection = AskoheatConnection(
+        connect, _close, backoff_min=timedelta(milliseconds=1)
+    )
+    async with asyncio.timeout(1):
+        assert await connection.async_connect(retry=True)
+
+    assert connection.state == ConnectionState.READY
+    assert next(attempts, None) is None
+
+
+async def test_closed_connection_stops_connecting_with_retry() -> None:
+    """Test closing the connection stops retrying to connect."""
+
+    async def connect() -> bool:
+        return False
+
+    connection = AskoheatConnection(connect, _close, backoff_min=timedelta(hours=1))
+    connecting = asyncio.create_task(connection.async_connect(retry=True))
+    await asyncio.sleep(0)
+
+    connection.close()
+
+    async with asyncio.timeout(1):
+        assert not await connecting
+    assert connection.state == ConnectionState.DOWN
+
+
+async def test_closed_connection_does_not_reconnect() -> None:
+    """Test a closed connection ignores later failures."""
+    connection = AskoheatConnection(_connect, _close)
+    assert await connection.async_connect()
+
+    connection.close()
+    connection.connection_lost()
+    await asyncio.sleep(0)
+
+    assert connection.state == ConnectionState.DOWN
+
+
+@pytest.mark.parametrize(
+    ("attempt", "expected"),
+    [(0, (0, 0)), (1, (0.5, 1)), (3, (2, 4)), (20, (150, 300))],
+)
+def test_backoff_delay(attempt: int, expected: tuple[float, float]) -> None:
+    """Test the first reconnect is immediate, further ones back off with jitter."""
+    connection = AskoheatConnection(_connect, _close)
+
+    assert expected[0] <= connection.backoff_delay(attempt) <= expected[1]
+
+
+def test_timeout_is_derived_from_round_trip_times() -> None:
+    """Test the timeout follows the slowest recent round-trip times within bounds."""
+    round_trip_times = AskoheatRoundTripTimes(
+        samples=10,
+        factor=3,
+        timeout_min=timedelta(milliseconds=300),
+        timeout_max=timedelta(seconds=10),
+    )
+    assert round_trip_times.timeout == 10  # noqa: PLR2004
+
+    for _ in range(10):
+        round_trip_times.add(0.01)
+    assert round_trip_times.timeout == 0.3  # noqa: PLR2004
+
+    round_trip_times.add(0.5)
+    assert round_trip_times.percentile(99) == 0.5  # noqa: PLR2004
+    assert round_trip_times.timeout == 1.5  # noqa: PLR2004
+
+    for _ in range(10):
+        round_trip_times.add(5)
+    assert round_trip_times.timeout == 10  # noqa: PLR2004
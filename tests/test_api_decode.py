@@ -0,0 +1,172 @@
+"""Tests for the precompiled register block decode plans."""
+
+import math
+import random
+from typing import Any
+
+import pytest
+
+from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_decode import NAN_BYTES, decode_plan
+from custom_components.askoheat.api_decode_numpy import numpy_decode_plan
+from custom_components.askoheat.api_desc import (
+    Float32RegisterInputDescriptor,
+    RegisterBlockDescriptor,
+    StructRegisterInputDescriptor,
+)
+from custom_components.askoheat.api_ema_desc import (
+    EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
+    EMA_REGISTER_BLOCK_DESCRIPTOR,
+)
+from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    ],
+)
+def test_decode_plan_covers_all_entities(block: RegisterBlockDescriptor) -> None:
+    """Test every entity with an api descriptor has a decode step within the block."""
+    expected_keys = {
+        description.data_key
+        for descriptions in (
+            block.binary_sensors,
+            block.sensors,
+            block.switches,
+            block.number_inputs,
+            block.text_inputs,
+            block.time_inputs,
+            block.select_inputs,
+        )
+        for description in descriptions
+        if description.api_descriptor is not None
+    }
+    steps = decode_plan(block).steps
+
+    assert {step.key for step in steps} == expected_keys
+    assert all(step.offset + step.width <= block.number_of_registers for step in steps)
+
+
+def test_decode_plan_is_compiled_once() -> None:
+    """Test decode plans are shared for the same register block."""
+    assert decode_plan(EMA_REGISTER_BLOCK_DESCRIPTOR) is decode_plan(
+        EMA_REGISTER_BLOCK_DESCRIPTOR
+    )
+
+
+def test_decode_signed_value() -> None:
+    """Test signed int16 values are decoded from the raw register value."""
+    registers = [0] * EMA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    registers[api_desc.starting_register] = 0xFFFF - 99
+
+    data = decode_plan(EMA_REGISTER_BLOCK_DESCRIPTOR).decode(registers)
+
+    assert data[EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key] == -100  # noqa: PLR2004
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_decode_changes_matches_full_decode(
+    block: RegisterBlockDescriptor, seed: int
+) -> None:
+    """Test re-decoding changed registers results in the same values."""
+    rnd = random.Random(seed)  # noqa: S311
+    # keep values small to produce valid times and strings
+    previous = [rnd.randint(0, 23) for _ in range(block.number_of_registers)]
+    registers = list(previous)
+    for offset in rnd.sample(range(block.number_of_registers), 5):
+        registers[offset] = rnd.randint(0, 23)
+    plan = decode_plan(block)
+    previous_data = plan.decode(previous)
+    expected = plan.decode(registers)
+
+    data, changed_keys = plan.decode_changes(registers, previous, previous_data)
+
+    assert data == expected
+    assert changed_keys == {
+        key
+        for key in previous_data.keys() | expected.keys()
+        if previous_data.get(key) != expected.get(key)
+        or (key in previous_data) != (key in expected)
+    }
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_decode_plan_matches_decode_plan(
+    block: RegisterBlockDescriptor, seed: int
+) -> None:
+    """Test the numpy engine decodes the same values as the python decode plan."""
+    rnd = random.Random(seed)  # noqa: S311
+    # keep values small to produce valid times and strings
+    registers = [rnd.randint(0, 23) for _ in range(block.number_of_registers)]
+
+    assert numpy_decode_plan(block).decode(registers) == decode_plan(block).decode(
+        registers
+    )
+
+
+def test_numpy_decode_plan_skips_nan_values() -> None:
+    """Test struct values marked as not available are not decoded."""
+    registers = [0] * DATA_REGISTER_BLOCK_DESCRIPTOR.number_of_registers
+    description = next(
+        description
+        for description in DATA_REGISTER_BLOCK_DESCRIPTOR.sensors
+        if isinstance(description.api_descriptor, StructRegisterInputDescriptor)
+    )
+    offset = description.api_descriptor.starting_register
+    registers[offset : offset + 2] = [
+        int.from_bytes(NAN_BYTES[:2]),
+        int.from_bytes(NAN_BYTES[2:]),
+    ]
+
+    data = numpy_decode_plan(DATA_REGISTER_BLOCK_DESCRIPTOR).decode(registers)
+
+    assert description.data_key not in data
+    assert data == decode_plan(DATA_REGISTER_BLOCK_DESCRIPTOR).decode(registers)
+
+
+@pytest.mark.parametrize("plan", [decode_plan, numpy_decode_plan])
+def test_decode_changes_ignores_nan_values(plan: Any) -> None:
+    """Test NaN values are not reported as changed with every read."""
+    block = CONF_REGISTER_BLOCK_DESCRIPTOR
+    description = next(
+        description
+        for description in (*block.sensors, *block.number_inputs)
+        if isinstance(description.api_descriptor, Float32RegisterInputDescriptor)
+    )
+    offset = description.api_descriptor.starting_register
+    previous = [0] * block.number_of_registers
+    previous[offset : offset + 2] = [0x7FC0, 0x7FC0]
+    registers = list(previous)
+    registers[offset : offset + 2] = [0x7FC1, 0x7FC1]
+    previous_data = plan(block).decode(previous)
+
+    data, changed_keys = plan(block).decode_changes(registers, previous, previous_data)
+
+    assert math.isnan(data[description.data_key])
+    assert description.data_key not in changed_keys
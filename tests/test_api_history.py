@@ -0,0 +1,44 @@
+"""Tests for the history of raw register frames."""
+
+from custom_components.askoheat.api_history import AskoheatRegisterHistory
+
+
+def test_register_history_overwrites_oldest_frames() -> None:
+    """Test the history keeps the most recent frames oldest first."""
+    history = AskoheatRegisterHistory(number_of_registers=2, capacity=3)
+    for timestamp in range(1, 6):
+        history.add(float(timestamp), [timestamp, 0xFFFF])
+
+    assert len(history) == 3  # noqa: PLR2004
+    assert history.frames() == [
+        (3.0, [3, 0xFFFF]),
+        (4.0, [4, 0xFFFF]),
+        (5.0, [5, 0xFFFF]),
+    ]
+
+
+def test_register_history_filters_frames() -> None:
+    """Test frames are filtered by timestamp and limited to the most recent."""
+    history = AskoheatRegisterHistory(number_of_registers=1, capacity=10)
+    for timestamp in range(1, 6):
+        history.add(float(timestamp), [timestamp])
+    # frames of an unexpected size are ignored
+    history.add(6.0, [1, 2])
+
+    assert [timestamp for timestamp, _ in history.frames(since=3.0)] == [3, 4, 5]
+    assert history.frames(limit=2) == [(4.0, [4]), (5.0, [5])]
+    assert history.frames(since=5.0, limit=2) == [(5.0, [5])]
+    assert history.as_list(limit=1) == [
+        {"timestamp": "1970-01-01T00:00:05+00:00", "registers": [5]}
+    ]
+
+
+def test_register_history_marks_registers_not_read() -> None:
+    """Test registers taken over from a previous read are returned as None."""
+    history = AskoheatRegisterHistory(number_of_registers=3, capacity=2)
+    history.add(1.0, [1, 2, 3])
+    history.add(2.0, [4, 2, 3], [True, False, False])
+    # flags of an unexpected size are ignored
+    history.add(3.0, [5, 2, 3], [True])
+
+    assert history.frames() == [(1.0, [1, 2, 3]), (2.0, [4, None, None])]
@@ -0,0 +1,89 @@
+"""Tests for the metrics of modbus requests."""
+
+from custom_components.askoheat.api_metrics import (
+    AskoheatRequestMetrics,
+    AskoheatTimeline,
+    percentile,
+)
+from custom_components.askoheat.const import TimelineEventKind
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    """Test percentiles are samples and not interpolated."""
+    samples = [0.4, 0.1, 0.3, 0.2]
+
+    assert percentile([], 50) is None
+    assert percentile(samples, 50) == 0.2  # noqa: PLR2004
+    assert percentile(samples, 99) == 0.4  # noqa: PLR2004
+    assert percentile(samples, 0) == 0.1  # noqa: PLR2004
+
+
+def test_request_metrics_count_latencies_and_errors() -> None:
+    """Test failed requests are counted by error but not as latency."""
+    metrics = AskoheatRequestMetrics(samples=4)
+    metrics.add(0.005, registers=10)
+    metrics.add(0.02, registers=10)
+    metrics.add(1, registers=10, error=TimeoutError())
+    metrics.add_retry()
+
+    assert metrics.requests == 3  # noqa: PLR2004
+    assert metrics.failures == 1
+    assert metrics.retries == 1
+    assert metrics.transferred_bytes == 40  # noqa: PLR2004
+    assert metrics.errors == {"TimeoutError": 1}
+    assert metrics.latency(50) == 0.005  # noqa: PLR2004
+    assert metrics.latency(95) == 0.02  # noqa: PLR2004
+    histogram = metrics.as_dict()["histogram"]
+    assert histogram["10ms"] == 1
+    assert histogram["25ms"] == 1
+    assert sum(histogram.values()) == 2  # noqa: PLR2004
+
+
+def test_failure_rate_covers_recent_requests() -> None:
+    """Test the failure rate recovers once recent requests succeed again."""
+    metrics = AskoheatRequestMetrics(samples=2)
+    assert metrics.failure_rate is None
+
+    metrics.add(0, registers=1, error=TimeoutError())
+    metrics.add(0.01, registers=1)
+    assert metrics.failure_rate == 0.5  # noqa: PLR2004
+
+    metrics.add(0.01, registers=1)
+    assert metrics.failure_rate == 0
+    assert metrics.failures == 1
+
+
+def test_timeline_keeps_most_recent_events() -> None:
+    """Test the oldest events are overwritten once the timeline is full."""
+    timeline = AskoheatTimeline(capacity=2)
+    assert timeline.as_list() == []
+
+    for second in range(3):
+        timeline.add(
+            TimelineEventKind.POLL if second else TimelineEventKind.WRITE,
+            started=second,
+            duration=0.5,
+            registers=37,
+            success=second != 1,
+            changed=second == 2,  # noqa: PLR2004
+        )
+
+    assert len(timeline) == 2  # noqa: PLR2004
+    assert timeline.as_list() == [
+        {
+            "kind": TimelineEventKind.POLL,
+            "started": "1970-01-01T00:00:01+00:00",
+            "duration": 0.5,
+            "registers": 37,
+            "success": False,
+            "changed": False,
+        },
+        {
+            "kind": TimelineEventKind.POLL,
+            "started": "1970-01-01T00:00:02+00:00",
+            "duration": 0.5,
+            "registers": 37,
+            "success": True,
+            "changed": True,
+        },
+    ]
@@ -0,0 +1,121 @@
+"""Tests for the modbus read planner."""
+
+from custom_components.askoheat.api_conf_desc import CONF_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_desc import RegisterType
+from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_op_desc import DATA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_par_desc import PARAM_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.api_planner import (
+    RegisterRange,
+    plan_block_ranges,
+    plan_reads,
+    register_poll_tiers,
+    split_registers,
+)
+from custom_components.askoheat.const import EMA_STATUS_REGISTER, PollTier
+
+
+def _input_range(start: int, count: int) -> RegisterRange:
+    return RegisterRange(RegisterType.INPUT, start, count)
+
+
+def test_plan_reads_keeps_askoheat_blocks_separated() -> None:
+    """Test register blocks with gaps in between are read separately."""
+    blocks = [
+        EMA_REGISTER_BLOCK_DESCRIPTOR,
+        PARAM_REGISTER_BLOCK_DESCRIPTOR,
+        CONF_REGISTER_BLOCK_DESCRIPTOR,
+        DATA_REGISTER_BLOCK_DESCRIPTOR,
+    ]
+    reads = plan_reads(RegisterRange.of_block(block) for block in blocks)
+
+    assert [
+        (read.register_type, read.starting_register, read.number_of_registers)
+        for read in reads
+    ] == [
+        (block.register_type, block.starting_register, block.number_of_registers)
+        for block in sorted(
+            blocks,
+            key=lambda b: (b.register_type != RegisterType.INPUT, b.starting_register),
+        )
+    ]
+
+
+def test_plan_reads_merges_adjacent_and_overlapping_ranges() -> None:
+    """Test adjacent and overlapping ranges are merged into one transaction."""
+    reads = plan_reads([_input_range(10, 5), _input_range(0, 10), _input_range(12, 8)])
+
+    assert len(reads) == 1
+    assert reads[0].starting_register == 0
+    assert reads[0].number_of_registers == 20  # noqa: PLR2004
+    assert len(reads[0].ranges) == 3  # noqa: PLR2004
+
+
+def test_plan_reads_does_not_merge_register_types() -> None:
+    """Test input and holding registers are never merged."""
+    reads = plan_reads(
+        [_input_range(0, 10), RegisterRange(RegisterType.HOLDING, 10, 10)]
+    )
+
+    assert len(reads) == 2  # noqa: PLR2004
+
+
+def test_plan_reads_splits_at_max_registers() -> None:
+    """Test spans exceeding the pdu limit are split into multiple transactions."""
+    reads = plan_reads([_input_range(0, 100), _input_range(100, 100)], 125)
+
+    assert [(r.starting_register, r.number_of_registers) for r in reads] == [
+        (0, 125),
+        (125, 75),
+    ]
+
+
+def test_split_registers_distributes_values() -> None:
+    """Test registers of merged transactions are split back to requested ranges."""
+    first = _input_range(0, 100)
+    second = _input_range(100, 100)
+    reads = plan_reads([first, second], 125)
+
+    result: dict[RegisterRange, list[int]] = {}
+    for read in reads:
+        split_registers(
+            read,
+            list(
+                range(
+                    read.starting_register,
+                    read.starting_register + read.number_of_registers,
+                )
+            ),
+            result,
+        )
+
+    assert result[first] == list(range(100))
+    assert result[second] == list(range(100, 200))
+
+
+def test_plan_block_ranges_reads_registers_of_due_tiers() -> None:
+    """Test only registers of due tiers are read, bridging small gaps."""
+    block = EMA_REGISTER_BLOCK_DESCRIPTOR
+    start = block.starting_register
+    tiers = register_poll_tiers(block)
+    # setpoints are slow, the feed-in value next to them is read with every poll
+    assert tiers[EMA_STATUS_REGISTER] == PollTier.FAST
+    assert tiers[18] == tiers[19] == PollTier.SLOW
+    assert tiers[20] == PollTier.FAST
+    # registers not holding any value are never read
+    assert tiers[0] is None
+
+    fast_ranges = plan_block_ranges(block, {PollTier.FAST}, max_gap=0)
+    assert fast_ranges[0].starting_register == start + EMA_STATUS_REGISTER
+    assert all(
+        tiers[offset - start] == PollTier.FAST
+        for rng in fast_ranges
+        for offset in range(rng.starting_register, rng.end_register)
+    )
+    # the setpoints are read along to avoid an additional transaction
+    assert len(plan_block_ranges(block, {PollTier.FAST})) == 1
+
+    assert plan_block_ranges(DATA_REGISTER_BLOCK_DESCRIPTOR, set(PollTier)) == [
+        RegisterRange.of_block(DATA_REGISTER_BLOCK_DESCRIPTOR)
+    ]
+    assert plan_block_ranges(block, set()) == []
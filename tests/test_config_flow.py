@@ -6,20 +6,52 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.askoheat.const import (
+    CONF_ADVANCED,
     CONF_ANALOG_INPUT_UNIT,
+    CONF_DECODE_ENGINE,
     CONF_DEVICE_UNITS,
+    CONF_EMA_SCAN_INTERVAL_ACTIVE,
+    CONF_EMA_SCAN_INTERVAL_IDLE,
     CONF_FEED_IN,
+    CONF_FEED_IN_AGGREGATION_METHOD,
+    CONF_FEED_IN_AGGREGATION_WINDOW,
+    CONF_FEED_IN_DEADBAND,
+    CONF_FEED_IN_KEEPALIVE_INTERVAL,
+    CONF_FEED_IN_MIN_WRITE_INTERVAL,
+    CONF_FEED_IN_OUTLIER_THRESHOLD,
+    CONF_FEED_IN_STALE_TIMEOUT,
+    CONF_HEARTBEAT_INTERVAL,
     CONF_HEATPUMP_UNIT,
     CONF_LEGIONELLA_PROTECTION_UNIT,
+    CONF_MAX_CONNECTIONS,
     CONF_MODBUS_MASTER_UNIT,
     CONF_POWER_ENTITY_ID,
     CONF_POWER_INVERT,
+    CONF_REGISTER_HISTORY,
+    CONF_SCAN_INTERVALS,
+    CONF_STALE_GRACE_PERIOD,
+    CONF_TCP_KEEPALIVE,
+    DEFAULT_DECODE_ENGINE,
+    DEFAULT_FEED_IN_AGGREGATION_METHOD,
+    DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+    DEFAULT_FEED_IN_DEADBAND,
+    DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+    DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+    DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+    DEFAULT_FEED_IN_STALE_TIMEOUT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_REGISTER_HISTORY,
+    DEFAULT_STALE_GRACE_PERIOD,
+    DEFAULT_TCP_KEEPALIVE,
     DOMAIN,
+    DecodeEngine,
+    FeedInAggregation,
     SensorAttrKey,
 )
-from custom_components.askoheat.data import AskoheatDataBlock
 
 
 async def test_config_flow_with_defaults(hass: HomeAssistant) -> None:
@@ -40,14 +72,11 @@ async def test_config_flow_with_defaults(hass: HomeAssistant) -> None:
             return_value=True,
         ) as mock_setup_entry,
     ):
-        par_data = AskoheatDataBlock(
-            sensors={
-                SensorAttrKey.PAR_ID: "1234",
-                SensorAttrKey.PAR_ARTICLE_NAME: "test_article",
-                SensorAttrKey.PAR_ARTICLE_NUMBER: "abc-123",
-            },
-            binary_sensors={},
-        )
+        par_data = {
+            f"sensor.{SensorAttrKey.PAR_ID}": "1234",
+            f"sensor.{SensorAttrKey.PAR_ARTICLE_NAME}": "test_article",
+            f"sensor.{SensorAttrKey.PAR_ARTICLE_NUMBER}": "abc-123",
+        }
         mock_api.return_value.connect = AsyncMock()
         mock_api.return_value.async_read_par_data = AsyncMock(return_value=par_data)
 
@@ -58,6 +87,7 @@ async def test_config_flow_with_defaults(hass: HomeAssistant) -> None:
                 CONF_PORT: 501,
                 CONF_DEVICE_UNITS: {},
                 CONF_FEED_IN: {},
+                CONF_ADVANCED: {},
             },
         )
         assert result2.get("type") is FlowResultType.CREATE_ENTRY
@@ -67,6 +97,13 @@ async def test_config_flow_with_defaults(hass: HomeAssistant) -> None:
             CONF_PORT: 501,
             CONF_FEED_IN: {
                 CONF_POWER_INVERT: False,
+                CONF_FEED_IN_DEADBAND: DEFAULT_FEED_IN_DEADBAND,
+                CONF_FEED_IN_MIN_WRITE_INTERVAL: DEFAULT_FEED_IN_MIN_WRITE_INTERVAL,
+                CONF_FEED_IN_KEEPALIVE_INTERVAL: DEFAULT_FEED_IN_KEEPALIVE_INTERVAL,
+                CONF_FEED_IN_AGGREGATION_WINDOW: DEFAULT_FEED_IN_AGGREGATION_WINDOW,
+                CONF_FEED_IN_AGGREGATION_METHOD: DEFAULT_FEED_IN_AGGREGATION_METHOD,
+                CONF_FEED_IN_OUTLIER_THRESHOLD: DEFAULT_FEED_IN_OUTLIER_THRESHOLD,
+                CONF_FEED_IN_STALE_TIMEOUT: DEFAULT_FEED_IN_STALE_TIMEOUT,
             },
             CONF_DEVICE_UNITS: {
                 CONF_LEGIONELLA_PROTECTION_UNIT: True,  # defaults to true
@@ -74,6 +111,14 @@ async def test_config_flow_with_defaults(hass: HomeAssistant) -> None:
                 CONF_MODBUS_MASTER_UNIT: False,
                 CONF_HEATPUMP_UNIT: False,
             },
+            CONF_ADVANCED: {
+                CONF_MAX_CONNECTIONS: DEFAULT_MAX_CONNECTIONS,
+                CONF_TCP_KEEPALIVE: DEFAULT_TCP_KEEPALIVE,
+                CONF_HEARTBEAT_INTERVAL: DEFAULT_HEARTBEAT_INTERVAL,
+                CONF_STALE_GRACE_PERIOD: DEFAULT_STALE_GRACE_PERIOD,
+                CONF_REGISTER_HISTORY: DEFAULT_REGISTER_HISTORY,
+                CONF_DECODE_ENGINE: DEFAULT_DECODE_ENGINE,
+            },
         }
         await hass.async_block_till_done()
         assert len(mock_setup_entry.mock_calls) == 1
@@ -97,14 +142,11 @@ async def test_full_config_flow(hass: HomeAssistant) -> None:
             return_value=True,
         ) as mock_setup_entry,
     ):
-        par_data = AskoheatDataBlock(
-            sensors={
-                SensorAttrKey.PAR_ID: "1234",
-                SensorAttrKey.PAR_ARTICLE_NAME: "test_article",
-                SensorAttrKey.PAR_ARTICLE_NUMBER: "abc-123",
-            },
-            binary_sensors={},
-        )
+        par_data = {
+            f"sensor.{SensorAttrKey.PAR_ID}": "1234",
+            f"sensor.{SensorAttrKey.PAR_ARTICLE_NAME}": "test_article",
+            f"sensor.{SensorAttrKey.PAR_ARTICLE_NUMBER}": "abc-123",
+        }
         mock_api.return_value.connect = AsyncMock()
         mock_api.return_value.async_read_par_data = AsyncMock(return_value=par_data)
 
@@ -120,8 +162,26 @@ async def test_full_config_flow(hass: HomeAssistant) -> None:
                     CONF_HEATPUMP_UNIT: True,
                 },
                 CONF_FEED_IN: {
-                    CONF_POWER_ENTITY_ID: "sensor.my_power_entity",
+                    CONF_POWER_ENTITY_ID: [
+                        "sensor.my_power_phase1",
+                        "sensor.my_power_phase2",
+                    ],
                     CONF_POWER_INVERT: True,
+                    CONF_FEED_IN_DEADBAND: 20,
+                    CONF_FEED_IN_MIN_WRITE_INTERVAL: 2,
+                    CONF_FEED_IN_KEEPALIVE_INTERVAL: 30,
+                    CONF_FEED_IN_AGGREGATION_WINDOW: 10,
+                    CONF_FEED_IN_AGGREGATION_METHOD: FeedInAggregation.MEDIAN,
+                    CONF_FEED_IN_OUTLIER_THRESHOLD: 500,
+                    CONF_FEED_IN_STALE_TIMEOUT: 60,
+                },
+                CONF_ADVANCED: {
+                    CONF_MAX_CONNECTIONS: 2,
+                    CONF_TCP_KEEPALIVE: 60,
+                    CONF_HEARTBEAT_INTERVAL: 30,
+                    CONF_STALE_GRACE_PERIOD: 120,
+                    CONF_REGISTER_HISTORY: 720,
+                    CONF_DECODE_ENGINE: DecodeEngine.NUMPY,
                 },
             },
         )
@@ -131,8 +191,18 @@ async def test_full_config_flow(hass: HomeAssistant) -> None:
             CONF_HOST: "10.0.0.131",
             CONF_PORT: 501,
             CONF_FEED_IN: {
-                CONF_POWER_ENTITY_ID: "sensor.my_power_entity",
+                CONF_POWER_ENTITY_ID: [
+                    "sensor.my_power_phase1",
+                    "sensor.my_power_phase2",
+                ],
                 CONF_POWER_INVERT: True,
+                CONF_FEED_IN_DEADBAND: 20,
+                CONF_FEED_IN_MIN_WRITE_INTERVAL: 2,
+                CONF_FEED_IN_KEEPALIVE_INTERVAL: 30,
+                CONF_FEED_IN_AGGREGATION_WINDOW: 10,
+                CONF_FEED_IN_AGGREGATION_METHOD: FeedInAggregation.MEDIAN,
+                CONF_FEED_IN_OUTLIER_THRESHOLD: 500,
+                CONF_FEED_IN_STALE_TIMEOUT: 60,
             },
             CONF_DEVICE_UNITS: {
                 CONF_LEGIONELLA_PROTECTION_UNIT: False,
@@ -140,6 +210,52 @@ async def test_full_config_flow(hass: HomeAssistant) -> None:
                 CONF_MODBUS_MASTER_UNIT: True,
                 CONF_HEATPUMP_UNIT: True,
             },
+            CONF_ADVANCED: {
+                CONF_MAX_CONNECTIONS: 2,
+                CONF_TCP_KEEPALIVE: 60,
+                CONF_HEARTBEAT_INTERVAL: 30,
+                CONF_STALE_GRACE_PERIOD: 120,
+                CONF_REGISTER_HISTORY: 720,
+                CONF_DECODE_ENGINE: DecodeEngine.NUMPY,
+            },
         }
         await hass.async_block_till_done()
         assert len(mock_setup_entry.mock_calls) == 1
+
+
+async def test_options_flow_with_scan_intervals(
+    hass: HomeAssistant, mock_config_entry: MockConfigEntry
+) -> None:
+    """Test the scan intervals are configured through the options flow only."""
+    result = await hass.config_entries.options.async_init(mock_config_entry.entry_id)
+    assert result.get("type") is FlowResultType.FORM
+    assert result.get("step_id") == "init"
+
+    with patch(
+        "custom_components.askoheat.config_flow.AskoheatModbusApiClient",
+        autospec=True,
+    ) as mock_api:
+        mock_api.return_value.connect = AsyncMock()
+        mock_api.return_value.is_connected = True
+
+        result2 = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_HOST: mock_config_entry.data[CONF_HOST],
+                CONF_PORT: mock_config_entry.data[CONF_PORT],
+                CONF_DEVICE_UNITS: mock_config_entry.data[CONF_DEVICE_UNITS],
+                CONF_FEED_IN: {},
+                CONF_ADVANCED: {},
+                CONF_SCAN_INTERVALS: {
+                    CONF_EMA_SCAN_INTERVAL_ACTIVE: 1,
+                    CONF_EMA_SCAN_INTERVAL_IDLE: 60,
+                },
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result2.get("type") is FlowResultType.CREATE_ENTRY
+    assert mock_config_entry.data[CONF_SCAN_INTERVALS] == {
+        CONF_EMA_SCAN_INTERVAL_ACTIVE: 1,
+        CONF_EMA_SCAN_INTERVAL_IDLE: 60,
+    }
@@ -0,0 +1,286 @@
+"""Tests for the askoheat data update coordinators."""
+
+from datetime import timedelta
+from typing import Any
+from unittest import mock
+
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util.dt import utcnow
+from pymodbus.exceptions import ModbusException
+from pymodbus.pdu.register_message import ReadInputRegistersResponse
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.askoheat.api import AskoheatModbusApiClient
+from custom_components.askoheat.api_ema_desc import (
+    EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR,
+    EMA_REGISTER_BLOCK_DESCRIPTOR,
+)
+from custom_components.askoheat.api_planner import plan_block_ranges
+from custom_components.askoheat.const import (
+    DOMAIN,
+    EMA_STATUS_REGISTER,
+    MAX_CONSECUTIVE_FAILURES,
+    AttributeKeys,
+    BinarySensorAttrKey,
+    ConnectionState,
+    PollTier,
+    TimelineEventKind,
+)
+from custom_components.askoheat.coordinator import (
+    AskoheatParameterDataUpdateCoordinator,
+)
+
+
+async def test_coordinator_notifies_listeners_of_changed_values(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test only listeners subscribed to changed values are notified."""
+    coordinator = mock_config_entry.runtime_data.ema_coordinator
+    changed_listener = mock.Mock()
+    unchanged_listener = mock.Mock()
+    unfiltered_listener = mock.Mock()
+    remove_listeners = [
+        coordinator.async_add_listener(
+            changed_listener, EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.data_key
+        ),
+        coordinator.async_add_listener(
+            unchanged_listener,
+            f"binary_sensor.{BinarySensorAttrKey.EMERGENCY_MODE_ACTIVE}",
+        ),
+        coordinator.async_add_listener(unfiltered_listener),
+    ]
+
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    read_ema_input_registers_response.registers[api_desc.starting_register] = 100
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    changed_listener.assert_called_once()
+    unchanged_listener.assert_not_called()
+    unfiltered_listener.assert_called_once()
+
+    # unchanged registers do not notify any listener
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    changed_listener.assert_called_once()
+    unfiltered_listener.assert_called_once()
+
+    for remove_listener in remove_listeners:
+        remove_listener()
+
+
+async def test_parameters_are_cached_across_setups(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    read_par_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test the parameter block is restored from storage instead of being read."""
+    storage_key = f"{DOMAIN}.{mock_config_entry.entry_id}.parameters"
+    assert hass_storage[storage_key]["data"] == {
+        "registers": read_par_input_registers_response.registers
+    }
+    par_data = mock_config_entry.runtime_data.par_coordinator.data
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+    with mock.patch.object(
+        AskoheatParameterDataUpdateCoordinator, "async_config_entry_first_refresh"
+    ) as first_refresh:
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+    first_refresh.assert_not_called()
+    assert mock_config_entry.runtime_data.par_coordinator.data == par_data
+
+
+async def test_coordinators_refresh_after_reconnect(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test the connection is re-established after failed requests."""
+    runtime_data = mock_config_entry.runtime_data
+    client = runtime_data.client
+    states: list[ConnectionState] = []
+    client.add_connection_listener(states.append)
+    inner_client = client._client  # noqa: SLF001
+    read_input_registers = inner_client.read_input_registers
+    failures = iter([ModbusException("No response")] * MAX_CONSECUTIVE_FAILURES)
+
+    async def fail_before_read(address: int, count: int) -> Any:
+        if (failure := next(failures, None)) is not None:
+            raise failure
+        return await read_input_registers(address=address, count=count)
+
+    with mock.patch.object(inner_client, "read_input_registers", fail_before_read):
+        for _ in range(MAX_CONSECUTIVE_FAILURES):
+            await runtime_data.ema_coordinator.async_refresh()
+        await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert states == [
+        ConnectionState.DEGRADED,
+        ConnectionState.DOWN,
+        ConnectionState.CONNECTING,
+        ConnectionState.READY,
+    ]
+    assert client.is_ready
+    assert runtime_data.ema_coordinator.last_update_success
+
+
+async def test_coordinator_serves_stale_data_within_grace_period(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test entities keep their last known value until the grace period expired."""
+    coordinator = mock_config_entry.runtime_data.ema_coordinator
+    coordinator.stale_grace_period = timedelta(seconds=30)
+    entity_descriptor = next(
+        entity_descriptor
+        for entity_descriptor in EMA_REGISTER_BLOCK_DESCRIPTOR.sensors
+        if entity_descriptor.entity_registry_enabled_default
+    )
+    entity_id = f"sensor.test_{entity_descriptor.key}"
+    state = hass.states.get(entity_id)
+    assert state
+    assert AttributeKeys.STALE_SINCE not in state.attributes
+
+    inner_client = mock_config_entry.runtime_data.client._client  # noqa: SLF001
+    with mock.patch.object(
+        inner_client,
+        "read_input_registers",
+        side_effect=ModbusException("No response"),
+    ):
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        assert not coordinator.last_update_success
+        stale_state = hass.states.get(entity_id)
+        assert stale_state
+        assert stale_state.state == state.state
+        assert stale_state.attributes[AttributeKeys.STALE_SINCE] is not None
+
+        async_fire_time_changed(hass, utcnow() + timedelta(seconds=31))
+        await hass.async_block_till_done()
+
+        expired_state = hass.states.get(entity_id)
+        assert expired_state
+        assert expired_state.state == STATE_UNAVAILABLE
+
+
+async def test_unload_cancels_expiry_of_stale_data(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test no expiry of stale data is left behind once the entry is unloaded."""
+    coordinators = mock_config_entry.runtime_data.coordinators
+    for coordinator in coordinators:
+        coordinator.stale_grace_period = timedelta(seconds=30)
+
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert all(coordinator.stale_since is None for coordinator in coordinators)
+
+
+async def test_coordinator_records_polls_and_writes_in_timeline(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test polls and writes are recorded with their outcome."""
+    coordinator = mock_config_entry.runtime_data.ema_coordinator
+    recorded = len(coordinator.timeline)
+
+    await coordinator.async_refresh()
+    api_desc = EMA_FEED_IN_VALUE_NUMBER_ENTITY_DESCRIPTOR.api_descriptor
+    assert api_desc is not None
+    read_ema_input_registers_response.registers[api_desc.starting_register] = 100
+    await coordinator.async_refresh()
+    await coordinator.async_write_feed_in_value(200)
+    await hass.async_block_till_done()
+
+    poll, changed_poll, write = coordinator.timeline.as_list()[recorded:]
+    assert (poll["kind"], poll["success"], poll["changed"]) == (
+        TimelineEventKind.POLL,
+        True,
+        False,
+    )
+    # only the registers of the fast poll tier are read after the first read
+    assert poll["registers"] == sum(
+        rng.number_of_registers
+        for rng in plan_block_ranges(EMA_REGISTER_BLOCK_DESCRIPTOR, {PollTier.FAST})
+    )
+    assert changed_poll["changed"]
+    assert (write["kind"], write["success"], write["registers"]) == (
+        TimelineEventKind.WRITE,
+        True,
+        1,
+    )
+
+
+async def test_ema_coordinator_adapts_scan_interval_to_activity(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+    read_ema_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test the scan interval backs off while idle and is reset by activity."""
+    coordinator = mock_config_entry.runtime_data.ema_coordinator
+    coordinator.set_scan_intervals(timedelta(seconds=1), timedelta(seconds=8))
+
+    intervals = []
+    for _ in range(4):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval)
+    assert intervals == [timedelta(seconds=seconds) for seconds in (2, 4, 8, 8)]
+
+    # heater 1 is active
+    read_ema_input_registers_response.registers[EMA_STATUS_REGISTER] = 0x1
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=1)
+
+    read_ema_input_registers_response.registers[EMA_STATUS_REGISTER] = 0
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=2)
+
+    # writes are followed at the active interval
+    await coordinator.async_write_feed_in_value(200)
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == timedelta(seconds=1)
+
+
+async def test_connection_loss_after_unchanged_poll_updates_all_entities(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test entities subscribed to values become unavailable with the connection."""
+    coordinator = mock_config_entry.runtime_data.ema_coordinator
+    entity_descriptor = next(
+        entity_descriptor
+        for entity_descriptor in EMA_REGISTER_BLOCK_DESCRIPTOR.sensors
+        if entity_descriptor.entity_registry_enabled_default
+    )
+    entity_id = f"sensor.test_{entity_descriptor.key}"
+
+    # the poll does not change any value
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    with mock.patch.object(
+        AskoheatModbusApiClient,
+        "is_ready",
+        new_callable=mock.PropertyMock,
+        return_value=False,
+    ):
+        coordinator._handle_connection_state(ConnectionState.DOWN)  # noqa: SLF001
+        await hass.async_block_till_done()
+
+        state = hass.states.get(entity_id)
+        assert state
+        assert state.state == STATE_UNAVAILABLE
@@ -1,8 +1,10 @@
 """Tests for the switch sensor entities."""
 
+from datetime import timedelta
 from math import isclose
 from random import randint
 from typing import Any
+from unittest.mock import AsyncMock
 
 import pytest
 from homeassistant.const import (
@@ -12,8 +14,10 @@ from homeassistant.const import (
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.restore_state import STORAGE_KEY as RESTORE_STATE_KEY
 from homeassistant.setup import async_setup_component
+from homeassistant.util.dt import utcnow
 from pytest_homeassistant_custom_component.common import (
     MockConfigEntry,
+    async_fire_time_changed,
     async_mock_restore_state_shutdown_restart,
     mock_restore_cache_with_extra_data,
 )
@@ -21,9 +25,15 @@ from pytest_homeassistant_custom_component.common import (
 from custom_components.askoheat.const import (
     CONF_POWER_ENTITY_ID,
     CONF_POWER_INVERT,
+    FeedInAggregation,
     NumberAttrKey,
     SwitchAttrKey,
 )
+from custom_components.askoheat.feed_in import (
+    AskoheatFeedInPipeline,
+    AskoheatPowerSum,
+    aggregate,
+)
 
 switch_entity_id = f"switch.test_{SwitchAttrKey.EMA_AUTO_FEEDIN_SWITCH}"
 
@@ -143,8 +153,8 @@ async def test_auto_feed_in_switch_sensor_state(  # noqa: PLR0913, PLR0915
     assert switch_entity_state
     assert switch_entity_state["state"] == STATE_ON
 
-    # update other sensors
-    mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_update_listeners()
+    # feed-in value is read by the next poll
+    await mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_refresh()
     await hass.async_block_till_done()
 
     # validate output
@@ -167,8 +177,8 @@ async def test_auto_feed_in_switch_sensor_state(  # noqa: PLR0913, PLR0915
         service_data={"value": buffer_value},
     )
     await hass.async_block_till_done()
-    # update other sensors
-    mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_update_listeners()
+    # feed-in value is read by the next poll
+    await mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_refresh()
     await hass.async_block_till_done()
 
     expected_value = (
@@ -190,8 +200,8 @@ async def test_auto_feed_in_switch_sensor_state(  # noqa: PLR0913, PLR0915
         service_data={"value": power_value},
     )
     await hass.async_block_till_done()
-    # update other sensors
-    mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_update_listeners()
+    # feed-in value is read by the next poll
+    await mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_refresh()
     await hass.async_block_till_done()
 
     expected_value = (
@@ -216,8 +226,8 @@ async def test_auto_feed_in_switch_sensor_state(  # noqa: PLR0913, PLR0915
     assert state
     assert state.state == STATE_OFF
 
-    # update other sensors
-    mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_update_listeners()
+    # feed-in value is read by the next poll
+    await mock_config_entry_uninitialized.runtime_data.ema_coordinator.async_refresh()
     await hass.async_block_till_done()
 
     # validate output is set again to 0
@@ -273,3 +283,147 @@ async def test_restore_auto_feed_saved_state(
 
     assert state
     assert state.state == saved_state
+
+
+async def test_feed_in_pipeline_limits_writes(hass: HomeAssistant) -> None:
+    """Test deadband, write interval and keep-alive of the feed-in pipeline."""
+    write = AsyncMock()
+    pipeline = AskoheatFeedInPipeline(
+        hass,
+        write,
+        deadband=10,
+        min_write_interval=timedelta(seconds=5),
+        keepalive_interval=timedelta(seconds=60),
+    )
+
+    await pipeline.async_send(100)
+    write.assert_awaited_once_with(100)
+
+    # changes within the deadband are dropped
+    await pipeline.async_send(105)
+    write.assert_awaited_once_with(100)
+
+    # changes within the write interval are deferred, writing the latest value
+    await pipeline.async_send(150)
+    await pipeline.async_send(200)
+    assert write.await_count == 1
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+    assert write.await_args_list[-1].args == (200,)
+    assert write.await_count == 2  # noqa: PLR2004
+
+    # last value is re-sent after the keep-alive interval
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=70))
+    await hass.async_block_till_done()
+    assert write.await_args_list[-1].args == (200,)
+    assert write.await_count == 3  # noqa: PLR2004
+
+    # forced values bypass all limits
+    await pipeline.async_send(201, force=True)
+    assert write.await_args_list[-1].args == (201,)
+
+    pipeline.async_stop()
+
+
+async def test_feed_in_pipeline_retries_failed_writes(hass: HomeAssistant) -> None:
+    """Test failed writes neither count for the deadband nor the write interval."""
+    write = AsyncMock(return_value=False)
+    pipeline = AskoheatFeedInPipeline(
+        hass,
+        write,
+        deadband=10,
+        min_write_interval=timedelta(seconds=5),
+        keepalive_interval=timedelta(seconds=60),
+    )
+
+    await pipeline.async_send(100)
+    write.assert_awaited_once_with(100)
+
+    # the same value is written again right away as it was never sent
+    write.return_value = True
+    await pipeline.async_send(105)
+    assert write.await_args_list[-1].args == (105,)
+    assert write.await_count == 2  # noqa: PLR2004
+
+    # once written, the deadband applies again
+    await pipeline.async_send(110)
+    assert write.await_count == 2  # noqa: PLR2004
+
+    pipeline.async_stop()
+
+
+@pytest.mark.parametrize(
+    ("method", "outlier_threshold", "expected"),
+    [
+        (FeedInAggregation.MEAN, 0, 760),
+        (FeedInAggregation.MEDIAN, 0, 200),
+        (FeedInAggregation.LAST, 0, 3000),
+        (FeedInAggregation.MEAN, 500, 200),
+        (FeedInAggregation.LAST, 500, 200),
+    ],
+)
+def test_aggregate_power_samples(
+    method: FeedInAggregation, outlier_threshold: float, expected: float
+) -> None:
+    """Test aggregation of the power samples of a window."""
+    assert aggregate([100, 200, 300, 200, 3000], method, outlier_threshold) == (
+        expected
+    )
+
+
+async def test_feed_in_pipeline_aggregates_window(hass: HomeAssistant) -> None:
+    """Test power samples are aggregated to a single write per window."""
+    write = AsyncMock()
+    pipeline = AskoheatFeedInPipeline(
+        hass,
+        write,
+        deadband=0,
+        min_write_interval=timedelta(),
+        keepalive_interval=timedelta(),
+        aggregation_window=timedelta(seconds=10),
+        aggregation_method=FeedInAggregation.MEAN,
+    )
+
+    for value in (100, 200, 300):
+        await pipeline.async_send(value)
+    write.assert_not_awaited()
+
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    write.assert_awaited_once_with(200)
+
+    # forced values discard the samples of the current window
+    await pipeline.async_send(400)
+    await pipeline.async_send(0, force=True)
+    async_fire_time_changed(hass, utcnow() + timedelta(seconds=22))
+    await hass.async_block_till_done()
+    assert [call.args for call in write.await_args_list] == [(200,), (0,)]
+
+    pipeline.async_stop()
+
+
+def test_power_sum_of_multiple_sources() -> None:
+    """Test the power values of several sources are summed up incrementally."""
+    power_sum = AskoheatPowerSum(stale_timeout=timedelta(seconds=60))
+    assert power_sum.total(0) is None
+
+    power_sum.update("sensor.phase1", 100, 0)
+    power_sum.update("sensor.phase2", -300, 0)
+    assert power_sum.total(10) == -200  # noqa: PLR2004
+
+    power_sum.update("sensor.phase1", 150, 20)
+    assert power_sum.total(30) == -150  # noqa: PLR2004
+
+    # unchanged values reported in time are kept, stale values are ignored
+    power_sum.report("sensor.phase1", 50)
+    assert power_sum.total(70) == 150  # noqa: PLR2004
+
+    # unavailable sources are removed
+    power_sum.update("sensor.phase1", None, 80)
+    assert power_sum.total(80) is None
+
+    # non-finite values of sources are ignored
+    power_sum.update("sensor.phase1", 100, 90)
+    power_sum.update("sensor.phase2", float("nan"), 90)
+    power_sum.update("sensor.phase3", float("inf"), 90)
+    assert power_sum.total(90) == 100  # noqa: PLR2004
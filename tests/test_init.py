@@ -0,0 +1,213 @@
+"""Tests for setting up and reloading the askoheat integration."""
+
+import asyncio
+from typing import Any
+from unittest import mock
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_OFF, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.entity_platform import async_get_platforms
+from pymodbus.pdu.register_message import ReadInputRegistersResponse
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.askoheat.api import AskoheatModbusApiClient
+from custom_components.askoheat.const import (
+    CONF_DEVICE_UNITS,
+    CONF_HEATPUMP_UNIT,
+    DOMAIN,
+    BinarySensorAttrKey,
+    DeviceKey,
+    SensorAttrKey,
+)
+from custom_components.askoheat.coordinator import (
+    AskoheatEMADataUpdateCoordinator,
+    AskoheatParameterDataUpdateCoordinator,
+)
+
+_EMA_ENTITY_ID = f"binary_sensor.test_{BinarySensorAttrKey.HEATER1_ACTIVE}"
+
+
+def _delay_ema_updates(started: asyncio.Event, release: asyncio.Event) -> Any:
+    """Patch updates of the energy manager block to wait until released."""
+    update_data = AskoheatEMADataUpdateCoordinator._async_update_data  # noqa: SLF001
+
+    async def delayed_update_data(coordinator: Any) -> dict[str, Any]:
+        started.set()
+        await release.wait()
+        return await update_data(coordinator)
+
+    return mock.patch.object(
+        AskoheatEMADataUpdateCoordinator, "_async_update_data", delayed_update_data
+    )
+
+
+async def test_reload_keeps_connection(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test changing device units reloads entities without reconnecting."""
+    runtime_data = mock_config_entry.runtime_data
+    client = runtime_data.client
+    connect = client._client.connect  # noqa: SLF001
+    connect_count = connect.await_count
+    assert DeviceKey.HEATPUMP_CONTROL_UNIT in runtime_data.supported_devices
+
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={
+            **mock_config_entry.data,
+            CONF_DEVICE_UNITS: {
+                **mock_config_entry.data[CONF_DEVICE_UNITS],
+                CONF_HEATPUMP_UNIT: False,
+            },
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert mock_config_entry.runtime_data is runtime_data
+    assert runtime_data.client is client
+    assert connect.await_count == connect_count
+    assert DeviceKey.HEATPUMP_CONTROL_UNIT not in runtime_data.supported_devices
+
+
+async def test_setup_with_cached_parameters_does_not_wait_for_connection(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test entities are set up from cached parameters while unreachable."""
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with mock.patch(
+        "custom_components.askoheat.api.AsyncModbusTcpClient.connect",
+        mock.AsyncMock(return_value=False),
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert not mock_config_entry.runtime_data.client.is_ready
+        assert hass.states.get(f"sensor.test_{SensorAttrKey.PAR_ID}") is not None
+
+        assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+
+async def test_setup_with_cached_parameters_before_first_refresh(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test entities without data are unavailable until the first refresh."""
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    with _delay_ema_updates(started, release):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        async with asyncio.timeout(5):
+            await started.wait()
+
+        runtime_data = mock_config_entry.runtime_data
+        assert runtime_data.client.is_ready
+        assert runtime_data.ema_coordinator.data is None
+        entity = next(
+            platform.entities[_EMA_ENTITY_ID]
+            for platform in async_get_platforms(hass, DOMAIN)
+            if _EMA_ENTITY_ID in platform.entities
+        )
+        entity.async_write_ha_state()
+        assert hass.states.get(_EMA_ENTITY_ID).state == STATE_UNAVAILABLE
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert hass.states.get(_EMA_ENTITY_ID).state == STATE_OFF
+
+
+async def test_setup_waits_for_parameters_only(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test entities are set up without waiting for the first refresh of all blocks."""
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    release = asyncio.Event()
+    with (
+        mock.patch.object(
+            AskoheatParameterDataUpdateCoordinator,
+            "async_load_cached_parameters",
+            return_value=False,
+        ),
+        _delay_ema_updates(asyncio.Event(), release),
+    ):
+        assert await hass.config_entries.async_setup(mock_config_entry.entry_id)
+
+        assert mock_config_entry.state is ConfigEntryState.LOADED
+        assert mock_config_entry.runtime_data.par_coordinator.data is not None
+        assert mock_config_entry.runtime_data.ema_coordinator.data is None
+        assert hass.states.get(_EMA_ENTITY_ID).state == STATE_UNAVAILABLE
+
+        release.set()
+        await hass.async_block_till_done(wait_background_tasks=True)
+        assert hass.states.get(_EMA_ENTITY_ID).state == STATE_OFF
+
+
+async def test_failed_setup_closes_client(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test the client is closed if the device is unreachable on first setup."""
+    assert await hass.config_entries.async_unload(mock_config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    with (
+        mock.patch.object(
+            AskoheatParameterDataUpdateCoordinator,
+            "async_load_cached_parameters",
+            return_value=False,
+        ),
+        mock.patch(
+            "custom_components.askoheat.api.AsyncModbusTcpClient.connect",
+            mock.AsyncMock(return_value=False),
+        ),
+        mock.patch.object(
+            AskoheatModbusApiClient,
+            "close",
+            autospec=True,
+            side_effect=AskoheatModbusApiClient.close,
+        ) as close,
+    ):
+        assert not await hass.config_entries.async_setup(mock_config_entry.entry_id)
+        await hass.async_block_till_done()
+
+        assert mock_config_entry.state is ConfigEntryState.SETUP_RETRY
+        close.assert_called_once_with(mock_config_entry.runtime_data.client)
+
+
+async def test_devices_follow_revalidated_parameters(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+    read_par_input_registers_response: ReadInputRegistersResponse,
+) -> None:
+    """Test registered devices are updated once the parameters changed."""
+    runtime_data = mock_config_entry.runtime_data
+    software_version = runtime_data.device_info.software_version
+
+    # software version is a string in registers 44-46
+    read_par_input_registers_response.registers[44] = 0x3132
+    await runtime_data.par_coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert runtime_data.device_info.software_version != software_version
+    devices = dr.async_entries_for_config_entry(
+        dr.async_get(hass), mock_config_entry.entry_id
+    )
+    assert devices
+    assert all(
+        device.sw_version == runtime_data.device_info.software_version
+        for device in devices
+    )
@@ -0,0 +1,64 @@
+"""Tests for the services of the askoheat integration."""
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.askoheat.api_ema_desc import EMA_REGISTER_BLOCK_DESCRIPTOR
+from custom_components.askoheat.const import (
+    ATTR_BLOCK,
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_LIMIT,
+    DOMAIN,
+    SERVICE_GET_REGISTER_HISTORY,
+    RegisterBlockName,
+)
+
+
+async def test_get_register_history(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test the raw registers of the most recent reads are returned."""
+    runtime_data = mock_config_entry.runtime_data
+    runtime_data.client.set_register_history(10)
+    await runtime_data.ema_coordinator.async_refresh()
+    await runtime_data.ema_coordinator.async_refresh()
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_REGISTER_HISTORY,
+        {
+            ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id,
+            ATTR_BLOCK: RegisterBlockName.ENERGY_MANAGER,
+            ATTR_LIMIT: 1,
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response is not None
+    frames = response["frames"]
+    assert len(frames) == 1
+    assert frames[0]["registers"] == runtime_data.client.block_registers(
+        EMA_REGISTER_BLOCK_DESCRIPTOR
+    )
+
+
+async def test_get_register_history_disabled(
+    mock_config_entry: MockConfigEntry,
+    hass: HomeAssistant,
+) -> None:
+    """Test the service fails if the register history is disabled."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_REGISTER_HISTORY,
+            {
+                ATTR_CONFIG_ENTRY_ID: mock_config_entry.entry_id,
+                ATTR_BLOCK: RegisterBlockName.ENERGY_MANAGER,
+            },
+            blocking=True,
+            return_response=True,
+        )